@@ -0,0 +1,124 @@
+import os
+import csv
+from file_lock import get_lock, locked
+from instrumentation import count, instrumented, open_file
+
+ACCOUNT_FIELDS = ["name"]
+
+class AccountManager:
+    def __init__(self, data_dir="data"):
+        """Initialize the registry of account names, kept in accounts.csv.
+
+        Names match case-insensitively, so "checking" and "Checking" are one account
+        and transactions are stored under the registered spelling.
+        """
+        self.data_dir = data_dir
+        self.accounts_file = os.path.join(data_dir, "accounts.csv")
+
+        # Resident registry of accounts, reloaded only when the file changes
+        self._accounts = []
+        self._accounts_by_name = {}
+        self._file_signature = None
+        # Shared with the TransactionManager of the same data directory
+        self._lock = get_lock(data_dir)
+
+        os.makedirs(self.data_dir, exist_ok=True)
+        self.initialize_accounts_file()
+
+    @locked
+    def initialize_accounts_file(self):
+        """Create the accounts file with just a header if it doesn't exist."""
+        if not os.path.exists(self.accounts_file):
+            with open_file(self.accounts_file, 'w', newline='') as file:
+                csv.writer(file).writerow(ACCOUNT_FIELDS)
+
+    def _get_file_signature(self):
+        """Return the (mtime, size) of the accounts file, or None if it is missing."""
+        try:
+            stat = os.stat(self.accounts_file)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    @instrumented("accounts.load_accounts")
+    def _load_accounts(self):
+        """Load accounts into memory, re-reading the file only when it has changed."""
+        signature = self._get_file_signature()
+        if signature is not None and signature == self._file_signature:
+            return self._accounts
+
+        accounts = []
+        if signature is not None:
+            with open_file(self.accounts_file, 'r', newline='') as file:
+                accounts = list(csv.DictReader(file))
+            count("rows_scanned", len(accounts))
+
+        self._accounts = accounts
+        self._accounts_by_name = {}
+        for account in accounts:
+            self._accounts_by_name.setdefault(account['name'].lower(), account)
+        self._file_signature = signature
+        return self._accounts
+
+    def get_accounts(self):
+        """Get all accounts in the order they were registered."""
+        try:
+            return [dict(account) for account in self._load_accounts()]
+        except Exception as e:
+            print(f"Error retrieving accounts: {str(e)}")
+            return []
+
+    def get_account(self, name):
+        """Get an account by name, ignoring case, or None if it does not exist."""
+        try:
+            self._load_accounts()
+            account = self._accounts_by_name.get(name.lower())
+            return dict(account) if account else None
+        except Exception as e:
+            print(f"Error retrieving account: {str(e)}")
+            return None
+
+    def add_account(self, name):
+        """Add a new account."""
+        if not name:
+            return False, "Account name cannot be empty"
+        if self.get_account(name) is not None:
+            return False, "Account already exists"
+        return self.add_accounts([name])
+
+    @instrumented("accounts.add_accounts")
+    @locked
+    def add_accounts(self, names):
+        """Add several accounts with a single write, skipping existing ones."""
+        try:
+            self._load_accounts()
+            new_accounts = []
+            for name in names:
+                if name and name.lower() not in self._accounts_by_name:
+                    account = {'name': name}
+                    self._accounts_by_name[name.lower()] = account
+                    new_accounts.append(account)
+            if not new_accounts:
+                return True, "0 accounts added successfully"
+
+            was_loaded = self._file_signature == self._get_file_signature()
+            with open_file(self.accounts_file, 'a', newline='') as file:
+                csv.DictWriter(file, fieldnames=ACCOUNT_FIELDS).writerows(new_accounts)
+            self._accounts.extend(new_accounts)
+            self._file_signature = self._get_file_signature() if was_loaded else None
+
+            return True, f"{len(new_accounts)} accounts added successfully"
+        except Exception as e:
+            # Drop the lookups added above so the registry is reloaded from the file
+            self._file_signature = None
+            return False, f"Error adding accounts: {str(e)}"
+
+    def normalize(self, names):
+        """Map each name to its registered spelling, registering the new ones with a single write."""
+        self._load_accounts()
+        missing = [name for name in names if name.lower() not in self._accounts_by_name]
+        if missing:
+            success, message = self.add_accounts(missing)
+            if not success:
+                raise OSError(message)
+        return {name: self._accounts_by_name[name.lower()]['name'] for name in names}
@@ -0,0 +1,38 @@
+import os
+
+# Optional features of the CSV managers, switched on with e.g. JIPANGE_FEATURES=journal,rollups
+FEATURES = ["journal", "columnar", "rollups", "group_commit"]
+
+def get_features(value=None):
+    """Return the FEATURES named in a comma-separated string, by default JIPANGE_FEATURES."""
+    if value is None:
+        value = os.environ.get("JIPANGE_FEATURES", "")
+    names = [name.strip().lower() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in FEATURES]
+    if unknown:
+        raise ValueError(f"Unknown feature {', '.join(unknown)}; choose from {', '.join(FEATURES)}")
+    return names
+
+def create_manager(data_dir="data", backend="csv", features=(), workers=1):
+    """Create the transaction manager for the csv, partitioned or sqlite storage backend.
+
+    features switches on the journal (csv only), columnar reports, monthly rollups
+    and fsynced appends with group commit of the CSV managers; SQLite answers
+    reports from its own indexes, commits through its own transactions and ignores
+    them. workers above 1 lets the CSV managers scan a ledger that is not in memory
+    in that many processes. Backends are imported on demand so a command only loads the one
+    it uses.
+    """
+    columnar = "columnar" in features
+    rollups = "rollups" in features
+    group_commit = "group_commit" in features
+    if backend == "sqlite":
+        from sqlite_storage import SQLiteTransactionManager
+        return SQLiteTransactionManager(data_dir)
+    if backend == "partitioned":
+        from partitioned_storage import PartitionedTransactionManager
+        return PartitionedTransactionManager(data_dir, columnar=columnar, rollups=rollups, workers=workers,
+                                             group_commit=group_commit)
+    from transaction_manager import TransactionManager
+    return TransactionManager(data_dir, journal="journal" in features, columnar=columnar, rollups=rollups,
+                              workers=workers, group_commit=group_commit)
@@ -0,0 +1,90 @@
+from bisect import bisect_left, bisect_right
+
+def signed_cents(transaction):
+    """Return a transaction's effect on its account balance: income adds, expenses subtract."""
+    return transaction.cents if transaction.transaction_type == 'income' else -transaction.cents
+
+class BalanceLedger:
+    def __init__(self, transactions):
+        """Keep running balances per account for point-in-time queries.
+
+        For each account (ignoring case) the distinct transaction days are kept in
+        order with the balance at the end of each day, i.e. prefix sums of the daily
+        net amounts in cents. A balance as of a date is a binary search; an added or
+        removed transaction only shifts the balances of its account from its day on.
+        """
+        self.names = {}
+        self.days = {}
+        self.balances = {}
+
+        daily = {}
+        for transaction in transactions:
+            key = transaction.account.lower()
+            self.names.setdefault(key, transaction.account)
+            totals = daily.setdefault(key, {})
+            totals[transaction.ordinal] = totals.get(transaction.ordinal, 0) + signed_cents(transaction)
+
+        for key, totals in daily.items():
+            days = sorted(totals)
+            balances = []
+            balance = 0
+            for day in days:
+                balance += totals[day]
+                balances.append(balance)
+            self.days[key] = days
+            self.balances[key] = balances
+
+    def _apply(self, transaction, cents):
+        """Add cents to an account's balance from the transaction's day on."""
+        key = transaction.account.lower()
+        if key not in self.days:
+            self.names[key] = transaction.account
+            self.days[key] = []
+            self.balances[key] = []
+        days = self.days[key]
+        balances = self.balances[key]
+
+        position = bisect_left(days, transaction.ordinal)
+        if position == len(days) or days[position] != transaction.ordinal:
+            days.insert(position, transaction.ordinal)
+            balances.insert(position, balances[position - 1] if position else 0)
+        for later in range(position, len(balances)):
+            balances[later] += cents
+
+    def add(self, transaction):
+        """Apply a new transaction to its account."""
+        self._apply(transaction, signed_cents(transaction))
+
+    def remove(self, transaction):
+        """Take a transaction back out of its account, given the values it was added with."""
+        self._apply(transaction, -signed_cents(transaction))
+
+    def accounts(self):
+        """Return the names of the accounts with transactions."""
+        return list(self.names.values())
+
+    def balance(self, account, ordinal=None):
+        """Return an account's balance in cents at the end of a day, or overall."""
+        key = account.lower()
+        if key not in self.days:
+            return 0
+        if ordinal is None:
+            return self.balances[key][-1] if self.balances[key] else 0
+        position = bisect_right(self.days[key], ordinal)
+        return self.balances[key][position - 1] if position else 0
+
+    def series(self, account, start, end):
+        """Return an account's end-of-day balances in cents for every day from start to end."""
+        key = account.lower()
+        days = self.days.get(key, [])
+        balances = self.balances.get(key, [])
+
+        position = bisect_right(days, start)
+        balance = balances[position - 1] if position else 0
+        result = []
+        for day in range(start, end + 1):
+            if position < len(days) and days[position] == day:
+                balance = balances[position]
+                position += 1
+            result.append(balance)
+        return result
@@ -0,0 +1,211 @@
+"""Benchmark TransactionManager and CategoryManager operations on synthetic ledgers.
+
+Example:
+    python benchmark.py --sizes 10000 100000 --output bench.json
+"""
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import tracemalloc
+from datetime import date, timedelta
+from category_manager import DEFAULT_INCOME_CATEGORIES, DEFAULT_EXPENSE_CATEGORIES
+from transaction_manager import TransactionManager
+
+ACCOUNTS = ["Cash", "Checking", "Savings", "Credit Card", "Mobile Money"]
+
+DESCRIPTION_WORDS = [
+    "monthly", "weekly", "payment", "refund", "coffee", "market", "online", "order",
+    "subscription", "transfer", "fuel", "ticket", "dinner", "lunch", "rent", "bill"
+]
+
+def generate_transactions(count, seed=42, start=date(2020, 1, 1), days=5 * 365):
+    """Yield count reproducible transaction records spread over the default categories.
+
+    Roughly one in eight transactions is income, and amounts are skewed towards
+    small everyday expenses.
+    """
+    rng = random.Random(seed)
+    for _ in range(count):
+        if rng.random() < 0.125:
+            transaction_type = "income"
+            category = rng.choice(DEFAULT_INCOME_CATEGORIES)
+            amount = round(rng.uniform(500, 5000), 2)
+        else:
+            transaction_type = "expense"
+            category = rng.choice(DEFAULT_EXPENSE_CATEGORIES)
+            amount = round(rng.lognormvariate(3, 1), 2) or 0.01
+
+        yield {
+            'date': (start + timedelta(days=rng.randrange(days))).isoformat(),
+            'amount': amount,
+            'category': category,
+            'account': rng.choice(ACCOUNTS),
+            'description': " ".join(rng.sample(DESCRIPTION_WORDS, 3)),
+            'transaction_type': transaction_type
+        }
+
+def percentile(sorted_values, fraction):
+    """Return the value at a fraction of a sorted list."""
+    return sorted_values[min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))]
+
+def measure(operation, iterations):
+    """Time operation(i) for each iteration, then run it once more to record peak memory."""
+    latencies = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        operation(i)
+        latencies.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    operation(iterations)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    total = sum(latencies)
+    return {
+        'iterations': iterations,
+        'total_s': round(total, 6),
+        'ops_per_sec': round(iterations / total, 2) if total else None,
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 4),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 4),
+        'peak_memory_kb': round(peak / 1024, 1)
+    }
+
+def create_manager(data_dir, options, cache_size=None):
+    """Create the manager under test, with the query cache size of the options unless given."""
+    if cache_size is None:
+        cache_size = options.cache_size
+    if options.backend == "sqlite":
+        from sqlite_storage import SQLiteTransactionManager
+        return SQLiteTransactionManager(data_dir, cache_size=cache_size)
+    if options.backend == "partitioned":
+        from partitioned_storage import PartitionedTransactionManager
+        return PartitionedTransactionManager(data_dir, columnar=options.columnar, rollups=options.rollups,
+                                             workers=options.workers, cache_size=cache_size)
+    return TransactionManager(data_dir, journal=options.journal, columnar=options.columnar, rollups=options.rollups,
+                              workers=options.workers, cache_size=cache_size)
+
+def run_benchmarks(size, options):
+    """Build a ledger of the given size and time every operation against it."""
+    data_dir = tempfile.mkdtemp(prefix="jipange-bench-")
+    try:
+        manager = create_manager(data_dir, options)
+        start = time.perf_counter()
+        manager.add_transactions_batch(generate_transactions(size, options.seed))
+        results = {'setup': {'rows': size, 'ingest_s': round(time.perf_counter() - start, 6)}}
+
+        rng = random.Random(options.seed + 1)
+        records = list(generate_transactions(options.iterations + 1, options.seed + 2))
+        ids = [t['id'] for t in manager.get_transactions()]
+        scan_iterations = options.scan_iterations
+
+        results['load'] = measure(lambda i: create_manager(data_dir, options).get_transactions(), scan_iterations)
+        results['add_transaction'] = measure(
+            lambda i: manager.add_transaction(**records[i]), options.iterations
+        )
+        results['get_transactions'] = measure(lambda i: manager.get_transactions(), scan_iterations)
+        results['get_transactions_filtered'] = measure(
+            lambda i: manager.get_transactions({'category': "Groceries", 'account': "Checking"}), scan_iterations
+        )
+        results['get_transaction_by_id'] = measure(
+            lambda i: manager.get_transaction(rng.choice(ids)), options.iterations
+        )
+        results['search_transactions'] = measure(
+            lambda i: manager.search_transactions(rng.choice(DESCRIPTION_WORDS)), scan_iterations
+        )
+        results['get_transaction_summary'] = measure(lambda i: manager.get_transaction_summary(), scan_iterations)
+        results['get_transaction_summary_cold'] = measure(
+            lambda i: create_manager(data_dir, options).get_transaction_summary(), scan_iterations
+        )
+        results['get_transaction_summary_month'] = measure(
+            lambda i: manager.get_transaction_summary("2022-03-01", "2022-03-31"), scan_iterations
+        )
+        results['get_transaction_summary_range'] = measure(
+            lambda i: manager.get_transaction_summary("2021-02-10", "2021-11-20"), scan_iterations
+        )
+        # The same summaries answered from a warm query cache, reported apart from the computed ones
+        cached = create_manager(data_dir, options, cache_size=max(options.cache_size, 128))
+        cached.get_transaction_summary()
+        cached.get_transaction_summary("2021-02-10", "2021-11-20")
+        results['get_transaction_summary_cached'] = measure(
+            lambda i: cached.get_transaction_summary(), scan_iterations
+        )
+        results['get_transaction_summary_range_cached'] = measure(
+            lambda i: cached.get_transaction_summary("2021-02-10", "2021-11-20"), scan_iterations
+        )
+        results['edit_transcation'] = measure(
+            lambda i: manager.edit_transcation(rng.choice(ids), "amount", str(rng.randint(1, 500))),
+            options.mutation_iterations
+        )
+        results['delete_transactions'] = measure(
+            lambda i: manager.delete_transactions(ids.pop()), options.mutation_iterations
+        )
+
+        category_manager = manager.category_manager
+        results['get_categories'] = measure(lambda i: category_manager.get_categories("expense"), options.iterations)
+        results['add_category'] = measure(
+            lambda i: category_manager.add_category(f"Bench {i}", "expense"), options.iterations
+        )
+        results['edit_category'] = measure(
+            lambda i: category_manager.edit_category(f"Bench {i}", f"Renamed {i}", "expense"), options.iterations
+        )
+        results['delete_category'] = measure(
+            lambda i: category_manager.delete_category(f"Renamed {i}"), options.iterations
+        )
+        return results
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+def main():
+    """Run the benchmarks and print or save the results as JSON."""
+    parser = argparse.ArgumentParser(description="Benchmark jipange transaction operations.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000],
+                        help="ledger sizes to benchmark")
+    parser.add_argument("--seed", type=int, default=42, help="seed for the synthetic ledger")
+    parser.add_argument("--iterations", type=int, default=200, help="iterations for cheap operations")
+    parser.add_argument("--scan-iterations", type=int, default=5, help="iterations for full-ledger operations")
+    parser.add_argument("--mutation-iterations", type=int, default=20, help="iterations for edits and deletes")
+    parser.add_argument("--backend", choices=["csv", "partitioned", "sqlite"], default="csv")
+    parser.add_argument("--journal", action="store_true", help="enable the edit/delete journal")
+    parser.add_argument("--columnar", action="store_true", help="enable the NumPy column store")
+    parser.add_argument("--rollups", action="store_true", help="enable monthly rollups")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes for cold reports and searches")
+    parser.add_argument("--cache-size", type=int, default=0,
+                        help="query cache entries of the measured manager (default: 0, every query is computed)")
+    parser.add_argument("--output", help="write the JSON results to this file instead of stdout")
+    options = parser.parse_args()
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': options.seed,
+            'backend': options.backend,
+            'journal': options.journal,
+            'columnar': options.columnar,
+            'rollups': options.rollups,
+            'workers': options.workers,
+            'cache_size': options.cache_size,
+            'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S")
+        },
+        'results': {}
+    }
+    for size in options.sizes:
+        print(f"Benchmarking {size} transactions...", file=sys.stderr)
+        report['results'][str(size)] = run_benchmarks(size, options)
+
+    output = json.dumps(report, indent=2)
+    if options.output:
+        with open(options.output, 'w') as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
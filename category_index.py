@@ -0,0 +1,36 @@
+class CategoryIndex:
+    def __init__(self, transactions):
+        """Map each category, ignoring case, to its Transaction records keyed by id.
+
+        Renames, merges and deletes of a category then touch only its own
+        transactions, and per-category counts are dictionary lookups.
+        """
+        self.by_category = {}
+        for transaction in transactions:
+            self.add(transaction)
+
+    def add(self, transaction):
+        """Add a transaction under its category."""
+        self.by_category.setdefault(transaction.category.lower(), {})[transaction.id] = transaction
+
+    def remove(self, transaction, category=None):
+        """Remove a transaction, looking it up by the category it was indexed under."""
+        key = (category or transaction.category).lower()
+        transactions = self.by_category.get(key)
+        if transactions is not None:
+            transactions.pop(transaction.id, None)
+            if not transactions:
+                del self.by_category[key]
+
+    def transactions(self, category):
+        """Return the transactions in a category."""
+        return list(self.by_category.get(category.lower(), {}).values())
+
+    def count(self, category):
+        """Return the number of transactions in a category."""
+        return len(self.by_category.get(category.lower(), ()))
+
+    def counts(self):
+        """Return the number of transactions per category, named as in the first transaction of each."""
+        return {next(iter(transactions.values())).category: len(transactions)
+                for transactions in self.by_category.values()}
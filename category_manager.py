@@ -1,11 +1,33 @@
 import os
 import csv
+from file_lock import atomic_write, get_lock, locked
+from instrumentation import count, instrumented, open_file
+
+CATEGORY_FIELDS = ["name", "type"]
+
+DEFAULT_INCOME_CATEGORIES = ["Salary", "Bonus", "Investment", "Gift", "Refund", "Other Income"]
+
+DEFAULT_EXPENSE_CATEGORIES = [
+    "Housing", "Utilities", "Groceries", "Dining Out", "Transportation",
+    "Entertainment", "Shopping", "Health", "Education", "Personal Care",
+    "Travel", "Gifts", "Charity", "Insurance", "Taxes", "Debt Payment", 
+    "Savings", "Miscellaneous"
+]
 
 class CategoryManager:
     def __init__(self, data_dir="data"):
         """Initialize the category manager."""
         self.data_dir = data_dir
         self.categories_file = os.path.join(data_dir, "categories.csv")
+
+        # Resident registry of categories, reloaded only when the file changes
+        self._categories = []
+        self._categories_by_name = {}
+        self._categories_by_type = {}
+        self._file_signature = None
+        # Shared with the TransactionManager of the same data directory
+        self._lock = get_lock(data_dir)
+
         self.ensure_data_directory()
         self.initialize_categories_file()
 
@@ -13,47 +35,112 @@ class CategoryManager:
         """Ensure the data directory exists."""
         os.makedirs(self.data_dir, exist_ok=True)
 
+    @locked
     def initialize_categories_file(self):
         """Initialize the categories file with default categories if it doesn't exist."""
         if not os.path.exists(self.categories_file):
-            default_categories = [
-                # Income categories
-                "Salary", "Bonus", "Investment", "Gift", "Refund", "Other Income",
-
-                # Expense categories
-                "Housing", "Utilities", "Groceries", "Dining Out", "Transportation",
-                "Entertainment", "Shopping", "Health", "Education", "Personal Care",
-                "Travel", "Gifts", "Charity", "Insurance", "Taxes", "Debt Payment", 
-                "Savings", "Miscellaneous"
-            ]
-
-            with open(self.categories_file, 'w', newline='') as file:
+            with open_file(self.categories_file, 'w', newline='') as file:
                 writer = csv.writer(file)
-                writer.writerow(["name", "type"])
+                writer.writerow(CATEGORY_FIELDS)
 
                 # Add income categories
-
-                for category in default_categories[:6]:
+                for category in DEFAULT_INCOME_CATEGORIES:
                     writer.writerow([category, "income"])
 
                 # Add expense categories
-                for category in default_categories[6:]:
+                for category in DEFAULT_EXPENSE_CATEGORIES:
                     writer.writerow([category, "expense"])
+
+    def _get_file_signature(self):
+        """Return the (mtime, size) of the categories file, or None if it is missing."""
+        try:
+            stat = os.stat(self.categories_file)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _set_categories(self, categories):
+        """Rebuild the name and type lookups for an ordered list of categories."""
+        self._categories = categories
+        self._categories_by_name = {}
+        self._categories_by_type = {}
+        for category in categories:
+            self._categories_by_name.setdefault(category['name'].lower(), category)
+            self._categories_by_type.setdefault(category['type'], []).append(category)
+
+    @instrumented("categories.load_categories")
+    def _load_categories(self):
+        """Load categories into memory, re-reading the file only when it has changed."""
+        signature = self._get_file_signature()
+        if signature is not None and signature == self._file_signature:
+            return self._categories
+
+        categories = []
+        if signature is not None:
+            with open_file(self.categories_file, 'r', newline='') as file:
+                categories = list(csv.DictReader(file))
+            count("rows_scanned", len(categories))
+
+        self._set_categories(categories)
+        self._file_signature = signature
+        return self._categories
+
+    @instrumented("categories.append_categories")
+    def _append_categories(self, rows):
+        """Append [name, type] rows to the file and the registry."""
+        was_loaded = self._file_signature is not None and self._file_signature == self._get_file_signature()
+
+        with open_file(self.categories_file, 'a', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerows(rows)
+
+        if was_loaded:
+            for name, category_type in rows:
+                category = {'name': name, 'type': category_type}
+                self._categories.append(category)
+                self._categories_by_name.setdefault(name.lower(), category)
+                self._categories_by_type.setdefault(category_type, []).append(category)
+        self._file_signature = self._get_file_signature() if was_loaded else None
+
+    @instrumented("categories.write_categories")
+    def _write_categories(self, categories):
+        """Rewrite the categories file and the registry with the given categories."""
+        with atomic_write(self.categories_file, newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=CATEGORY_FIELDS)
+            writer.writeheader()
+            for category in categories:
+                writer.writerow(category)
+
+        self._set_categories(categories)
+        self._file_signature = self._get_file_signature()
     
+    @instrumented("categories.get_categories")
     def get_categories(self, transaction_type=None):
         """Get all categories or filter by transaction type."""
-        categories = []
         try:
-            with open(self.categories_file, 'r', newline='') as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    if transaction_type is None or row['type'] == transaction_type:
-                        categories.append(row)
-            return categories
+            self._load_categories()
+            if transaction_type is None:
+                categories = self._categories
+            else:
+                categories = self._categories_by_type.get(transaction_type, [])
+            return [dict(category) for category in categories]
         except Exception as e:
             print(f"Error retrieving categories: {str(e)}")
             return []
+
+    @instrumented("categories.get_category")
+    def get_category(self, name):
+        """Get a category by name, ignoring case, or None if it does not exist."""
+        try:
+            self._load_categories()
+            category = self._categories_by_name.get(name.lower())
+            return dict(category) if category else None
+        except Exception as e:
+            print(f"Error retrieving category: {str(e)}")
+            return None
     
+    @instrumented("categories.add_category")
+    @locked
     def add_category(self, name, category_type):
         """Add a new category."""
         try:
@@ -63,65 +150,74 @@ class CategoryManager:
                 return False, "Category type must be either 'income' or 'expense'"
             
             # Check if category already exists
-            existing_categories = self.get_categories()
-            for category in existing_categories:
-                if category['name'].lower() == name.lower():
-                   return False, "Category already exists"
+            self._load_categories()
+            if name.lower() in self._categories_by_name:
+                return False, "Category already exists"
 
             # Add the new category
-            with open(self.categories_file, 'a', newline='') as file:
-                writer = csv.writer(file)
-                writer.writerow([name, category_type])
+            self._append_categories([[name, category_type]])
 
             return True, "Category added successfully"
         except Exception as e:
             return False, f"Error adding category: {str(e)}"
     
+    @instrumented("categories.add_categories")
+    @locked
+    def add_categories(self, categories):
+        """Add several (name, type) categories with a single write, skipping existing ones."""
+        try:
+            self._load_categories()
+            new_names = set()
+            new_categories = []
+
+            for name, category_type in categories:
+                if category_type not in ["income", "expense"]:
+                    return False, "Category type must be either 'income' or 'expense'"
+                if name.lower() not in self._categories_by_name and name.lower() not in new_names:
+                    new_names.add(name.lower())
+                    new_categories.append([name, category_type])
+
+            self._append_categories(new_categories)
+
+            return True, f"{len(new_categories)} categories added successfully"
+        except Exception as e:
+            return False, f"Error adding categories: {str(e)}"
+
+    @instrumented("categories.delete_category")
+    @locked
     def delete_category(self, name):
         """Delete a category."""
         try:
-            categories = self.get_categories()
-            filtered_categories = [c for c in categories if c['name'].lower() != name.lower()]
-
-            if len(filtered_categories) == len(categories):
+            self._load_categories()
+            if name.lower() not in self._categories_by_name:
                 return False, "Category not found"
             
             # Write back all the categories except the deleted one
-            with open(self.categories_file, 'w', newline='') as file:
-                writer = csv.DictWriter(file, fieldnames=["name", "type"])
-                writer.writeheader()
-                for category in filtered_categories:
-                    writer.writerow(category)
+            self._write_categories([c for c in self._categories if c['name'].lower() != name.lower()])
 
             return True, "Category deleted successfully"
         except Exception as e:
             return False, f"Error deleting category: {str(e)}"
         
+    @instrumented("categories.edit_category")
+    @locked
     def edit_category(self, old_name, new_name, new_type="None"):
         """Edit a category name and optionally its type."""
         try:
-            categories = self.get_categories()
-            found = False
-            
-            for category in categories:
-                if category['name'].lower() == old_name.lower():
-                    category['name'] = new_name
-                    if new_type:
-                        if new_type not in ["income", "expense"]:
-                            return False, "Category type must be either 'income' or 'expense'"
-                        category['type'] = new_type
-                    found = True
-                    break
-
-            if not found:
+            self._load_categories()
+            category = self._categories_by_name.get(old_name.lower())
+
+            if category is None:
                 return False, "Category not found"
+
+            edited = dict(category, name=new_name)
+            if new_type:
+                if new_type not in ["income", "expense"]:
+                    return False, "Category type must be either 'income' or 'expense'"
+                edited['type'] = new_type
             
             # Write back all categories with the edited one
-            with open(self.categories_file, 'w', newline='') as file:
-                writer = csv.DictWriter(file, fieldnames=["name", "type"])
-                writer.writeheader()
-                for category in categories:
-                    writer.writerow(category)
+            self._write_categories([edited if c is category else c for c in self._categories])
 
             return True, "Category updated successfully"
         except Exception as e:
@@ -0,0 +1,148 @@
+from datetime import date
+from transaction import from_cents
+
+# NumPy is optional; without it TransactionManager computes reports row by row
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+def encode(values, codes, labels):
+    """Dictionary-encode a sequence of strings, extending codes and labels as new values appear."""
+    encoded = []
+    for value in values:
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(labels)
+            labels.append(value)
+        encoded.append(code)
+    return encoded
+
+# Array attributes holding one value per row
+COLUMNS = ["dates", "amounts", "category_codes", "account_codes", "type_codes", "live"]
+
+class ColumnStore:
+    def __init__(self, transactions):
+        """Build columnar arrays from a list of Transaction records.
+
+        Dates are held as ordinals, amounts as int64 cents, and category, account and
+        transaction type as integer codes into the matching label lists. Added rows
+        are appended into spare capacity, edited rows are overwritten in place and
+        deleted rows are only marked as not live, so keeping the store up to date
+        never rebuilds it.
+        """
+        self.categories = []
+        self.accounts = []
+        self.types = []
+        self._category_codes = {}
+        self._account_codes = {}
+        self._type_codes = {}
+        # Row of each transaction id
+        self.rows = {}
+        self.size = 0
+
+        self.dates = np.zeros(0, dtype=np.int64)
+        self.amounts = np.zeros(0, dtype=np.int64)
+        self.category_codes = np.zeros(0, dtype=np.int32)
+        self.account_codes = np.zeros(0, dtype=np.int32)
+        self.type_codes = np.zeros(0, dtype=np.int32)
+        self.live = np.zeros(0, dtype=bool)
+        self.add(transactions)
+
+    def _grow(self, needed):
+        """Make room for at least needed rows, doubling the capacity so appends stay cheap."""
+        capacity = len(self.dates)
+        if needed <= capacity:
+            return
+        capacity = max(needed, capacity * 2)
+        for name in COLUMNS:
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            setattr(self, name, grown)
+
+    def add(self, transactions):
+        """Append new transactions."""
+        count = len(transactions)
+        self._grow(self.size + count)
+        rows = slice(self.size, self.size + count)
+        self.dates[rows] = np.fromiter((t.ordinal for t in transactions), dtype=np.int64, count=count)
+        self.amounts[rows] = np.fromiter((t.cents for t in transactions), dtype=np.int64, count=count)
+        self.category_codes[rows] = encode((t.category for t in transactions), self._category_codes, self.categories)
+        self.account_codes[rows] = encode((t.account for t in transactions), self._account_codes, self.accounts)
+        self.type_codes[rows] = encode((t.transaction_type for t in transactions), self._type_codes, self.types)
+        self.live[rows] = True
+        for row, transaction in enumerate(transactions, self.size):
+            self.rows[transaction.id] = row
+        self.size += count
+
+    def remove(self, transaction):
+        """Drop a deleted transaction from the totals."""
+        row = self.rows.pop(transaction.id, None)
+        if row is not None:
+            self.live[row] = False
+
+    def update(self, transaction):
+        """Overwrite the row of an edited transaction with its current values."""
+        row = self.rows.get(transaction.id)
+        if row is None:
+            return
+        self.dates[row] = transaction.ordinal
+        self.amounts[row] = transaction.cents
+        self.category_codes[row] = encode([transaction.category], self._category_codes, self.categories)[0]
+        self.account_codes[row] = encode([transaction.account], self._account_codes, self.accounts)[0]
+        self.type_codes[row] = encode([transaction.transaction_type], self._type_codes, self.types)[0]
+
+    @staticmethod
+    def is_available():
+        """Check whether NumPy is installed."""
+        return np is not None
+
+    def date_mask(self, start_date=None, end_date=None):
+        """Return a boolean mask of the live rows within the inclusive date range."""
+        mask = self.live[:self.size].copy()
+        dates = self.dates[:self.size]
+        if start_date:
+            mask &= dates >= date.fromisoformat(start_date).toordinal()
+        if end_date:
+            mask &= dates <= date.fromisoformat(end_date).toordinal()
+        return mask
+
+    def type_mask(self, transaction_type):
+        """Return a boolean mask of rows with the given transaction type."""
+        if transaction_type not in self.types:
+            return np.zeros(self.size, dtype=bool)
+        return self.type_codes[:self.size] == self.types.index(transaction_type)
+
+    def category_totals(self, mask):
+        """Sum the amounts of the masked rows per category."""
+        codes = self.category_codes[:self.size][mask]
+        # bincount sums in float64, which holds whole cents exactly up to 2**53
+        totals = np.bincount(codes, weights=self.amounts[:self.size][mask], minlength=len(self.categories))
+        counts = np.bincount(codes, minlength=len(self.categories))
+        return {self.categories[code]: from_cents(int(totals[code])) for code in np.flatnonzero(counts)}
+
+    def summary(self, start_date=None, end_date=None):
+        """Summarize income, expenses and category totals within a date range."""
+        mask = self.date_mask(start_date, end_date)
+        amounts = self.amounts[:self.size]
+        total_income = int(amounts[mask & self.type_mask("income")].sum())
+        total_expenses = int(amounts[mask & self.type_mask("expense")].sum())
+
+        return {
+            'total_income': from_cents(total_income),
+            'total_expenses': from_cents(total_expenses),
+            'net': from_cents(total_income - total_expenses),
+            'categories': self.category_totals(mask),
+            'transaction_count': int(mask.sum())
+        }
+
+    def category_breakdown(self, start_date=None, end_date=None):
+        """Split category totals within a date range into income and expense."""
+        mask = self.date_mask(start_date, end_date)
+        income_mask = self.type_mask("income")
+
+        return {
+            'income': self.category_totals(mask & income_mask),
+            'expense': self.category_totals(mask & ~income_mask)
+        }
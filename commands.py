@@ -0,0 +1,263 @@
+"""Non-interactive jipange commands for scripts and pipelines.
+
+Example:
+    python main.py add --amount 4.50 --category Food --account Cash --type expense
+    python main.py import statement.csv
+    python main.py list --type expense --from 2026-01-01 --format csv > expenses.csv
+    python main.py search "category:groceries" | jq .amount
+    python main.py summary --from 2026-01-01 --to 2026-03-31
+    python main.py balances --account Checking --to 2026-03-31
+    python main.py report --period quarter --from 2026-01-01 --format table
+    python main.py --features rollups rebuild-rollups
+    python main.py --workers 4 summary
+
+Transactions are written to stdout one per line as they are read, as JSON Lines
+or CSV, and messages go to stderr. Only the storage backend in use is imported.
+"""
+import os
+import sys
+import csv
+import json
+import argparse
+from itertools import islice
+
+FORMATS = ["jsonl", "csv"]
+
+def write_transactions(transactions, output_format, out):
+    """Stream transactions to out as JSON Lines or CSV, returning how many were written."""
+    written = 0
+    if output_format == "csv":
+        from transaction import TRANSACTION_FIELDS
+        writer = csv.DictWriter(out, fieldnames=TRANSACTION_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        for transaction in transactions:
+            writer.writerow(transaction)
+            written += 1
+    else:
+        for transaction in transactions:
+            out.write(json.dumps(transaction) + "\n")
+            written += 1
+    return written
+
+def read_records(file, input_format):
+    """Yield add_transaction records from a CSV file with a header row, or from JSON Lines."""
+    if input_format == "csv":
+        for row in csv.DictReader(file):
+            yield {key: value for key, value in row.items() if key is not None}
+    else:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+def add_command(manager, options):
+    """Add one transaction."""
+    success, message = manager.add_transaction(options.date, options.amount, options.category,
+                                               options.account, options.description, options.type)
+    print(message, file=sys.stderr)
+    return 0 if success else 1
+
+def import_command(manager, options):
+    """Add the transactions of a CSV or JSON Lines file, writing them in batches."""
+    input_format = options.format
+    if input_format is None:
+        input_format = "jsonl" if options.file.endswith((".jsonl", ".json")) else "csv"
+
+    file = sys.stdin if options.file == "-" else open(options.file, 'r', newline='')
+    added = 0
+    failed = 0
+    try:
+        records = read_records(file, input_format)
+        while True:
+            batch = list(islice(records, options.batch_size))
+            if not batch:
+                break
+            first = added + failed + 1
+            results = manager.add_transactions_batch(batch)
+            # Count from the batch rather than the results, so a record without a result still counts as failed
+            for number in range(first, first + len(batch)):
+                position = number - first
+                success, message = results[position] if position < len(results) else (False, "Not added")
+                if success:
+                    added += 1
+                else:
+                    print(f"Record {number}: {message}", file=sys.stderr)
+            failed = first - 1 + len(batch) - added
+    finally:
+        if file is not sys.stdin:
+            file.close()
+
+    print(f"Imported {added} transactions, {failed} failed", file=sys.stderr)
+    return 0 if failed == 0 else 1
+
+def list_command(manager, options):
+    """Stream the transactions matching the filters."""
+    transactions = manager.iter_transactions(
+        transaction_type=options.type, category=options.category, account=options.account,
+        start_date=options.start_date, end_date=options.end_date,
+        min_amount=options.min_amount, max_amount=options.max_amount
+    )
+    write_transactions(islice(transactions, options.limit), options.format, sys.stdout)
+    return 0
+
+def search_command(manager, options):
+    """Stream the transactions matching a search query."""
+    results = manager.search_transactions(options.query)
+    write_transactions(islice(results, options.limit), options.format, sys.stdout)
+    return 0
+
+def summary_command(manager, options):
+    """Print the income and expense summary as JSON."""
+    print(json.dumps(manager.get_transaction_summary(options.start_date, options.end_date)))
+    return 0
+
+def breakdown_command(manager, options):
+    """Print the category breakdown as JSON."""
+    print(json.dumps(manager.get_category_breakdown(options.start_date, options.end_date)))
+    return 0
+
+def balances_command(manager, options):
+    """Print account balances as of a date, or daily balance series, as JSON."""
+    if options.daily:
+        accounts = [options.account] if options.account else None
+        print(json.dumps(manager.get_balance_series(options.start_date, options.end_date, accounts)))
+    elif options.account:
+        balance = manager.get_account_balance(options.account, options.end_date)
+        if balance is None:
+            print(f"Error: Account {options.account} not found", file=sys.stderr)
+            return 1
+        print(json.dumps({options.account: balance}))
+    else:
+        print(json.dumps(manager.get_account_balances(options.end_date)))
+    return 0
+
+def report_command(manager, options):
+    """Print income and expenses per week, month or quarter as JSON or a table."""
+    report = manager.get_time_series_report(options.period, options.start_date, options.end_date, options.top)
+    if options.format == "table":
+        from reports import format_report
+        for line in format_report(report):
+            print(line)
+    else:
+        print(json.dumps(report))
+    return 0
+
+def rebuild_rollups_command(manager, options):
+    """Rebuild the monthly rollups from the raw transactions."""
+    if not hasattr(manager, "rebuild_rollups"):
+        print(f"Error: The {options.backend} backend has no rollups", file=sys.stderr)
+        return 1
+    success, message = manager.rebuild_rollups()
+    print(message, file=sys.stderr)
+    return 0 if success else 1
+
+def compact_journal_command(manager, options):
+    """Fold the pending journal entries back into the transactions file."""
+    if not hasattr(manager, "compact_journal"):
+        print(f"Error: The {options.backend} backend has no journal", file=sys.stderr)
+        return 1
+    success, message = manager.compact_journal()
+    print(message, file=sys.stderr)
+    return 0 if success else 1
+
+def add_date_range(parser):
+    """Add the inclusive --from/--to date range options."""
+    parser.add_argument("--from", dest="start_date", help="first date, YYYY-MM-DD")
+    parser.add_argument("--to", dest="end_date", help="last date, YYYY-MM-DD")
+
+def build_parser():
+    """Build the argument parser with one subcommand per operation."""
+    parser = argparse.ArgumentParser(prog="jipange", description="Run jipange commands without the menu.")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--backend", choices=["csv", "partitioned", "sqlite"],
+                        default=os.environ.get("JIPANGE_BACKEND", "csv"))
+    parser.add_argument("--features", default=os.environ.get("JIPANGE_FEATURES", ""),
+                        help="comma-separated journal, columnar, rollups and group_commit "
+                             "(default: JIPANGE_FEATURES)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes for summaries, breakdowns and searches of a csv or partitioned ledger")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    add = subparsers.add_parser("add", help="add a transaction")
+    add.add_argument("--date", help="YYYY-MM-DD, default today")
+    add.add_argument("--amount", required=True)
+    add.add_argument("--category", required=True)
+    add.add_argument("--account", required=True)
+    add.add_argument("--description", default="")
+    add.add_argument("--type", choices=["income", "expense"], required=True)
+    add.set_defaults(handler=add_command)
+
+    import_parser = subparsers.add_parser("import", help="add the transactions of a CSV or JSON Lines file")
+    import_parser.add_argument("file", help="file to import, or - for stdin")
+    import_parser.add_argument("--format", choices=FORMATS, help="default: from the file extension, else csv")
+    import_parser.add_argument("--batch-size", type=int, default=1000, help="transactions per write")
+    import_parser.set_defaults(handler=import_command)
+
+    list_parser = subparsers.add_parser("list", help="list transactions")
+    list_parser.add_argument("--type", choices=["income", "expense"])
+    list_parser.add_argument("--category")
+    list_parser.add_argument("--account")
+    add_date_range(list_parser)
+    list_parser.add_argument("--min-amount")
+    list_parser.add_argument("--max-amount")
+    list_parser.add_argument("--limit", type=int)
+    list_parser.add_argument("--format", choices=FORMATS, default="jsonl")
+    list_parser.set_defaults(handler=list_command)
+
+    search = subparsers.add_parser("search", help="search transactions")
+    search.add_argument("query", help="words to match, e.g. 'category:groceries rent'")
+    search.add_argument("--limit", type=int)
+    search.add_argument("--format", choices=FORMATS, default="jsonl")
+    search.set_defaults(handler=search_command)
+
+    summary = subparsers.add_parser("summary", help="print the income and expense summary")
+    add_date_range(summary)
+    summary.set_defaults(handler=summary_command)
+
+    breakdown = subparsers.add_parser("breakdown", help="print the category breakdown")
+    add_date_range(breakdown)
+    breakdown.set_defaults(handler=breakdown_command)
+
+    balances = subparsers.add_parser("balances", help="print account balances")
+    balances.add_argument("--account", help="only this account")
+    balances.add_argument("--daily", action="store_true",
+                          help="end-of-day balances for each day from --from to --to (default: this year)")
+    add_date_range(balances)
+    balances.set_defaults(handler=balances_command)
+
+    report = subparsers.add_parser("report", help="print income and expenses per week, month or quarter")
+    report.add_argument("--period", choices=["week", "month", "quarter"], default="month")
+    report.add_argument("--top", type=int, default=5, help="expense categories listed per period")
+    add_date_range(report)
+    report.add_argument("--format", choices=["json", "table"], default="json")
+    report.set_defaults(handler=report_command)
+
+    rebuild = subparsers.add_parser("rebuild-rollups", help="rebuild the monthly rollups from the transactions")
+    rebuild.set_defaults(handler=rebuild_rollups_command)
+
+    compact = subparsers.add_parser("compact-journal", help="fold the journal back into the transactions file")
+    compact.set_defaults(handler=compact_journal_command)
+    return parser
+
+def main(argv=None):
+    """Run one command and return its exit status."""
+    parser = build_parser()
+    options = parser.parse_args(argv)
+    from backends import create_manager, get_features
+    try:
+        features = get_features(options.features)
+    except ValueError as e:
+        parser.error(str(e))
+    manager = create_manager(options.data_dir, options.backend, features, options.workers)
+    try:
+        return options.handler(manager, options)
+    except BrokenPipeError:
+        # The reader of stdout went away, e.g. `| head`; stop quietly without
+        # another error when the interpreter flushes stdout at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    except (OSError, ValueError) as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
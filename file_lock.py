@@ -0,0 +1,147 @@
+import os
+import functools
+import threading
+from contextlib import contextmanager
+from instrumentation import open_file
+
+# fcntl is only available on Unix; elsewhere the lock only serializes threads of one process
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+class FileLock:
+    def __init__(self, lock_file):
+        """Initialize an exclusive, reentrant advisory lock shared by every writer of a data directory.
+
+        Processes are serialized with flock on lock_file and threads of one process
+        with an RLock, so nested writers, e.g. an edit that adds a category, do not
+        deadlock on themselves.
+        """
+        self.lock_file = lock_file
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._file = None
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        try:
+            if self._depth == 0 and fcntl is not None:
+                self._file = open(self.lock_file, 'a')
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        except BaseException:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self._thread_lock.release()
+            raise
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        self._depth -= 1
+        if self._depth == 0 and self._file is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+        self._thread_lock.release()
+
+class GroupCommit:
+    def __init__(self, path):
+        """Initialize fsync coalescing for appends to one file.
+
+        Writers call written() after appending, then wait_durable() with the returned
+        sequence number. While one fsync runs, later writers queue up and the next
+        fsync covers all of them.
+        """
+        self.path = path
+        self._condition = threading.Condition()
+        self._written = 0
+        self._synced = 0
+        self._syncing = False
+
+    def written(self):
+        """Record an append and return its sequence number."""
+        with self._condition:
+            self._written += 1
+            return self._written
+
+    def wait_durable(self, sequence):
+        """Return once the append with the given sequence number has been fsynced."""
+        with self._condition:
+            while self._synced < sequence:
+                if self._syncing:
+                    self._condition.wait()
+                    continue
+
+                self._syncing = True
+                target = self._written
+                self._condition.release()
+                synced = False
+                try:
+                    fsync_file(self.path)
+                    synced = True
+                finally:
+                    self._condition.acquire()
+                    self._syncing = False
+                    if synced:
+                        self._synced = max(self._synced, target)
+                    self._condition.notify_all()
+
+# One lock per data directory and one group commit per file, shared within the process
+_locks = {}
+_group_commits = {}
+_registry_lock = threading.Lock()
+
+def get_lock(data_dir):
+    """Return the writer lock of a data directory."""
+    key = os.path.abspath(data_dir)
+    with _registry_lock:
+        if key not in _locks:
+            _locks[key] = FileLock(os.path.join(data_dir, ".lock"))
+        return _locks[key]
+
+def locked(method):
+    """Decorate a writer method to run while holding its object's data directory lock."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+def get_group_commit(path):
+    """Return the group commit of a file."""
+    key = os.path.abspath(path)
+    with _registry_lock:
+        if key not in _group_commits:
+            _group_commits[key] = GroupCommit(path)
+        return _group_commits[key]
+
+def fsync_file(path):
+    """Flush a file's data to disk."""
+    fd = os.open(path, os.O_RDWR)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+@contextmanager
+def atomic_write(path, mode='w', sync=True, **kwargs):
+    """Write a file through a temporary file that replaces it once complete.
+
+    Readers see either the old or the new contents, never a partial file. With
+    sync, the new contents are fsynced before the rename so a crash cannot leave
+    an empty file behind; caches that are rebuilt when invalid can skip that.
+    """
+    temp_file = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open_file(temp_file, mode, **kwargs) as file:
+            yield file
+            if sync:
+                file.flush()
+                os.fsync(file.fileno())
+        os.replace(temp_file, path)
+    except BaseException:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        raise
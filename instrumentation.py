@@ -0,0 +1,127 @@
+"""Opt-in instrumentation of the TransactionManager and CategoryManager hot paths.
+
+Set JIPANGE_PROFILE to enable it for a whole run. The collected profile is printed
+to stderr at exit, or written as JSON when the value ends in ".json", e.g.
+JIPANGE_PROFILE=profile.json python main.py
+"""
+import os
+import sys
+import json
+import time
+import atexit
+import functools
+
+COUNTERS = ["calls", "wall_time", "rows_scanned", "bytes_read", "bytes_written", "file_opens"]
+
+class Stats:
+    def __init__(self):
+        """Initialize empty per-operation counters."""
+        self.enabled = False
+        self.operations = {}
+        # Names of the instrumented operations currently running, innermost last
+        self.active = []
+
+    def counters(self, name):
+        """Return the counters for an operation, creating them on first use."""
+        counters = self.operations.get(name)
+        if counters is None:
+            counters = self.operations[name] = dict.fromkeys(COUNTERS, 0)
+        return counters
+
+    def count(self, counter, value=1):
+        """Add to a counter of the innermost running operation."""
+        self.counters(self.active[-1] if self.active else "other")[counter] += value
+
+stats = Stats()
+
+def enable():
+    """Start collecting statistics."""
+    stats.enabled = True
+
+def disable():
+    """Stop collecting statistics, keeping what has been collected."""
+    stats.enabled = False
+
+def is_enabled():
+    """Check whether statistics are being collected."""
+    return stats.enabled
+
+def reset():
+    """Discard the collected statistics."""
+    stats.operations = {}
+
+def get_stats():
+    """Return a copy of the collected statistics keyed by operation name."""
+    return {name: dict(counters) for name, counters in stats.operations.items()}
+
+def count(counter, value=1):
+    """Add to a counter of the running operation if instrumentation is enabled."""
+    if stats.enabled:
+        stats.count(counter, value)
+
+def instrumented(name):
+    """Decorate a function to record its calls and wall time under name."""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not stats.enabled:
+                return function(*args, **kwargs)
+
+            stats.active.append(name)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                counters = stats.counters(name)
+                counters['calls'] += 1
+                counters['wall_time'] += time.perf_counter() - start
+                stats.active.pop()
+        return wrapper
+    return decorator
+
+class InstrumentedFile:
+    def __init__(self, file):
+        """Wrap an open file to count the bytes moved through it when it is closed."""
+        self.file = file
+        self.start = file.buffer.tell() if hasattr(file, 'buffer') else file.tell()
+
+    def __enter__(self):
+        return self.file
+
+    def __exit__(self, *exc_info):
+        writable = self.file.writable()
+        if writable:
+            self.file.flush()
+        end = self.file.buffer.tell() if hasattr(self.file, 'buffer') else self.file.tell()
+        stats.count("bytes_written" if writable else "bytes_read", max(0, end - self.start))
+        self.file.close()
+
+def open_file(path, mode='r', **kwargs):
+    """Open a file for use in a with statement, counting opens and bytes when enabled."""
+    if not stats.enabled:
+        return open(path, mode, **kwargs)
+
+    stats.count("file_opens")
+    return InstrumentedFile(open(path, mode, **kwargs))
+
+def format_stats():
+    """Format the collected statistics as a table, slowest operations first."""
+    lines = [f"{'Operation':<28} {'Calls':>8} {'Time (ms)':>11} {'Rows':>10} {'Read (KB)':>10} {'Written (KB)':>12} {'Opens':>6}",
+             "-" * 90]
+    for name, counters in sorted(stats.operations.items(), key=lambda item: item[1]['wall_time'], reverse=True):
+        lines.append(f"{name:<28} {counters['calls']:>8} {counters['wall_time'] * 1000:>11.2f} "
+                     f"{counters['rows_scanned']:>10} {counters['bytes_read'] / 1024:>10.1f} "
+                     f"{counters['bytes_written'] / 1024:>12.1f} {counters['file_opens']:>6}")
+    return "\n".join(lines)
+
+def dump_stats(destination):
+    """Write the collected statistics as JSON to a path, or as a table to stderr."""
+    if destination.endswith(".json"):
+        with open(destination, 'w') as file:
+            json.dump(get_stats(), file, indent=2)
+    else:
+        print(format_stats(), file=sys.stderr)
+
+if os.environ.get("JIPANGE_PROFILE"):
+    enable()
+    atexit.register(dump_stats, os.environ["JIPANGE_PROFILE"])
@@ -0,0 +1,135 @@
+"""Drive the local service with concurrent keep-alive clients and report its throughput.
+
+Without --url or --unix-socket an in-process server is started on an empty
+temporary data directory. Results are printed as JSON.
+
+Example:
+    python load_generator.py --connections 32 --requests 5000
+    python load_generator.py --url http://127.0.0.1:8765 --read-ratio 0.2
+"""
+import json
+import time
+import random
+import shutil
+import asyncio
+import argparse
+import platform
+import tempfile
+from urllib.parse import urlsplit
+from benchmark import generate_transactions, percentile
+from backends import create_manager
+from server import TransactionServer
+
+async def send(reader, writer, method, path, body=None):
+    """Send one request on a keep-alive connection and return (status, payload)."""
+    data = json.dumps(body).encode('utf-8') if body is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n\r\n".encode('latin-1') + data
+    )
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode('latin-1').partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+async def client(connect, requests, read_ratio, rng, latencies, errors):
+    """Work through a shared iterator of records on one connection, timing each request."""
+    reader, writer = await connect()
+    try:
+        for record in requests:
+            if rng.random() < read_ratio:
+                method, path, body = "GET", "/summary", None
+            else:
+                method, path, body = "POST", "/transactions", record
+
+            started = time.perf_counter()
+            status, _ = await send(reader, writer, method, path, body)
+            latencies.append(time.perf_counter() - started)
+            if status >= 400:
+                errors.append(status)
+    finally:
+        writer.close()
+
+async def run_load(options):
+    """Run the clients against the service and return the results."""
+    app = server = data_dir = None
+    if options.unix_socket:
+        connect = lambda: asyncio.open_unix_connection(options.unix_socket)
+    elif options.url:
+        url = urlsplit(options.url)
+        connect = lambda: asyncio.open_connection(url.hostname, url.port or 80)
+    else:
+        data_dir = options.data_dir or tempfile.mkdtemp(prefix="jipange_load_")
+        app = TransactionServer(lambda: create_manager(data_dir, options.backend), options.batch_window / 1000)
+        server = await app.start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        connect = lambda: asyncio.open_connection("127.0.0.1", port)
+
+    # Clients share one iterator, so the requests are spread over whichever connection is free
+    requests = iter(generate_transactions(options.requests, options.seed))
+    latencies = []
+    errors = []
+    try:
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            client(connect, requests, options.read_ratio, random.Random(options.seed + index), latencies, errors)
+            for index in range(options.connections)
+        ))
+        elapsed = time.perf_counter() - started
+    finally:
+        if server is not None:
+            server.close()
+            app.close()
+        if data_dir is not None and not options.data_dir:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'seconds': round(elapsed, 4),
+        'requests_per_second': round(len(latencies) / elapsed, 1) if elapsed else None,
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 3) if latencies else None,
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3) if latencies else None
+    }
+
+def main():
+    """Parse the command line, run the load and print the results as JSON."""
+    parser = argparse.ArgumentParser(description="Load test the jipange local service.")
+    parser.add_argument("--url", help="address of a running service, e.g. http://127.0.0.1:8765")
+    parser.add_argument("--unix-socket", help="Unix socket of a running service")
+    parser.add_argument("--data-dir", help="data directory for the in-process server (default: a temporary one)")
+    parser.add_argument("--backend", choices=["csv", "partitioned", "sqlite"], default="csv")
+    parser.add_argument("--batch-window", type=float, default=2.0,
+                        help="milliseconds the in-process server waits for more adds before writing")
+    parser.add_argument("--connections", type=int, default=32, help="concurrent keep-alive clients")
+    parser.add_argument("--requests", type=int, default=5000, help="total requests to send")
+    parser.add_argument("--read-ratio", type=float, default=0.0, help="fraction of requests that are summaries")
+    parser.add_argument("--seed", type=int, default=42, help="seed for the synthetic transactions")
+    options = parser.parse_args()
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'target': options.unix_socket or options.url or f"in-process ({options.backend})",
+            'batch_window_ms': None if options.url or options.unix_socket else options.batch_window,
+            'connections': options.connections,
+            'read_ratio': options.read_ratio,
+            'seed': options.seed,
+            'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S")
+        },
+        'results': asyncio.run(run_load(options))
+    }
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,16 @@
-from transaction_cli import TransactionCLI
 import os
+import sys
 
 def main():
-    """Main entry point for the Personal Finance Manager application."""
+    """Main entry point for the Personal Finance Manager application.
+
+    With arguments, e.g. `python main.py list --format csv`, one command from
+    commands.py is run instead of the interactive menu.
+    """
+    if len(sys.argv) > 1:
+        from commands import main as run_command
+        sys.exit(run_command(sys.argv[1:]))
+
     # Clear the screen for a better UI experience
     os.system('cls' if os.name == 'nt' else 'clear')
     
@@ -12,10 +20,23 @@ def main():
     print("Starting Jipange ...")
     print("\nThis application will help you track your finances,")
     print("manage your transactions, and analyze your spending patterns.")
-    print("\nAll data is stored locally in CSV files in the 'data' directory.")
+    # JIPANGE_BACKEND=sqlite stores data in data/jipange.db instead of CSV files, and
+    # JIPANGE_BACKEND=partitioned in one CSV file per month under data/transactions
+    backend = os.environ.get("JIPANGE_BACKEND", "csv")
+    if backend == "sqlite":
+        print("\nAll data is stored locally in a SQLite database in the 'data' directory.")
+    elif backend == "partitioned":
+        print("\nAll data is stored locally in monthly CSV files in the 'data' directory.")
+    else:
+        print("\nAll data is stored locally in CSV files in the 'data' directory.")
     
+    # JIPANGE_FEATURES=journal,columnar,rollups switches on optional features of the CSV backends
+    from backends import get_features
+    features = get_features()
+
     # Initialize and run the CLI
-    transaction_cli = TransactionCLI()
+    from transaction_cli import TransactionCLI
+    transaction_cli = TransactionCLI(backend, features)
     transaction_cli.run()
 
 if __name__ == "__main__":
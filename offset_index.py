@@ -0,0 +1,155 @@
+import io
+import os
+import csv
+import json
+import mmap
+import hashlib
+from file_lock import atomic_write
+from instrumentation import count, open_file
+
+# Bytes just before the end of the indexed region, hashed to tell an append from a rewrite
+CHECK_BYTES = 256
+
+class OffsetIndex:
+    def __init__(self, data_file, index_file):
+        """Initialize an index from transaction id to the (offset, length) of its row in data_file.
+
+        The index is saved to index_file together with how far into the data file it
+        reaches, so when the file grows only the appended tail has to be scanned.
+        Rows found in a tail are only saved once they make up a tenth of the index,
+        so appends do not rewrite the whole index file every time.
+        """
+        self.data_file = data_file
+        self.index_file = index_file
+        self.offsets = {}
+        self.header = None
+        self.scanned = 0
+        self.check = None
+        # Rows indexed since the index file was last written
+        self.unsaved = 0
+        self._loaded = False
+
+    def reset(self):
+        """Forget the indexed rows, e.g. after the data file has been rewritten."""
+        self.offsets = {}
+        self.header = None
+        self.scanned = 0
+        self.check = None
+        self.unsaved = 0
+        self._loaded = True
+
+    def _load(self):
+        """Read the saved index, starting empty if it is missing or unreadable."""
+        self.reset()
+        try:
+            with open_file(self.index_file, 'r') as file:
+                data = json.load(file)
+            self.offsets = data['offsets']
+            self.header = data['header']
+            self.scanned = data['scanned']
+            self.check = data['check']
+        except (OSError, ValueError, KeyError):
+            self.reset()
+
+    def save(self):
+        """Write the index to disk."""
+        data = {
+            'header': self.header,
+            'scanned': self.scanned,
+            'check': self.check,
+            'offsets': self.offsets
+        }
+        with atomic_write(self.index_file, sync=False) as file:
+            json.dump(data, file)
+        self.unsaved = 0
+
+    def _digest(self, buffer, end):
+        """Hash the bytes just before end."""
+        return hashlib.blake2b(buffer[max(0, end - CHECK_BYTES):end], digest_size=16).hexdigest()
+
+    def _records(self, buffer, start):
+        """Yield the (offset, length) of each CSV record from start to the end of the buffer.
+
+        A quoted field may contain line breaks, so a record ends at the first line
+        break with an even number of quotes before it. A last record without a line
+        break is still being appended and is left for the next refresh.
+        """
+        size = len(buffer)
+        offset = start
+        while offset < size:
+            end = buffer.find(b"\n", offset)
+            while end != -1 and buffer.find(b'"', offset, end) != -1 and buffer[offset:end].count(b'"') % 2:
+                end = buffer.find(b"\n", end + 1)
+            if end == -1:
+                return
+            end += 1
+            yield offset, end - offset
+            offset = end
+
+    def _refresh(self, buffer):
+        """Bring the index up to date with the mapped data file, scanning only new bytes."""
+        if not self._loaded:
+            self._load()
+
+        # A shorter file, or different bytes where the index ends, means it was rewritten
+        if self.scanned > len(buffer) or (self.scanned and self._digest(buffer, self.scanned) != self.check):
+            self.reset()
+        if self.scanned == len(buffer):
+            return
+
+        scanned = self.scanned
+        records = self._records(buffer, scanned)
+        if scanned == 0:
+            first = next(records, None)
+            if first is None:
+                return
+            offset, length = first
+            self.header = self._decode(buffer, offset, length)
+            scanned = offset + length
+
+        rows = 0
+        for offset, length in records:
+            transaction_id = buffer[offset:buffer.find(b",", offset, offset + length)].decode('utf-8').strip('"')
+            if transaction_id.strip():
+                self.offsets[transaction_id] = [offset, length]
+                rows += 1
+            scanned = offset + length
+        count("rows_scanned", rows)
+
+        if scanned != self.scanned:
+            rebuilt = self.scanned == 0
+            self.scanned = scanned
+            self.check = self._digest(buffer, self.scanned)
+            self.unsaved += rows
+            if rebuilt or self.unsaved > len(self.offsets) // 10:
+                self.save()
+
+    def _decode(self, buffer, offset, length):
+        """Parse the CSV record at offset into a list of fields."""
+        count("bytes_read", length)
+        text = buffer[offset:offset + length].decode('utf-8')
+        return next(csv.reader(io.StringIO(text, newline='')), [])
+
+    def get(self, transaction_id):
+        """Return the row for a transaction id as a dict of strings, or None if it is not in the file."""
+        if not os.path.exists(self.data_file) or os.path.getsize(self.data_file) == 0:
+            return None
+
+        with open_file(self.data_file, 'rb') as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                self._refresh(buffer)
+                position = self.offsets.get(transaction_id)
+                if position is None:
+                    return None
+
+                row = self._decode(buffer, *position)
+                if not row or row[0] != transaction_id:
+                    # The file changed in a way the check did not catch, so index it again
+                    self.reset()
+                    self._refresh(buffer)
+                    position = self.offsets.get(transaction_id)
+                    if position is None:
+                        return None
+                    row = self._decode(buffer, *position)
+
+        return dict(zip(self.header, row))
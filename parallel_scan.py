@@ -0,0 +1,117 @@
+"""Worker side of the parallel report and search mode of TransactionManager.
+
+Each task names a byte range of a transactions file. A worker process parses only
+that range and returns a partial aggregate, which the parent merges in task order
+so the result matches the serial path exactly. Ranges are split at line breaks, so
+a range that cut through a quoted field with a line break raises ValueError.
+"""
+import io
+import csv
+from transaction import Transaction
+from search_index import matches, parse_query
+
+def read_rows(path, start, end, header):
+    """Return the header and the rows in a byte range of a CSV file.
+
+    A range starting at 0 begins with the file's own header row, and an end of
+    None reads to the end of the file, leaving out a last row still being appended.
+    """
+    with open(path, 'rb') as file:
+        file.seek(start)
+        data = file.read() if end is None else file.read(end - start)
+    data = data[:data.rfind(b"\n") + 1]
+
+    reader = csv.reader(io.StringIO(data.decode('utf-8'), newline=''))
+    if start == 0:
+        header = next(reader, None)
+    return header, (list(reader) if header else [])
+
+def records(task):
+    """Yield the Transaction records of a task within its date range, with journal patches applied."""
+    path, start, end, header, patches, start_date, end_date = task[:7]
+    header, rows = read_rows(path, start, end, header)
+    if not header:
+        return
+    position = {field: index for index, field in enumerate(header)}
+    id_at, date_at = position['id'], position['date']
+
+    for row in rows:
+        if len(row) < len(header):
+            raise ValueError(f"{path}: byte {start} is not at the start of a row")
+        if patches and row[id_at] in patches:
+            entries = patches[row[id_at]]
+            if any(entry['op'] == "delete" for entry in entries):
+                continue
+            for entry in entries:
+                row[position[entry['field']]] = entry['value']
+
+        date = row[date_at]
+        if (start_date and date < start_date) or (end_date and date > end_date):
+            continue
+        yield Transaction.from_dict(dict(zip(header, row)))
+
+def sum_summary(transactions):
+    """Return (income, expenses, count, category totals) in cents for a run of transactions."""
+    total_income = 0
+    total_expenses = 0
+    transaction_count = 0
+    categories = {}
+    for transaction in transactions:
+        cents = transaction.cents
+        if transaction.transaction_type == 'income':
+            total_income += cents
+        elif transaction.transaction_type == 'expense':
+            total_expenses += cents
+        categories[transaction.category] = categories.get(transaction.category, 0) + cents
+        transaction_count += 1
+    return total_income, total_expenses, transaction_count, categories
+
+def sum_breakdown(transactions):
+    """Return (income, expense) category totals in cents for a run of transactions."""
+    income_categories = {}
+    expense_categories = {}
+    for transaction in transactions:
+        totals = income_categories if transaction.transaction_type == 'income' else expense_categories
+        totals[transaction.category] = totals.get(transaction.category, 0) + transaction.cents
+    return income_categories, expense_categories
+
+def merge_totals(target, totals):
+    """Add per-category totals into target, keeping the order categories first appear in."""
+    for category, cents in totals.items():
+        target[category] = target.get(category, 0) + cents
+    return target
+
+def merge_summaries(parts):
+    """Merge sum_summary results, given in ledger order."""
+    total_income = 0
+    total_expenses = 0
+    transaction_count = 0
+    categories = {}
+    for income, expenses, part_count, part_categories in parts:
+        total_income += income
+        total_expenses += expenses
+        transaction_count += part_count
+        merge_totals(categories, part_categories)
+    return total_income, total_expenses, transaction_count, categories
+
+def merge_breakdowns(parts):
+    """Merge sum_breakdown results, given in ledger order."""
+    income_categories = {}
+    expense_categories = {}
+    for part_income, part_expense in parts:
+        merge_totals(income_categories, part_income)
+        merge_totals(expense_categories, part_expense)
+    return income_categories, expense_categories
+
+def summarize(task):
+    """Worker entry point: sum_summary over one task."""
+    return sum_summary(records(task))
+
+def break_down(task):
+    """Worker entry point: sum_breakdown over one task."""
+    return sum_breakdown(records(task))
+
+def search(task):
+    """Worker entry point: the transactions of one task matching the query in its last element, as dicts."""
+    terms = parse_query(task[7])
+    return [transaction.to_dict() for transaction in records(task) if matches(terms, transaction)]
@@ -0,0 +1,199 @@
+import os
+import csv
+import sys
+import json
+from file_lock import atomic_write, locked
+from instrumentation import instrumented, open_file
+from transaction import TRANSACTION_FIELDS, ordinal_to_date
+from transaction_manager import TransactionManager
+
+def partition_of(date):
+    """Return the year-month partition a YYYY-MM-DD date belongs to."""
+    return date[:7]
+
+class PartitionedTransactionManager(TransactionManager):
+    def __init__(self, data_dir="data", columnar=False, rollups=False, workers=1, group_commit=False,
+                 cache_size=128):
+        """Initialize the transaction manager on top of one CSV file per month.
+
+        Transactions live in data/transactions/YYYY-MM.csv and manifest.json lists
+        the partitions with their row counts. Reports over a date range only open
+        the partitions that overlap it, and edits and deletes only rewrite the
+        partitions holding the changed rows, so the journal is not needed. A write
+        only invalidates the cached query results covering its partitions.
+        """
+        self.partitions_dir = os.path.join(data_dir, "transactions")
+        self.manifest_file = os.path.join(self.partitions_dir, "manifest.json")
+        self._manifest = None
+        self._manifest_signature = None
+        super().__init__(data_dir, journal=False, columnar=columnar, rollups=rollups, workers=workers,
+                         group_commit=group_commit, cache_size=cache_size)
+
+    @locked
+    def initialize_transactions_file(self):
+        """Create the partitions directory and an empty manifest if they don't exist."""
+        os.makedirs(self.partitions_dir, exist_ok=True)
+        if not os.path.exists(self.manifest_file):
+            self._write_manifest({})
+
+    def _partition_file(self, partition):
+        """Return the path of a partition file."""
+        return os.path.join(self.partitions_dir, f"{partition}.csv")
+
+    def _get_file_signature(self):
+        """Return the (mtime, size) of the manifest, which is rewritten on every change."""
+        try:
+            stat = os.stat(self.manifest_file)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, None)
+
+    def _read_journal(self):
+        """Return no entries: partitions are rewritten in place and a leftover journal belongs to transactions.csv."""
+        return []
+
+    def _get_manifest(self):
+        """Return the row count per partition, re-reading the manifest only when it has changed."""
+        signature = self._get_file_signature()
+        if self._manifest is None or self._manifest_signature != signature:
+            try:
+                with open_file(self.manifest_file, 'r') as file:
+                    self._manifest = json.load(file)['partitions']
+            except FileNotFoundError:
+                self._manifest = {}
+            self._manifest_signature = signature
+        return self._manifest
+
+    def _write_manifest(self, partitions):
+        """Replace the manifest with the given row count per partition."""
+        with atomic_write(self.manifest_file) as file:
+            json.dump({'partitions': dict(sorted(partitions.items()))}, file)
+        self._manifest = partitions
+        self._manifest_signature = self._get_file_signature()
+
+    def _data_files(self, start_date=None, end_date=None):
+        """Return the partition files overlapping an inclusive date range, oldest first."""
+        first = partition_of(start_date) if start_date else None
+        last = partition_of(end_date) if end_date else None
+        return [
+            self._partition_file(partition) for partition in sorted(self._get_manifest())
+            if (not first or partition >= first) and (not last or partition <= last)
+        ]
+
+    def _scan_ranges(self, start_date=None, end_date=None):
+        """Give each partition overlapping the date range its own parallel task."""
+        return [(data_file, 0, None, None) for data_file in self._data_files(start_date, end_date)]
+
+    def _read_ledger(self):
+        """Parse every partition, oldest first."""
+        transactions = []
+        for data_file in self._data_files():
+            transactions.extend(self._parse_rows(data_file)[0])
+        return transactions
+
+    def _has_snapshot(self):
+        """Partitions are parsed directly and have no snapshot."""
+        return False
+
+    def _write_partition(self, partition, transactions):
+        """Rewrite one partition file, removing it if no transactions are left."""
+        partition_file = self._partition_file(partition)
+        if not transactions:
+            if os.path.exists(partition_file):
+                os.remove(partition_file)
+            return
+
+        with atomic_write(partition_file, newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=TRANSACTION_FIELDS)
+            writer.writeheader()
+            for transaction in transactions:
+                writer.writerow(transaction.to_dict())
+
+    def _append_to_files(self, rows):
+        """Append transaction rows to the partitions of their months, returning the files written."""
+        by_partition = {}
+        for row in rows:
+            by_partition.setdefault(partition_of(row[1]), []).append(row)
+
+        partitions = dict(self._get_manifest())
+        for partition, partition_rows in by_partition.items():
+            partition_file = self._partition_file(partition)
+            is_new = not os.path.exists(partition_file)
+            with open_file(partition_file, 'a', newline='') as file:
+                writer = csv.writer(file)
+                if is_new:
+                    writer.writerow(TRANSACTION_FIELDS)
+                writer.writerows(partition_rows)
+            partitions[partition] = partitions.get(partition, 0) + len(partition_rows)
+        self._write_manifest(partitions)
+        return [self._partition_file(partition) for partition in by_partition]
+
+    def _group_by_partition(self, transactions, only=None):
+        """Group transactions by partition, keeping ledger order and optionally only some partitions."""
+        grouped = {partition: [] for partition in only or ()}
+        for transaction in transactions:
+            partition = partition_of(ordinal_to_date(transaction.ordinal))
+            if only is None or partition in only:
+                grouped.setdefault(partition, []).append(transaction)
+        return grouped
+
+    @instrumented("write_transactions")
+    def _write_transactions(self, transactions):
+        """Rewrite every partition with the given transactions."""
+        grouped = self._group_by_partition(transactions)
+        for partition in self._get_manifest():
+            grouped.setdefault(partition, [])
+
+        for partition, partition_transactions in grouped.items():
+            self._write_partition(partition, partition_transactions)
+        self._write_manifest({partition: len(rows) for partition, rows in grouped.items() if rows})
+
+    @instrumented("rewrite_partitions")
+    def _rewrite_transactions(self, transactions, changed):
+        """Rewrite only the partitions holding the changed transactions."""
+        touched = {partition_of(ordinal_to_date(transaction.ordinal)) for transaction in changed}
+        grouped = self._group_by_partition(transactions, touched)
+
+        partitions = dict(self._get_manifest())
+        for partition, partition_transactions in grouped.items():
+            self._write_partition(partition, partition_transactions)
+            if partition_transactions:
+                partitions[partition] = len(partition_transactions)
+            else:
+                partitions.pop(partition, None)
+        self._write_manifest(partitions)
+
+    def _read_transaction(self, transaction_id):
+        """Look a transaction up in the resident store, since its partition is not known up front."""
+        self._load_transactions()
+        transaction = self._transactions_by_id.get(transaction_id)
+        return transaction.to_dict() if transaction else None
+
+def migrate_to_partitions(data_dir="data"):
+    """Copy the transactions of a single-file data directory into monthly partitions.
+
+    Pending journal entries are applied to the partitions and then compacted into
+    transactions.csv, which keeps the same transactions, so the journal is not
+    replayed over later partitioned writes. The migration is refused if the
+    directory is already partitioned.
+    """
+    try:
+        manager = PartitionedTransactionManager(data_dir)
+        if manager._get_manifest():
+            return False, f"{data_dir} is already partitioned"
+
+        with manager._lock:
+            source = TransactionManager(data_dir)
+            transactions = source._load_transactions()
+            manager._write_transactions(transactions)
+            success, message = source.compact_journal()
+            if not success:
+                return False, message
+        partitions = manager._get_manifest()
+        return True, f"Migrated {len(transactions)} transactions into {len(partitions)} monthly partitions"
+    except Exception as e:
+        return False, f"Error migrating to partitions: {str(e)}"
+
+if __name__ == "__main__":
+    success, message = migrate_to_partitions(sys.argv[1] if len(sys.argv) > 1 else "data")
+    print(message if success else f"Error: {message}")
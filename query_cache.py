@@ -0,0 +1,91 @@
+from collections import OrderedDict
+
+# Returned by get() for a key without a valid result, as None is a valid result
+MISSING = object()
+
+class QueryCache:
+    def __init__(self, max_entries=128):
+        """Keep the results of the most recently used queries, up to max_entries.
+
+        Each result is stored with the inclusive range of YYYY-MM months it was
+        computed from (None for an open end) and the write generation at the time.
+        A write bumps the generation and records it for the months it touched, so it
+        only invalidates results covering those months. Results are also tied to the
+        ledger's file signature: a change made by another process clears them all.
+        """
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.generation = 0
+        # Month -> generation of the last write touching it
+        self.month_generations = {}
+        self.signature = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def clear(self, signature=None):
+        """Drop every result, e.g. when the ledger changed behind our back."""
+        self.invalidations += len(self.entries)
+        self.entries.clear()
+        self.month_generations = {}
+        self.signature = signature
+
+    def _is_stale(self, first, last, generation):
+        """Check whether a write since the given generation touched a month of the range."""
+        for month, written in self.month_generations.items():
+            if written > generation and (first is None or month >= first) and (last is None or month <= last):
+                return True
+        return False
+
+    def get(self, key):
+        """Return the cached result for a key, or MISSING."""
+        entry = self.entries.get(key)
+        if entry is not None and self._is_stale(*entry[:3]):
+            del self.entries[key]
+            self.invalidations += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return MISSING
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[3]
+
+    def put(self, key, first, last, result):
+        """Store a result computed from the months first to last, evicting the least recently used."""
+        if self.max_entries <= 0:
+            return
+        self.entries[key] = (first, last, self.generation, result)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def written(self, months, previous, signature):
+        """Record a write that touched some months and moved the file signature from previous to signature.
+
+        If the signature had already moved before the write, another process changed
+        the ledger and everything is dropped.
+        """
+        if self.signature != previous:
+            self.clear(signature)
+            return
+        self.signature = signature
+        if months:
+            self.generation += 1
+            for month in months:
+                self.month_generations[month] = self.generation
+
+    def stats(self):
+        """Return the hit and miss counts and the cache size."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'entries': len(self.entries),
+            'max_entries': self.max_entries,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations
+        }
@@ -0,0 +1,163 @@
+"""Time-series reports: income and expenses per week, month or quarter.
+
+A ReportBuilder collects totals in one pass over transactions, or over monthly or
+daily pre-aggregated rows, and build() turns them into JSON-ready buckets with the
+top expense categories and trailing 3, 6 and 12-month averages. format_report()
+renders a report as a text table.
+"""
+from datetime import date, timedelta
+from transaction import date_to_ordinal, from_cents, ordinal_to_date
+
+PERIODS = ["week", "month", "quarter"]
+ROLLING_MONTHS = [3, 6, 12]
+
+def month_index(month):
+    """Turn a YYYY-MM month into a running month number."""
+    return int(month[:4]) * 12 + int(month[5:7]) - 1
+
+def month_of(index):
+    """Turn a running month number back into YYYY-MM."""
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+def month_bounds(index):
+    """Return the first and last YYYY-MM-DD date of a running month number."""
+    first = date(index // 12, index % 12 + 1, 1)
+    following = date((index + 1) // 12, (index + 1) % 12 + 1, 1)
+    return first.isoformat(), (following - timedelta(days=1)).isoformat()
+
+def bucket_of(day, period):
+    """Return the (label, first date, last date) of the bucket a YYYY-MM-DD date falls in."""
+    if period == "week":
+        current = date.fromisoformat(day)
+        monday = current - timedelta(days=current.weekday())
+        year, week, _ = current.isocalendar()
+        return f"{year}-W{week:02d}", monday.isoformat(), (monday + timedelta(days=6)).isoformat()
+    index = month_index(day)
+    if period == "quarter":
+        first = index - index % 3
+        return f"{index // 12}-Q{index % 12 // 3 + 1}", month_bounds(first)[0], month_bounds(first + 2)[1]
+    return month_of(index), *month_bounds(index)
+
+def history_start(start_date):
+    """Return the first day of the month 11 months before a date, so 12-month averages are complete."""
+    first, _ = month_bounds(month_index(start_date) - (max(ROLLING_MONTHS) - 1))
+    return first
+
+class ReportBuilder:
+    def __init__(self, period="month", start_date=None, end_date=None, top=5):
+        """Initialize empty bucket and monthly totals for an inclusive date range.
+
+        Rows before start_date only count towards the rolling averages, which are
+        monthly amounts averaged over the months ending with each bucket's last month.
+        """
+        if period not in PERIODS:
+            raise ValueError(f"Period must be one of {', '.join(PERIODS)}")
+        self.period = period
+        self.start_date = start_date
+        self.end_date = end_date
+        self.top = top
+        # Bucket label -> [first date, last date, income, expenses, count, {category: expenses}]
+        self.buckets = {}
+        # Running month number -> [income, expenses]
+        self.months = {}
+        self._days = {}
+
+    def _bucket(self, day):
+        """Return the totals of the bucket a date falls in, creating them on first use.
+
+        The first and last bucket are cut to the report's date range.
+        """
+        label, first, last = bucket_of(day, self.period)
+        totals = self.buckets.get(label)
+        if totals is None:
+            first = max(first, self.start_date) if self.start_date else first
+            last = min(last, self.end_date) if self.end_date else last
+            totals = self.buckets[label] = [first, last, 0, 0, 0, {}]
+        return totals
+
+    def _add(self, bucket, month, category, transaction_type, cents, count):
+        """Apply totals to a bucket, if the row is within range, and to its month."""
+        is_income = transaction_type == 'income'
+        monthly = self.months.setdefault(month, [0, 0])
+        monthly[0 if is_income else 1] += cents
+        if bucket is not None:
+            bucket[2 if is_income else 3] += cents
+            bucket[4] += count
+            if not is_income:
+                bucket[5][category] = bucket[5].get(category, 0) + cents
+
+    def add_day(self, ordinal, category, transaction_type, cents, count=1):
+        """Add the total of one category and type on one day, e.g. a single transaction."""
+        cached = self._days.get(ordinal)
+        if cached is None:
+            day = ordinal_to_date(ordinal)
+            in_range = (not self.start_date or day >= self.start_date) and (not self.end_date or day <= self.end_date)
+            cached = self._days[ordinal] = (self._bucket(day) if in_range else None, month_index(day))
+        self._add(cached[0], cached[1], category, transaction_type, cents, count)
+
+    def add_transactions(self, transactions):
+        """Add Transaction records in a single pass."""
+        add_day = self.add_day
+        for transaction in transactions:
+            add_day(transaction.ordinal, transaction.category, transaction.transaction_type, transaction.cents)
+
+    def add_month(self, month, category, transaction_type, cents, count):
+        """Add the total of one category and type in one YYYY-MM month; not for weekly buckets."""
+        first, last = month_bounds(month_index(month))
+        in_range = (not self.start_date or first >= self.start_date) and (not self.end_date or last <= self.end_date)
+        self._add(self._bucket(first) if in_range else None, month_index(month),
+                  category, transaction_type, cents, count)
+
+    def _rolling(self, last_date):
+        """Return the trailing monthly averages of the months ending with the month of a date."""
+        end = month_index(last_date)
+        rolling = {}
+        for months in ROLLING_MONTHS:
+            income = sum(self.months.get(index, (0, 0))[0] for index in range(end - months + 1, end + 1))
+            expenses = sum(self.months.get(index, (0, 0))[1] for index in range(end - months + 1, end + 1))
+            rolling[str(months)] = {
+                'income': from_cents(round(income / months)),
+                'expenses': from_cents(round(expenses / months)),
+                'net': from_cents(round((income - expenses) / months))
+            }
+        return rolling
+
+    def build(self):
+        """Return the report with every bucket of the range in order, including empty ones."""
+        # Fill in the buckets without transactions, from the start to the end of the range
+        first = self.start_date or min((totals[0] for totals in self.buckets.values()), default=None)
+        last = self.end_date or max((totals[1] for totals in self.buckets.values()), default=None)
+        day = first
+        while first and last and day <= last:
+            day = ordinal_to_date(date_to_ordinal(self._bucket(day)[1]) + 1)
+
+        labels = sorted(self.buckets, key=lambda label: self.buckets[label][0])
+
+        buckets = []
+        for label in labels:
+            first, last, income, expenses, count, categories = self.buckets[label]
+            top = sorted(categories.items(), key=lambda item: (-item[1], item[0]))[:self.top]
+            buckets.append({
+                'bucket': label,
+                'start_date': first,
+                'end_date': last,
+                'income': from_cents(income),
+                'expenses': from_cents(expenses),
+                'net': from_cents(income - expenses),
+                'transaction_count': count,
+                'top_categories': [{'category': category, 'amount': from_cents(cents)} for category, cents in top],
+                'rolling_averages': self._rolling(last)
+            })
+        return {'period': self.period, 'start_date': self.start_date, 'end_date': self.end_date, 'buckets': buckets}
+
+def format_report(report):
+    """Render a report as text table lines."""
+    header = (f"{'Period':<10} {'Income':>12} {'Expenses':>12} {'Net':>12} "
+              + " ".join(f"{f'{months}m avg net':>12}" for months in ROLLING_MONTHS) + "  Top categories")
+    lines = [header, "-" * len(header)]
+    for bucket in report['buckets']:
+        averages = " ".join(f"{bucket['rolling_averages'][str(months)]['net']:>12.2f}" for months in ROLLING_MONTHS)
+        top = ", ".join(f"{item['category']} {item['amount']:.2f}" for item in bucket['top_categories'])
+        lines.append(f"{bucket['bucket']:<10} {bucket['income']:>12.2f} {bucket['expenses']:>12.2f} "
+                     f"{bucket['net']:>12.2f} {averages}  {top}")
+    return lines
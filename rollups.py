@@ -0,0 +1,118 @@
+import json
+from file_lock import atomic_write
+from instrumentation import open_file
+from transaction import from_cents
+
+class MonthlyRollups:
+    def __init__(self):
+        """Initialize empty monthly aggregates.
+
+        by_category maps (year-month, category, transaction type) to [total, count] and
+        by_account maps (year-month, account) to [income, expenses, count]. Amounts are
+        kept in integer cents so the totals stay exact.
+        """
+        self.by_category = {}
+        self.by_account = {}
+
+    @classmethod
+    def from_transactions(cls, transactions):
+        """Build the aggregates from scratch."""
+        rollups = cls()
+        for transaction in transactions:
+            rollups.add(transaction)
+        return rollups
+
+    def add(self, transaction, sign=1):
+        """Apply a transaction to the aggregates, or take it back out with sign=-1."""
+        month = transaction['date'][:7]
+        amount = sign * transaction.cents
+        is_income = transaction.transaction_type == 'income'
+
+        key = (month, transaction.category, transaction.transaction_type)
+        totals = self.by_category.setdefault(key, [0, 0])
+        totals[0] += amount
+        totals[1] += sign
+        if totals[1] == 0:
+            del self.by_category[key]
+
+        key = (month, transaction.account)
+        totals = self.by_account.setdefault(key, [0, 0, 0])
+        totals[0 if is_income else 1] += amount
+        totals[2] += sign
+        if totals[2] == 0:
+            del self.by_account[key]
+
+    def remove(self, transaction):
+        """Take a transaction back out of the aggregates."""
+        self.add(transaction, sign=-1)
+
+    def _category_rows(self, start_month=None, end_month=None):
+        """Yield (category, type, total, count) for the months within an inclusive range."""
+        for (month, category, transaction_type), (total, count) in self.by_category.items():
+            if start_month and month < start_month:
+                continue
+            if end_month and month > end_month:
+                continue
+            yield category, transaction_type, total, count
+
+    def summary(self, start_month=None, end_month=None):
+        """Summarize whole months in the same shape as TransactionManager.get_transaction_summary."""
+        total_income = 0
+        total_expenses = 0
+        transaction_count = 0
+        categories = {}
+
+        for category, transaction_type, total, count in self._category_rows(start_month, end_month):
+            if transaction_type == 'income':
+                total_income += total
+            elif transaction_type == 'expense':
+                total_expenses += total
+            categories[category] = categories.get(category, 0) + total
+            transaction_count += count
+
+        return {
+            'total_income': from_cents(total_income),
+            'total_expenses': from_cents(total_expenses),
+            'net': from_cents(total_income - total_expenses),
+            'categories': {category: from_cents(total) for category, total in categories.items()},
+            'transaction_count': transaction_count
+        }
+
+    def category_breakdown(self, start_month=None, end_month=None):
+        """Split category totals of whole months into income and expense."""
+        breakdown = {'income': {}, 'expense': {}}
+        for category, transaction_type, total, count in self._category_rows(start_month, end_month):
+            totals = breakdown['income' if transaction_type == 'income' else 'expense']
+            totals[category] = totals.get(category, 0) + total
+        for totals in breakdown.values():
+            for category in totals:
+                totals[category] = from_cents(totals[category])
+        return breakdown
+
+    def save(self, rollups_file, signature):
+        """Write the aggregates to disk, tagged with the signature of the ledger they describe."""
+        data = {
+            'signature': signature,
+            'units': "cents",
+            'by_category': [list(key) + totals for key, totals in self.by_category.items()],
+            'by_account': [list(key) + totals for key, totals in self.by_account.items()]
+        }
+        with atomic_write(rollups_file, sync=False) as file:
+            json.dump(data, file)
+
+    @classmethod
+    def load(cls, rollups_file):
+        """Read aggregates from disk, returning (rollups, signature) or (None, None)."""
+        try:
+            with open_file(rollups_file, 'r') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return None, None
+        # Rollups saved before amounts were kept in cents are rebuilt
+        if data.get('units') != "cents":
+            return None, None
+
+        rollups = cls()
+        rollups.by_category = {tuple(row[:3]): row[3:] for row in data['by_category']}
+        rollups.by_account = {tuple(row[:2]): row[2:] for row in data['by_account']}
+        return rollups, data['signature']
@@ -0,0 +1,191 @@
+import os
+import re
+import json
+from bisect import bisect_left
+from file_lock import atomic_write
+from instrumentation import open_file
+
+SEARCH_FIELDS = ["description", "category", "account"]
+
+def delta_file(index_file):
+    """Return the path of the file logging the changes made since the index file was saved."""
+    return os.path.splitext(index_file)[0] + ".delta"
+
+def tokenize(text):
+    """Split text into lowercase word tokens."""
+    return re.findall(r"\w+", str(text).lower())
+
+def parse_query(query):
+    """Split a query into (fields, prefix) terms that must all match.
+
+    Terms match token prefixes in any searchable field, or in one field when
+    written as field:term, e.g. "category:groceries rent".
+    """
+    terms = []
+    for term in query.split():
+        field, _, text = term.partition(":")
+        if text and field.lower() in SEARCH_FIELDS:
+            fields = [field.lower()]
+        else:
+            fields = SEARCH_FIELDS
+            text = term
+        terms.extend((fields, prefix) for prefix in tokenize(text))
+    return terms
+
+def matches(terms, transaction):
+    """Check a transaction against parsed query terms without an index."""
+    if not terms:
+        return False
+    tokens = {field: tokenize(transaction[field]) for field in SEARCH_FIELDS}
+    return all(
+        any(token.startswith(prefix) for field in fields for token in tokens[field])
+        for fields, prefix in terms
+    )
+
+class SearchIndex:
+    def __init__(self):
+        """Initialize an empty inverted index from field tokens to transaction ids."""
+        self.postings = {field: {} for field in SEARCH_FIELDS}
+        # Sorted tokens per field for prefix lookups, rebuilt when the vocabulary changes
+        self._vocabulary = {field: None for field in SEARCH_FIELDS}
+
+    @classmethod
+    def from_transactions(cls, transactions):
+        """Build the index from scratch."""
+        index = cls()
+        for transaction in transactions:
+            index.add(transaction)
+        return index
+
+    def add(self, transaction):
+        """Index the searchable fields of a transaction."""
+        for field in SEARCH_FIELDS:
+            postings = self.postings[field]
+            for token in tokenize(transaction[field]):
+                ids = postings.get(token)
+                if ids is None:
+                    ids = postings[token] = set()
+                    self._vocabulary[field] = None
+                ids.add(transaction['id'])
+
+    def remove(self, transaction):
+        """Remove a transaction, using the field values it was indexed with."""
+        for field in SEARCH_FIELDS:
+            postings = self.postings[field]
+            for token in tokenize(transaction[field]):
+                ids = postings.get(token)
+                if ids is None:
+                    continue
+                ids.discard(transaction['id'])
+                if not ids:
+                    del postings[token]
+                    self._vocabulary[field] = None
+
+    def _lookup(self, field, prefix):
+        """Return the ids with a token in the field starting with prefix."""
+        tokens = self._vocabulary[field]
+        if tokens is None:
+            tokens = self._vocabulary[field] = sorted(self.postings[field])
+
+        ids = set()
+        for position in range(bisect_left(tokens, prefix), len(tokens)):
+            token = tokens[position]
+            if not token.startswith(prefix):
+                break
+            ids |= self.postings[field][token]
+        return ids
+
+    def search(self, query):
+        """Return the ids of transactions matching every term of the query (see parse_query)."""
+        result = None
+        for fields, prefix in parse_query(query):
+            ids = set()
+            for field in fields:
+                ids |= self._lookup(field, prefix)
+            result = ids if result is None else result & ids
+            if not result:
+                return set()
+
+        return result or set()
+
+    def apply(self, changes):
+        """Apply logged changes, a list of [op, id, *field values] with op "+" or "-"."""
+        for op, transaction_id, *values in changes:
+            transaction = dict(zip(SEARCH_FIELDS, values), id=transaction_id)
+            if op == "+":
+                self.add(transaction)
+            else:
+                self.remove(transaction)
+
+    @staticmethod
+    def change(op, transaction):
+        """Return the logged form of adding ("+") or removing ("-") a transaction."""
+        return [op, transaction['id']] + [transaction[field] for field in SEARCH_FIELDS]
+
+    @staticmethod
+    def append_delta(index_file, previous, signature, changes):
+        """Log the changes of a write that moved the ledger from the previous signature to signature.
+
+        Nothing is logged when there is no saved index to apply them to.
+        """
+        if not os.path.exists(index_file):
+            return
+        line = json.dumps({'previous': previous, 'signature': signature, 'changes': changes})
+        with open_file(delta_file(index_file), 'a') as file:
+            file.write(line + "\n")
+
+    def save(self, index_file, signature):
+        """Write the index to disk, tagged with the signature of the ledger it describes.
+
+        The change log is removed, as the saved index already includes it.
+        """
+        data = {
+            'signature': signature,
+            'postings': {
+                field: {token: list(ids) for token, ids in postings.items()}
+                for field, postings in self.postings.items()
+            }
+        }
+        with atomic_write(index_file, sync=False) as file:
+            json.dump(data, file)
+        try:
+            os.remove(delta_file(index_file))
+        except FileNotFoundError:
+            pass
+
+    @classmethod
+    def load(cls, index_file):
+        """Read an index from disk, returning (index, signature, changes applied) or (None, None, 0).
+
+        Logged changes are applied as long as each follows on from the signature
+        the index has reached, so the returned signature is that of the last write
+        whose changes are included.
+        """
+        try:
+            with open_file(index_file, 'r') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return None, None, 0
+
+        index = cls()
+        for field in SEARCH_FIELDS:
+            index.postings[field] = {token: set(ids) for token, ids in data['postings'].get(field, {}).items()}
+        signature = data['signature']
+
+        applied = 0
+        try:
+            with open_file(delta_file(index_file), 'r') as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A line still being written by another process
+                        break
+                    if entry['previous'] != signature:
+                        continue
+                    index.apply(entry['changes'])
+                    signature = entry['signature']
+                    applied += len(entry['changes'])
+        except FileNotFoundError:
+            pass
+        return index, signature, applied
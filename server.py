@@ -0,0 +1,269 @@
+"""Local HTTP/JSON service for other tools to read and write the ledger.
+
+Example:
+    python server.py --data-dir data --port 8765
+
+Endpoints:
+    POST /transactions          add one transaction (a JSON object of add_transaction arguments)
+    POST /transactions/batch    add a JSON list of transactions
+    GET  /transactions          list transactions, filtered by iter_transactions query parameters
+    GET  /transactions/<id>     get one transaction
+    GET  /search?q=...          search transactions
+    GET  /summary               summarize, optionally between start_date and end_date
+    GET  /breakdown             category breakdown, optionally between start_date and end_date
+    GET  /cache                 query cache hit and miss counts
+
+Concurrent single adds are collected for a few milliseconds and written together
+with add_transactions_batch, so a burst of requests costs one disk write.
+"""
+import os
+import sys
+import json
+import asyncio
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, unquote, urlsplit
+from backends import create_manager, get_features
+
+QUERY_FILTERS = ["transaction_type", "category", "account", "start_date", "end_date", "min_amount", "max_amount"]
+
+STATUS_TEXT = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               413: "Payload Too Large", 500: "Internal Server Error"}
+
+MAX_BODY = 64 * 1024 * 1024
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        """An error to be returned to the client as a JSON response."""
+        super().__init__(message)
+        self.status = status
+
+class TransactionServer:
+    def __init__(self, create_manager, batch_window=0.002, max_batch=1000):
+        """Initialize the service around the manager returned by create_manager().
+
+        The manager is created on, and only ever called from, one worker thread, so
+        it needs no locking of its own (SQLite connections also require this) and
+        its resident ledger stays loaded between requests. Single adds arriving
+        within batch_window seconds of each other are written together, up to
+        max_batch at a time.
+        """
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self.manager = self._executor.submit(create_manager).result()
+        self._pending = None
+        self._batcher = None
+
+    async def call(self, function, *args, **kwargs):
+        """Run a blocking manager call on the worker thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, lambda: function(*args, **kwargs))
+
+    async def add(self, record):
+        """Queue one record for the next batched write and return its (success, message)."""
+        if self._pending is None:
+            self._pending = asyncio.Queue()
+            self._batcher = asyncio.create_task(self._write_batches())
+        future = asyncio.get_running_loop().create_future()
+        await self._pending.put((record, future))
+        return await future
+
+    async def _write_batches(self):
+        """Collect queued records into batches and write each with a single call."""
+        while True:
+            batch = [await self._pending.get()]
+            deadline = asyncio.get_running_loop().time() + self.batch_window
+            while len(batch) < self.max_batch:
+                timeout = deadline - asyncio.get_running_loop().time()
+                try:
+                    batch.append(self._pending.get_nowait() if timeout <= 0 else
+                                 await asyncio.wait_for(self._pending.get(), timeout))
+                except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                    break
+
+            try:
+                results = await self.call(self.manager.add_transactions_batch, [record for record, _ in batch])
+                error = None
+            except Exception as e:
+                results = []
+                error = HTTPError(500, f"Error adding transaction: {str(e)}")
+
+            # Every request of the batch gets an answer, even if the manager returned too few results
+            for position, (_, future) in enumerate(batch):
+                if future.done():
+                    continue
+                if position < len(results):
+                    future.set_result(results[position])
+                else:
+                    future.set_exception(error or HTTPError(500, "Error adding transaction: no result was returned"))
+
+    async def handle(self, method, path, query, body):
+        """Dispatch a request and return (status, JSON-serializable payload)."""
+        parts = [unquote(part) for part in path.strip("/").split("/")]
+
+        if parts == ["transactions"] and method == "POST":
+            record = self._parse_body(body, dict)
+            success, message = await self.add(record)
+            return (201 if success else 400), {'success': success, 'message': message}
+
+        if parts == ["transactions", "batch"] and method == "POST":
+            records = self._parse_body(body, list)
+            if not all(isinstance(record, dict) for record in records):
+                raise HTTPError(400, "Expected a JSON list of objects")
+            results = await self.call(self.manager.add_transactions_batch, records)
+            return 200, [{'success': success, 'message': message} for success, message in results]
+
+        if method != "GET":
+            raise HTTPError(405, f"{method} is not supported for {path}")
+
+        if parts == ["transactions"]:
+            filters = {key: value for key, value in query.items() if key in QUERY_FILTERS}
+            limit = int(query['limit']) if 'limit' in query else None
+            return 200, await self.call(self._list_transactions, filters, limit)
+
+        if len(parts) == 2 and parts[0] == "transactions":
+            transaction = await self.call(self.manager.get_transaction, parts[1])
+            if transaction is None:
+                raise HTTPError(404, "Transaction not found")
+            return 200, transaction
+
+        if parts == ["search"]:
+            return 200, await self.call(self.manager.search_transactions, query.get('q', ""))
+
+        if parts == ["summary"]:
+            return 200, await self.call(self.manager.get_transaction_summary,
+                                        query.get('start_date'), query.get('end_date'))
+
+        if parts == ["breakdown"]:
+            return 200, await self.call(self.manager.get_category_breakdown,
+                                        query.get('start_date'), query.get('end_date'))
+
+        if parts == ["cache"]:
+            return 200, await self.call(self.manager.get_cache_stats)
+
+        raise HTTPError(404, f"No endpoint at {path}")
+
+    def _list_transactions(self, filters, limit):
+        """Collect filtered transactions, stopping at limit."""
+        result = []
+        for transaction in self.manager.iter_transactions(**filters):
+            if limit is not None and len(result) >= limit:
+                break
+            result.append(transaction)
+        return result
+
+    def _parse_body(self, body, expected):
+        """Decode a JSON request body of the expected type."""
+        try:
+            data = json.loads(body or b"null")
+        except ValueError as e:
+            raise HTTPError(400, f"Invalid JSON: {e}")
+        if not isinstance(data, expected):
+            raise HTTPError(400, f"Expected a JSON {'object' if expected is dict else 'list'}")
+        return data
+
+    async def serve_connection(self, reader, writer):
+        """Serve HTTP/1.1 requests on one connection until the client closes it."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, version = request_line.decode('latin-1').split()
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode('latin-1').partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get('content-length', 0))
+                keep_alive = (headers.get('connection', "").lower() != "close"
+                              and version.upper() != "HTTP/1.0")
+                if length > MAX_BODY:
+                    status, payload = 413, {'error': "Request body too large"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    url = urlsplit(target)
+                    try:
+                        status, payload = await self.handle(method.upper(), url.path, dict(parse_qsl(url.query)), body)
+                    except HTTPError as e:
+                        status, payload = e.status, {'error': str(e)}
+                    except ValueError as e:
+                        status, payload = 400, {'error': str(e)}
+                    except Exception as e:
+                        status, payload = 500, {'error': str(e)}
+
+                data = json.dumps(payload).encode('utf-8')
+                writer.write(
+                    f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host="127.0.0.1", port=8765, unix_socket=None):
+        """Start listening on a TCP port, or on a Unix socket if one is given."""
+        if unix_socket:
+            return await asyncio.start_unix_server(self.serve_connection, path=unix_socket)
+        return await asyncio.start_server(self.serve_connection, host, port)
+
+    def close(self):
+        """Stop the batcher and the worker thread."""
+        if self._batcher is not None:
+            self._batcher.cancel()
+        self._executor.shutdown(wait=True)
+
+async def serve(options):
+    """Run the service until interrupted."""
+    app = TransactionServer(
+        lambda: create_manager(options.data_dir, options.backend, options.features, options.workers),
+        options.batch_window / 1000
+    )
+    server = await app.start(options.host, options.port, options.unix_socket)
+    where = options.unix_socket or f"http://{options.host}:{options.port}"
+    print(f"Serving {options.data_dir} on {where}", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        app.close()
+
+def main():
+    """Parse the command line and run the service."""
+    parser = argparse.ArgumentParser(description="Serve the jipange ledger over local HTTP/JSON.")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--backend", choices=["csv", "partitioned", "sqlite"], default="csv")
+    parser.add_argument("--features", default=os.environ.get("JIPANGE_FEATURES", ""),
+                        help="comma-separated journal, columnar, rollups and group_commit "
+                             "(default: JIPANGE_FEATURES)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes for the first scans of a csv or partitioned ledger, before it is loaded")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix-socket", help="listen on this Unix socket path instead of TCP")
+    parser.add_argument("--batch-window", type=float, default=2.0,
+                        help="milliseconds to wait for more adds before writing a batch")
+    options = parser.parse_args()
+    try:
+        options.features = get_features(options.features)
+    except ValueError as e:
+        parser.error(str(e))
+    try:
+        asyncio.run(serve(options))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
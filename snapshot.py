@@ -0,0 +1,178 @@
+import gc
+import os
+import sys
+import json
+import struct
+import hashlib
+from array import array
+from file_lock import atomic_write
+from instrumentation import count, open_file
+from transaction import Transaction
+
+MAGIC = b"JIPSNAP1"
+# Fixed-width columns in the order they are written, with their array typecodes
+COLUMNS = [("ordinal", "i"), ("cents", "q"), ("category", "I"), ("account", "I"), ("transaction_type", "I")]
+# Variable-width string columns, stored as one separator-joined blob each
+STRING_COLUMNS = ["id", "description"]
+SEPARATOR = "\0"
+
+def hash_file(path, size):
+    """Hash the first size bytes of a file."""
+    digest = hashlib.blake2b(digest_size=16)
+    remaining = size
+    with open_file(path, 'rb') as file:
+        while remaining > 0:
+            chunk = file.read(min(remaining, 1 << 20))
+            if not chunk:
+                break
+            digest.update(chunk)
+            remaining -= len(chunk)
+    return digest.hexdigest()
+
+def make_transaction(transaction_id, ordinal, cents, category, account, description, transaction_type,
+                     new=Transaction.__new__):
+    """Build a Transaction from already decoded field values, skipping parsing."""
+    transaction = new(Transaction)
+    transaction.id = transaction_id
+    transaction.ordinal = ordinal
+    transaction.cents = cents
+    transaction.category = category
+    transaction.account = account
+    transaction.description = description
+    transaction.transaction_type = transaction_type
+    return transaction
+
+class Snapshot:
+    def __init__(self, snapshot_file, source_file):
+        """Initialize a binary snapshot of the parsed rows of source_file.
+
+        The snapshot holds fixed-width array columns for dates, amounts and coded
+        strings, a string table per coded column and blobs for ids and descriptions.
+        It is tagged with the size, mtime and hash of the source bytes it covers.
+        """
+        self.snapshot_file = snapshot_file
+        self.source_file = source_file
+
+    def save(self, transactions, size):
+        """Write the transactions parsed from the first size bytes of the source file.
+
+        Returns False without writing if a string contains the blob separator.
+        """
+        stat = os.stat(self.source_file)
+        tables = {"category": {}, "account": {}, "transaction_type": {}}
+        columns = {name: array(typecode) for name, typecode in COLUMNS}
+        strings = {name: [] for name in STRING_COLUMNS}
+
+        for transaction in transactions:
+            columns["ordinal"].append(transaction.ordinal)
+            columns["cents"].append(transaction.cents)
+            for name, table in tables.items():
+                value = getattr(transaction, name)
+                code = table.get(value)
+                if code is None:
+                    code = table[value] = len(table)
+                columns[name].append(code)
+            strings["id"].append(transaction.id)
+            strings["description"].append(transaction.description)
+
+        blobs = {}
+        for name, values in strings.items():
+            blob = SEPARATOR.join(values)
+            if blob.count(SEPARATOR) != max(0, len(values) - 1):
+                return False
+            blobs[name] = blob.encode('utf-8')
+
+        header = {
+            'byteorder': sys.byteorder,
+            'source_size': size,
+            'source_mtime_ns': stat.st_mtime_ns if stat.st_size == size else None,
+            'source_hash': hash_file(self.source_file, size),
+            'count': len(columns["ordinal"]),
+            'tables': {name: list(table) for name, table in tables.items()},
+            'lengths': [len(columns[name]) * columns[name].itemsize for name, typecode in COLUMNS]
+                       + [len(blobs[name]) for name in STRING_COLUMNS]
+        }
+        header_bytes = json.dumps(header).encode('utf-8')
+
+        with atomic_write(self.snapshot_file, 'wb', sync=False) as file:
+            file.write(MAGIC)
+            file.write(struct.pack("<I", len(header_bytes)))
+            file.write(header_bytes)
+            for name, typecode in COLUMNS:
+                columns[name].tofile(file)
+            for name in STRING_COLUMNS:
+                file.write(blobs[name])
+        return True
+
+    def _read_header(self, file):
+        """Read and check the snapshot header, returning None if it is unusable."""
+        if file.read(len(MAGIC)) != MAGIC:
+            return None
+        (length,) = struct.unpack("<I", file.read(4))
+        header = json.loads(file.read(length))
+        return header if header['byteorder'] == sys.byteorder else None
+
+    def _covers_source(self, header):
+        """Check whether the source file still starts with the bytes the snapshot was made from.
+
+        A matching size and mtime is trusted as is; otherwise the covered bytes are hashed.
+        """
+        stat = os.stat(self.source_file)
+        size = header['source_size']
+        if stat.st_size < size:
+            return False
+        if stat.st_size == size and stat.st_mtime_ns == header['source_mtime_ns']:
+            return True
+        return hash_file(self.source_file, size) == header['source_hash']
+
+    def is_valid(self):
+        """Check whether the snapshot still matches the source file, reading only its header."""
+        try:
+            with open_file(self.snapshot_file, 'rb') as file:
+                header = self._read_header(file)
+                return header is not None and self._covers_source(header)
+        except (OSError, ValueError, KeyError, struct.error):
+            return False
+
+    def load(self):
+        """Load the snapshot if it still matches the source file.
+
+        Returns (transactions, size) where size is the number of source bytes the
+        snapshot covers, so only the rest of the file needs parsing, or (None, 0).
+        """
+        try:
+            with open_file(self.snapshot_file, 'rb') as file:
+                header = self._read_header(file)
+                if header is None or not self._covers_source(header):
+                    return None, 0
+
+                lengths = iter(header['lengths'])
+                columns = {}
+                for name, typecode in COLUMNS:
+                    column = array(typecode)
+                    column.frombytes(file.read(next(lengths)))
+                    columns[name] = column
+                for name in STRING_COLUMNS:
+                    blob = file.read(next(lengths)).decode('utf-8')
+                    columns[name] = blob.split(SEPARATOR) if header['count'] else []
+        except (OSError, ValueError, KeyError, struct.error):
+            return None, 0
+
+        for name in ("category", "account", "transaction_type"):
+            table = [sys.intern(value) for value in header['tables'][name]]
+            columns[name] = list(map(table.__getitem__, columns[name]))
+
+        # Building many small objects triggers repeated collections that find nothing
+        was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            transactions = list(map(
+                make_transaction, columns["id"], columns["ordinal"].tolist(), columns["cents"].tolist(),
+                columns["category"], columns["account"], columns["description"], columns["transaction_type"]
+            ))
+        finally:
+            if was_enabled:
+                gc.enable()
+
+        count("rows_scanned", len(transactions))
+        return transactions, header['source_size']
@@ -0,0 +1,83 @@
+from bisect import bisect_left, bisect_right
+from operator import attrgetter
+from transaction import date_to_ordinal, ordinal_to_date
+
+# Transaction attribute each page order sorts on; the id breaks ties so every
+# transaction has a unique position
+SORT_FIELDS = {"date": "ordinal", "amount": "cents"}
+
+def encode_cursor(sort_by, key):
+    """Turn a sort key into a cursor string, e.g. '2026-01-31:<id>' or '1250:<id>'."""
+    value, transaction_id = key
+    return f"{ordinal_to_date(value) if sort_by == 'date' else value}:{transaction_id}"
+
+def decode_cursor(sort_by, cursor):
+    """Turn a cursor string back into a sort key."""
+    value, _, transaction_id = cursor.partition(":")
+    return (date_to_ordinal(value) if sort_by == "date" else int(value)), transaction_id
+
+class SortedIndex:
+    def __init__(self, transactions, sort_by):
+        """Keep Transaction records ordered by one of the SORT_FIELDS for cursor paging and range queries.
+
+        A cursor is the sort key of a transaction, so a page starts right after or
+        before it even if transactions were added or deleted in the meantime.
+        """
+        self.sort_by = sort_by
+        self.key = attrgetter(SORT_FIELDS[sort_by], "id")
+        # Two stable sorts on single fields are about twice as fast as one on (value, id) tuples
+        self.transactions = sorted(transactions, key=attrgetter("id"))
+        self.transactions.sort(key=attrgetter(SORT_FIELDS[sort_by]))
+        self.keys = list(map(self.key, self.transactions))
+
+    def add(self, transactions):
+        """Add new transactions, keeping the index ordered."""
+        if len(transactions) == 1:
+            transaction = transactions[0]
+            key = self.key(transaction)
+            position = bisect_right(self.keys, key)
+            self.keys.insert(position, key)
+            self.transactions.insert(position, transaction)
+        else:
+            # Timsort merges the appended block as one run instead of inserting row by row
+            self.transactions.extend(transactions)
+            self.transactions.sort(key=self.key)
+            self.keys = [self.key(t) for t in self.transactions]
+
+    def remove(self, transaction, key=None):
+        """Remove a transaction, looking it up by the key it was indexed under."""
+        position = bisect_left(self.keys, key or self.key(transaction))
+        if position < len(self.keys) and self.transactions[position] is transaction:
+            del self.keys[position]
+            del self.transactions[position]
+
+    def range(self, low=None, high=None):
+        """Return the transactions whose sort value, e.g. a date ordinal, lies within an inclusive range."""
+        start = bisect_left(self.keys, (low,)) if low is not None else 0
+        end = bisect_left(self.keys, (high + 1,)) if high is not None else len(self.keys)
+        return self.transactions[start:max(start, end)]
+
+    def page(self, size, cursor=None, descending=False, backwards=False, include=None):
+        """Return (transactions, more) for the page next to a cursor key.
+
+        The page follows the cursor in sort order, or precedes it when backwards is
+        set, and is returned in display order. Only transactions passing include are
+        counted, and more tells whether further ones lie beyond the page. The scan
+        stops as soon as the page is full.
+        """
+        forward = descending == backwards
+        if forward:
+            start = bisect_right(self.keys, cursor) if cursor else 0
+            positions = range(start, len(self.keys))
+        else:
+            start = bisect_left(self.keys, cursor) if cursor else len(self.keys)
+            positions = range(start - 1, -1, -1)
+
+        page = []
+        for position in positions:
+            transaction = self.transactions[position]
+            if include is None or include(transaction):
+                if len(page) == size:
+                    return (page[::-1] if backwards else page), True
+                page.append(transaction)
+        return (page[::-1] if backwards else page), False
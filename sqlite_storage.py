@@ -0,0 +1,722 @@
+import os
+import sys
+import copy
+import math
+import uuid
+import sqlite3
+from datetime import datetime
+from category_manager import DEFAULT_INCOME_CATEGORIES, DEFAULT_EXPENSE_CATEGORIES
+from query_cache import MISSING, QueryCache
+from reports import ReportBuilder, history_start
+from search_index import matches, parse_query
+from transaction import date_to_ordinal, from_cents, ordinal_to_date, to_cents
+from transaction_manager import TRANSACTION_FIELDS, TransactionManager, normalize_date, validate_transaction
+
+# Text columns compare case-insensitively, matching the CSV managers
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS categories (
+    name TEXT NOT NULL COLLATE NOCASE PRIMARY KEY,
+    type TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS accounts (
+    name TEXT NOT NULL COLLATE NOCASE PRIMARY KEY
+);
+
+CREATE TABLE IF NOT EXISTS transactions (
+    id TEXT NOT NULL PRIMARY KEY,
+    date TEXT NOT NULL,
+    amount REAL NOT NULL,
+    category TEXT NOT NULL COLLATE NOCASE,
+    account TEXT NOT NULL COLLATE NOCASE,
+    description TEXT NOT NULL DEFAULT '',
+    transaction_type TEXT NOT NULL COLLATE NOCASE
+);
+
+CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions (date);
+CREATE INDEX IF NOT EXISTS idx_transactions_category ON transactions (category);
+CREATE INDEX IF NOT EXISTS idx_transactions_account ON transactions (account);
+CREATE INDEX IF NOT EXISTS idx_transactions_type ON transactions (transaction_type, date);
+CREATE INDEX IF NOT EXISTS idx_transactions_date_id ON transactions (date, id);
+CREATE INDEX IF NOT EXISTS idx_transactions_cents_id ON transactions (CAST(ROUND(amount * 100) AS INTEGER), id);
+"""
+
+TRANSACTION_COLUMNS = ", ".join(TRANSACTION_FIELDS)
+
+# Amounts are summed as whole cents so the totals are exact, like the CSV managers
+CENTS = "CAST(ROUND(amount * 100) AS INTEGER)"
+
+# A transaction's effect on its account balance: income adds, expenses subtract
+SIGNED_CENTS = f"CASE WHEN transaction_type = 'income' THEN {CENTS} ELSE -{CENTS} END"
+
+# Page sort orders, matching the cursors of TransactionManager.get_transactions_page
+SORT_COLUMNS = {"date": "date", "amount": CENTS}
+
+def connect(db_file):
+    """Open the database, creating the schema if needed."""
+    connection = sqlite3.connect(db_file)
+    connection.row_factory = sqlite3.Row
+    connection.executescript(SCHEMA)
+    return connection
+
+def build_where(filters=None, start_date=None, end_date=None):
+    """Turn a filter dict and an inclusive date range into a WHERE clause and parameters."""
+    clauses = []
+    params = []
+
+    for key, value in (filters or {}).items():
+        # Unknown keys are ignored, as in TransactionManager.get_transactions
+        if key not in TRANSACTION_FIELDS:
+            continue
+        if key == "amount":
+            clauses.append("amount = ?")
+            params.append(float(value))
+        else:
+            clauses.append(f"{key} = ? COLLATE NOCASE")
+            params.append(str(value))
+
+    if start_date:
+        clauses.append("date >= ?")
+        params.append(normalize_date(start_date))
+    if end_date:
+        clauses.append("date <= ?")
+        params.append(normalize_date(end_date))
+
+    where = " WHERE " + " AND ".join(clauses) if clauses else ""
+    return where, params
+
+class SQLiteCategoryManager:
+    def __init__(self, data_dir="data", db_file=None):
+        """Initialize the category manager on top of a SQLite database."""
+        self.data_dir = data_dir
+        self.db_file = db_file or os.path.join(data_dir, "jipange.db")
+        os.makedirs(self.data_dir, exist_ok=True)
+        self.connection = connect(self.db_file)
+        self.initialize_categories()
+
+    def initialize_categories(self):
+        """Add the default categories if the categories table is empty."""
+        if self.connection.execute("SELECT 1 FROM categories LIMIT 1").fetchone():
+            return
+
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO categories (name, type) VALUES (?, ?)",
+                [(name, "income") for name in DEFAULT_INCOME_CATEGORIES]
+                + [(name, "expense") for name in DEFAULT_EXPENSE_CATEGORIES]
+            )
+
+    def get_categories(self, transaction_type=None):
+        """Get all categories or filter by transaction type."""
+        try:
+            if transaction_type is None:
+                rows = self.connection.execute("SELECT name, type FROM categories ORDER BY rowid")
+            else:
+                rows = self.connection.execute(
+                    "SELECT name, type FROM categories WHERE type = ? ORDER BY rowid", (transaction_type,)
+                )
+            return [dict(row) for row in rows]
+        except Exception as e:
+            print(f"Error retrieving categories: {str(e)}")
+            return []
+
+    def add_category(self, name, category_type):
+        """Add a new category."""
+        try:
+            if category_type not in ["income", "expense"]:
+                return False, "Category type must be either 'income' or 'expense'"
+
+            with self.connection:
+                self.connection.execute("INSERT INTO categories (name, type) VALUES (?, ?)", (name, category_type))
+
+            return True, "Category added successfully"
+        except sqlite3.IntegrityError:
+            return False, "Category already exists"
+        except Exception as e:
+            return False, f"Error adding category: {str(e)}"
+
+    def delete_category(self, name):
+        """Delete a category."""
+        try:
+            with self.connection:
+                cursor = self.connection.execute("DELETE FROM categories WHERE name = ?", (name,))
+
+            if cursor.rowcount == 0:
+                return False, "Category not found"
+
+            return True, "Category deleted successfully"
+        except Exception as e:
+            return False, f"Error deleting category: {str(e)}"
+
+    def edit_category(self, old_name, new_name, new_type="None"):
+        """Edit a category name and optionally its type."""
+        try:
+            if new_type and new_type not in ["income", "expense"]:
+                return False, "Category type must be either 'income' or 'expense'"
+
+            with self.connection:
+                if new_type:
+                    cursor = self.connection.execute(
+                        "UPDATE categories SET name = ?, type = ? WHERE name = ?", (new_name, new_type, old_name)
+                    )
+                else:
+                    cursor = self.connection.execute(
+                        "UPDATE categories SET name = ? WHERE name = ?", (new_name, old_name)
+                    )
+
+            if cursor.rowcount == 0:
+                return False, "Category not found"
+
+            return True, "Category updated successfully"
+        except sqlite3.IntegrityError:
+            return False, "Category already exists"
+        except Exception as e:
+            return False, f"Error editing category: {str(e)}"
+
+class SQLiteTransactionManager:
+    def __init__(self, data_dir="data", db_file=None, cache_size=128):
+        """Initialize the transaction manager on top of a SQLite database.
+
+        Summaries, breakdowns and reports are cached until the database changes.
+        """
+        self.data_dir = data_dir
+        self.db_file = db_file or os.path.join(data_dir, "jipange.db")
+        self.category_manager = SQLiteCategoryManager(data_dir, self.db_file)
+        self.connection = connect(self.db_file)
+        self._query_cache = QueryCache(cache_size)
+
+    def _get_signature(self):
+        """Return a value that changes with every write to the database, by this connection or another."""
+        return self.connection.execute("PRAGMA data_version").fetchone()[0], self.connection.total_changes
+
+    def _cached(self, key, compute, *args):
+        """Return a copy of a query result, caching it until the database changes."""
+        signature = self._get_signature()
+        if self._query_cache.signature != signature:
+            self._query_cache.clear(signature)
+
+        result = self._query_cache.get(key)
+        if result is MISSING:
+            result = compute(*args)
+            self._query_cache.put(key, None, None, result)
+        return copy.deepcopy(result)
+
+    def get_cache_stats(self):
+        """Get the query cache's hit and miss counts and size."""
+        return self._query_cache.stats()
+
+    def add_transaction(self, date, amount, category, account, description, transaction_type):
+        """Add a new transaction to the system."""
+        try:
+            valid, result = validate_transaction(date, amount, category, account, transaction_type)
+            if not valid:
+                return False, result
+            date, amount = result
+
+            # Add the category if it does not exist yet
+            self.category_manager.add_category(category, transaction_type)
+
+            transaction_id = str(uuid.uuid4())
+            with self.connection:
+                account = self._normalize_accounts([account])[account]
+                self.connection.execute(
+                    f"INSERT INTO transactions ({TRANSACTION_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (transaction_id, date, amount, category, account, description, transaction_type)
+                )
+
+            return True, f"Transaction added successfully with ID: {transaction_id}"
+        except Exception as e:
+            return False, f"Error adding transaction: {str(e)}"
+
+    def add_transactions_batch(self, records):
+        """Add many transactions in a single database transaction.
+
+        Each record is a dict with the add_transaction arguments as keys. Returns one
+        (success, message) tuple per record; invalid records do not stop the batch.
+        """
+        records = list(records)
+        results = []
+        rows = []
+        categories = []
+        try:
+            for record in records:
+                if not isinstance(record, dict):
+                    results.append((False, "Transaction must be an object of field values"))
+                    continue
+                description = record.get('description') or ""
+                if not isinstance(description, str):
+                    results.append((False, "Description must be text."))
+                    continue
+                valid, result = validate_transaction(
+                    record.get('date'), record.get('amount'), record.get('category'),
+                    record.get('account'), record.get('transaction_type')
+                )
+                if not valid:
+                    results.append((False, result))
+                    continue
+                date, amount = result
+
+                transaction_id = str(uuid.uuid4())
+                categories.append((record['category'], record['transaction_type']))
+                rows.append((transaction_id, date, amount, record['category'], record['account'],
+                             description, record['transaction_type']))
+                results.append((True, f"Transaction added successfully with ID: {transaction_id}"))
+
+            with self.connection:
+                self.connection.executemany("INSERT OR IGNORE INTO categories (name, type) VALUES (?, ?)", categories)
+                accounts = self._normalize_accounts({row[4] for row in rows})
+                rows = [row[:4] + (accounts[row[4]],) + row[5:] for row in rows]
+                self.connection.executemany(
+                    f"INSERT INTO transactions ({TRANSACTION_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+                )
+
+            return results
+        except Exception as e:
+            # Nothing from the batch was committed, so report the pending and unchecked rows as failed
+            error = (False, f"Error adding transaction: {str(e)}")
+            return ([error if success else (success, message) for success, message in results]
+                    + [error] * (len(records) - len(results)))
+
+    def get_transactions(self, filters=None):
+        """Get transactions with optional filtering."""
+        try:
+            where, params = build_where(filters)
+            rows = self.connection.execute(
+                f"SELECT {TRANSACTION_COLUMNS} FROM transactions{where} ORDER BY rowid", params
+            )
+            return [dict(row) for row in rows]
+        except Exception as e:
+            print(f"Error retrieving transactions: {str(e)}")
+            return []
+
+    def iter_transactions(self, transaction_type=None, category=None, account=None,
+                          start_date=None, end_date=None, min_amount=None, max_amount=None):
+        """Yield matching transactions one at a time from a database cursor."""
+        filters = {'transaction_type': transaction_type, 'category': category, 'account': account}
+        where, params = build_where(
+            {key: value for key, value in filters.items() if value}, start_date, end_date
+        )
+        if min_amount is not None:
+            where += " AND amount >= ?" if where else " WHERE amount >= ?"
+            params.append(float(min_amount))
+        if max_amount is not None:
+            where += " AND amount <= ?" if where else " WHERE amount <= ?"
+            params.append(float(max_amount))
+
+        for row in self.connection.execute(
+            f"SELECT {TRANSACTION_COLUMNS} FROM transactions{where} ORDER BY rowid", params
+        ):
+            yield dict(row)
+
+    def get_transactions_page(self, page_size=20, sort_by="date", descending=False, after=None, before=None,
+                              transaction_type=None, category=None, account=None):
+        """Get one page of transactions sorted by date or amount, seeking from a cursor through an index."""
+        try:
+            column = SORT_COLUMNS[sort_by]
+            filters = {'transaction_type': transaction_type, 'category': category, 'account': account}
+            where, params = build_where({key: value for key, value in filters.items() if value})
+
+            backwards = before is not None
+            cursor = before if backwards else after
+            forward = descending == backwards
+            if cursor:
+                value, _, transaction_id = cursor.partition(":")
+                where += (" AND " if where else " WHERE ") + f"({column}, id) {'>' if forward else '<'} (?, ?)"
+                params += [value if sort_by == "date" else int(value), transaction_id]
+
+            order = "ASC" if forward else "DESC"
+            rows = self.connection.execute(
+                f"SELECT {TRANSACTION_COLUMNS}, {column} AS sort_value FROM transactions{where} "
+                f"ORDER BY {column} {order}, id {order} LIMIT ?", params + [page_size + 1]
+            ).fetchall()
+
+            more = len(rows) > page_size
+            rows = rows[:page_size]
+            if backwards:
+                rows.reverse()
+            first = f"{rows[0]['sort_value']}:{rows[0]['id']}" if rows else None
+            last = f"{rows[-1]['sort_value']}:{rows[-1]['id']}" if rows else None
+            return {
+                'transactions': [{field: row[field] for field in TRANSACTION_FIELDS} for row in rows],
+                'next': last if (more and not backwards) or (backwards and rows) else None,
+                'prev': first if (more and backwards) or (cursor and not backwards and rows) else None
+            }
+        except Exception as e:
+            print(f"Error retrieving transactions: {str(e)}")
+            return {'transactions': [], 'next': None, 'prev': None}
+
+    def get_transaction(self, transaction_id):
+        """Get a single transaction by ID, or None if it does not exist."""
+        try:
+            row = self.connection.execute(
+                f"SELECT {TRANSACTION_COLUMNS} FROM transactions WHERE id = ?", (transaction_id,)
+            ).fetchone()
+            return dict(row) if row else None
+        except Exception as e:
+            print(f"Error retrieving transaction: {str(e)}")
+            return None
+
+    def delete_transactions(self, transaction_id):
+        """Delete a transaction by ID."""
+        try:
+            with self.connection:
+                cursor = self.connection.execute("DELETE FROM transactions WHERE id = ?", (transaction_id,))
+
+            if cursor.rowcount == 0:
+                return False, "Transaction not found"
+
+            return True, "Transaction deleted successfully"
+        except Exception as e:
+            return False, f"Error deleting transaction: {str(e)}"
+
+    def edit_transcation(self, transaction_id, field, new_value):
+        """Edit a specific field of a transaction."""
+        try:
+            transaction = self.get_transaction(transaction_id)
+            if transaction is None:
+                return False, "Transaction not found"
+
+            if field not in TRANSACTION_FIELDS:
+                return False, f"Invalid field: {field}"
+            if field == "id":
+                return False, "Transaction id cannot be changed"
+
+            if field == "date":
+                new_value = normalize_date(new_value)
+            elif field == "amount":
+                new_value = float(new_value)
+                if not math.isfinite(new_value):
+                    return False, "Amount must be a valid number"
+                new_value = from_cents(to_cents(new_value))
+            elif field == "transaction_type" and new_value not in ["income", "expense"]:
+                return False, "Transaction type must be either 'income' or 'expense'"
+            elif field == "category":
+                # Add the category if it does not exist yet
+                self.category_manager.add_category(new_value, transaction['transaction_type'])
+            elif field == "account" and not new_value:
+                return False, "Account cannot be empty"
+
+            with self.connection:
+                if field == "account":
+                    new_value = self._normalize_accounts([new_value])[new_value]
+                self.connection.execute(f"UPDATE transactions SET {field} = ? WHERE id = ?", (new_value, transaction_id))
+
+            return True, "Transaction updated successfully"
+        except ValueError as e:
+            return False, f"Invalid value format: {str(e)}"
+        except Exception as e:
+            return False, f"Error editing transaction: {str(e)}"
+
+    def _normalize_accounts(self, names):
+        """Map each account name to its registered spelling, registering new ones.
+
+        Runs inside the caller's database transaction.
+        """
+        self.connection.executemany("INSERT OR IGNORE INTO accounts (name) VALUES (?)", [(name,) for name in names])
+        return {name: self.connection.execute("SELECT name FROM accounts WHERE name = ?", (name,)).fetchone()[0]
+                for name in names}
+
+    def get_accounts(self):
+        """Get the names of all accounts, including those only used by older transactions."""
+        try:
+            with self.connection:
+                self.connection.execute(
+                    "INSERT OR IGNORE INTO accounts (name) SELECT DISTINCT account FROM transactions ORDER BY rowid"
+                )
+            return [row[0] for row in self.connection.execute("SELECT name FROM accounts ORDER BY rowid")]
+        except Exception as e:
+            print(f"Error retrieving accounts: {str(e)}")
+            return []
+
+    def get_account_balance(self, account, as_of=None):
+        """Get an account's balance at the end of a date, or overall, or None if it does not exist."""
+        try:
+            if account.lower() not in {name.lower() for name in self.get_accounts()}:
+                return None
+            where, params = build_where({'account': account}, end_date=as_of)
+            (cents,) = self.connection.execute(
+                f"SELECT COALESCE(SUM({SIGNED_CENTS}), 0) FROM transactions{where}", params
+            ).fetchone()
+            return from_cents(cents)
+        except Exception as e:
+            print(f"Error retrieving balance: {str(e)}")
+            return None
+
+    def get_account_balances(self, as_of=None):
+        """Get every account's balance at the end of a date, or overall."""
+        try:
+            balances = {name: 0.0 for name in self.get_accounts()}
+            names = {name.lower(): name for name in balances}
+            where, params = build_where(end_date=as_of)
+            for account, cents in self.connection.execute(
+                f"SELECT account, SUM({SIGNED_CENTS}) FROM transactions{where} GROUP BY account", params
+            ):
+                balances[names[account.lower()]] = from_cents(cents)
+            return balances
+        except Exception as e:
+            print(f"Error retrieving balances: {str(e)}")
+            return {}
+
+    def get_balance_series(self, start_date=None, end_date=None, accounts=None):
+        """Get the end-of-day balance of each account for every day of an inclusive date range."""
+        try:
+            today = datetime.now().strftime("%Y-%m-%d")
+            start_date = normalize_date(start_date) if start_date else today[:4] + "-01-01"
+            end_date = normalize_date(end_date) if end_date else today
+            start = date_to_ordinal(start_date)
+            end = date_to_ordinal(end_date)
+            dates = [ordinal_to_date(day) for day in range(start, end + 1)]
+
+            series = {}
+            for name in accounts or self.get_accounts():
+                (balance,) = self.connection.execute(
+                    f"SELECT COALESCE(SUM({SIGNED_CENTS}), 0) FROM transactions WHERE account = ? AND date < ?",
+                    (name, start_date)
+                ).fetchone()
+                daily = dict(self.connection.execute(
+                    f"SELECT date, SUM({SIGNED_CENTS}) FROM transactions "
+                    f"WHERE account = ? AND date >= ? AND date <= ? GROUP BY date", (name, start_date, end_date)
+                ).fetchall())
+
+                balances = {}
+                for date in dates:
+                    balance += daily.get(date, 0)
+                    balances[date] = from_cents(balance)
+                series[name] = balances
+            return series
+        except Exception as e:
+            print(f"Error retrieving balances: {str(e)}")
+            return {}
+
+    def get_time_series_report(self, period="month", start_date=None, end_date=None, top=5):
+        """Get income and expenses per week, month or quarter within a date range, from daily totals."""
+        start_date = normalize_date(start_date) if start_date else None
+        end_date = normalize_date(end_date) if end_date else None
+        return self._cached(("report", period, start_date, end_date, top), self._get_report,
+                            period, start_date, end_date, top)
+
+    def _get_report(self, period, start_date, end_date, top):
+        """Compute get_time_series_report for normalized dates."""
+        builder = ReportBuilder(period, start_date, end_date, top)
+
+        where, params = build_where(start_date=history_start(start_date) if start_date else None, end_date=end_date)
+        for date, category, transaction_type, cents, count in self.connection.execute(
+            f"SELECT date, category, transaction_type, SUM({CENTS}), COUNT(*) FROM transactions{where} "
+            f"GROUP BY date, category, transaction_type", params
+        ):
+            builder.add_day(date_to_ordinal(date), category, transaction_type.lower(), cents, count)
+        return builder.build()
+
+    def _get_category(self, name):
+        """Return the (name, type) row of a category, ignoring case, or None."""
+        return self.connection.execute("SELECT name, type FROM categories WHERE name = ?", (name,)).fetchone()
+
+    def get_category_counts(self):
+        """Get the number of transactions per category, including categories with none."""
+        try:
+            rows = self.connection.execute(
+                "SELECT name, (SELECT COUNT(*) FROM transactions WHERE category = name) FROM categories ORDER BY rowid"
+            )
+            counts = {name: transaction_count for name, transaction_count in rows}
+            # Transactions can still carry names that are not registered categories
+            for name, transaction_count in self.connection.execute(
+                "SELECT category, COUNT(*) FROM transactions "
+                "WHERE category NOT IN (SELECT name FROM categories) GROUP BY category"
+            ):
+                counts[name] = transaction_count
+            return counts
+        except Exception as e:
+            print(f"Error counting transactions: {str(e)}")
+            return {}
+
+    def rename_category(self, old_name, new_name, new_type=None):
+        """Rename a category and optionally change its type, updating its transactions.
+
+        Renaming onto another existing category merges the two.
+        """
+        try:
+            if self._get_category(old_name) is None:
+                return False, "Category not found"
+            if not new_name:
+                return False, "Category name cannot be empty"
+            if new_name.lower() != old_name.lower() and self._get_category(new_name):
+                return self.merge_categories(old_name, new_name)
+            if new_type and new_type not in ["income", "expense"]:
+                return False, "Category type must be either 'income' or 'expense'"
+
+            with self.connection:
+                self.connection.execute(
+                    "UPDATE categories SET name = ?, type = COALESCE(?, type) WHERE name = ?",
+                    (new_name, new_type or None, old_name)
+                )
+                cursor = self.connection.execute(
+                    "UPDATE transactions SET category = ? WHERE category = ?", (new_name, old_name)
+                )
+            return True, f"Category updated successfully ({cursor.rowcount} transactions)"
+        except Exception as e:
+            return False, f"Error editing category: {str(e)}"
+
+    def merge_categories(self, source, target):
+        """Move the transactions of the source category into the target category and delete the source."""
+        try:
+            if source.lower() == target.lower():
+                return False, "Cannot merge a category into itself"
+            if self._get_category(source) is None:
+                return False, "Category not found"
+            target_category = self._get_category(target)
+            if target_category is None:
+                return False, f"Category '{target}' does not exist"
+
+            with self.connection:
+                cursor = self.connection.execute(
+                    "UPDATE transactions SET category = ? WHERE category = ?", (target_category['name'], source)
+                )
+                self.connection.execute("DELETE FROM categories WHERE name = ?", (source,))
+            return True, f"Merged {cursor.rowcount} transactions into {target_category['name']}"
+        except Exception as e:
+            return False, f"Error merging categories: {str(e)}"
+
+    def delete_category(self, name, fallback="Miscellaneous"):
+        """Delete a category, moving its transactions to the fallback category.
+
+        The fallback is created with the deleted category's type if it does not exist.
+        """
+        try:
+            category = self._get_category(name)
+            if category is None:
+                return False, "Category not found"
+            if not fallback or fallback.lower() == name.lower():
+                return False, "The fallback category must differ from the deleted one"
+
+            with self.connection:
+                self.connection.execute(
+                    "INSERT OR IGNORE INTO categories (name, type) VALUES (?, ?)", (fallback, category['type'])
+                )
+                fallback_name = self._get_category(fallback)['name']
+                cursor = self.connection.execute(
+                    "UPDATE transactions SET category = ? WHERE category = ?", (fallback_name, name)
+                )
+                self.connection.execute("DELETE FROM categories WHERE name = ?", (name,))
+            return (True, f"Category deleted successfully "
+                          f"({cursor.rowcount} transactions moved to {fallback_name})")
+        except Exception as e:
+            return False, f"Error deleting category: {str(e)}"
+
+    def search_transactions(self, keyword):
+        """Find transactions matching every word of the keyword, ordered by date.
+
+        Uses the same query syntax as the CSV managers, e.g. "category:groceries rent".
+        LIKE narrows the rows down to those containing each word and the exact
+        word-prefix matching is then done in Python. LIKE with a leading wildcard
+        cannot use an index, so every search scans the whole table.
+        """
+        try:
+            terms = parse_query(str(keyword))
+            if not terms:
+                return []
+
+            conditions = []
+            params = []
+            for fields, prefix in terms:
+                # LIKE only folds ASCII case, so other words are left to the exact check
+                if not prefix.isascii():
+                    continue
+                # Escape LIKE wildcards so the word is matched literally
+                pattern = "%" + prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+                conditions.append("(" + " OR ".join(f"{field} LIKE ? ESCAPE '\\'" for field in fields) + ")")
+                params.extend([pattern] * len(fields))
+            where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+            rows = self.connection.execute(
+                f"SELECT {TRANSACTION_COLUMNS} FROM transactions{where} ORDER BY date, id", params
+            )
+            return [dict(row) for row in rows if matches(terms, row)]
+        except Exception as e:
+            print(f"Error searching transactions: {str(e)}")
+            return []
+
+    def get_transaction_summary(self, start_date=None, end_date=None):
+        """Get a summary of transactions within a date range."""
+        return self._cached(("summary", start_date, end_date), self._get_summary, start_date, end_date)
+
+    def _get_summary(self, start_date, end_date):
+        """Compute get_transaction_summary."""
+        where, params = build_where(start_date=start_date, end_date=end_date)
+
+        total_income, total_expenses, transaction_count = self.connection.execute(
+            f"SELECT COALESCE(SUM(CASE WHEN transaction_type = 'income' THEN {CENTS} END), 0), "
+            f"COALESCE(SUM(CASE WHEN transaction_type = 'expense' THEN {CENTS} END), 0), "
+            f"COUNT(*) FROM transactions{where}", params
+        ).fetchone()
+
+        categories = {
+            row['category']: from_cents(row['total']) for row in self.connection.execute(
+                f"SELECT category, SUM({CENTS}) AS total FROM transactions{where} GROUP BY category", params
+            )
+        }
+
+        return {
+            'total_income': from_cents(total_income),
+            'total_expenses': from_cents(total_expenses),
+            'net': from_cents(total_income - total_expenses),
+            'categories': categories,
+            'transaction_count': transaction_count
+        }
+
+    def get_category_breakdown(self, start_date=None, end_date=None):
+        """Get income and expense totals per category within a date range."""
+        return self._cached(("breakdown", start_date, end_date), self._get_breakdown, start_date, end_date)
+
+    def _get_breakdown(self, start_date, end_date):
+        """Compute get_category_breakdown."""
+        where, params = build_where(start_date=start_date, end_date=end_date)
+
+        breakdown = {'income': {}, 'expense': {}}
+        for row in self.connection.execute(
+            f"SELECT transaction_type = 'income' AS is_income, category, SUM({CENTS}) AS total "
+            f"FROM transactions{where} GROUP BY is_income, category", params
+        ):
+            breakdown['income' if row['is_income'] else 'expense'][row['category']] = from_cents(row['total'])
+        return breakdown
+
+def migrate_csv_to_sqlite(data_dir="data", db_file=None):
+    """Copy the categories and transactions of a CSV data directory into a SQLite database.
+
+    The CSV files are left untouched and any pending journal entries are applied.
+    Rows whose id already exists in the database are skipped, so the migration can
+    safely be run again.
+    """
+    db_file = db_file or os.path.join(data_dir, "jipange.db")
+
+    try:
+        transaction_manager = TransactionManager(data_dir)
+        # Streamed, so neither a snapshot nor unregistered accounts are written back
+        transactions = list(transaction_manager.iter_transactions())
+
+        connection = connect(db_file)
+        with connection:
+            connection.executemany(
+                "INSERT OR IGNORE INTO categories (name, type) VALUES (?, ?)",
+                ((c['name'], c['type']) for c in transaction_manager.category_manager.get_categories())
+            )
+            # Registered accounts keep their spelling; the key ignores case, so an
+            # account only used by older transactions is added once
+            accounts = [account['name'] for account in transaction_manager.account_manager.get_accounts()]
+            connection.executemany(
+                "INSERT OR IGNORE INTO accounts (name) VALUES (?)",
+                ((name,) for name in accounts + [t['account'] for t in transactions])
+            )
+            cursor = connection.executemany(
+                f"INSERT OR IGNORE INTO transactions ({TRANSACTION_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (tuple(t[field] for field in TRANSACTION_FIELDS) for t in transactions)
+            )
+            migrated = cursor.rowcount
+        connection.close()
+
+        return True, f"Migrated {migrated} transactions to {db_file}"
+    except Exception as e:
+        return False, f"Error migrating to SQLite: {str(e)}"
+
+if __name__ == "__main__":
+    success, message = migrate_csv_to_sqlite(sys.argv[1] if len(sys.argv) > 1 else "data")
+    print(message if success else f"Error: {message}")
@@ -0,0 +1,109 @@
+import sys
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from functools import lru_cache
+
+TRANSACTION_FIELDS = ["id", "date", "amount", "category", "account", "description", "transaction_type"]
+
+@lru_cache(maxsize=None)
+def date_to_ordinal(value):
+    """Convert a YYYY-MM-DD date to a day ordinal.
+
+    Ledgers only span a few thousand distinct days, so the results are cached and
+    rows on the same day share one int object. Dates written before they were
+    zero-padded are accepted too.
+    """
+    return datetime.strptime(value, "%Y-%m-%d").toordinal()
+
+@lru_cache(maxsize=None)
+def ordinal_to_date(ordinal):
+    """Convert a day ordinal back to a YYYY-MM-DD date."""
+    return date.fromordinal(ordinal).isoformat()
+
+def to_cents(amount):
+    """Convert an amount given as a string or number to integer cents, rounding half up.
+
+    Raises ValueError if the amount is not a finite number.
+    """
+    try:
+        return int((Decimal(str(amount)) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+    except (InvalidOperation, OverflowError):
+        raise ValueError(f"Invalid amount: {amount}") from None
+
+def from_cents(cents):
+    """Convert integer cents back to the float amount used by the public API."""
+    return cents / 100
+
+class Transaction:
+    """A compact ledger row.
+
+    The amount is kept as integer cents and the date as a day ordinal, and the
+    category, account and transaction type strings are interned. Fields can still
+    be read and written by name with their public values, e.g. t['amount'] is a
+    float and t['date'] a YYYY-MM-DD string, and to_dict() returns a plain dict.
+    """
+    __slots__ = ("id", "ordinal", "cents", "category", "account", "description", "transaction_type")
+
+    def __init__(self, id, date, amount, category, account, description, transaction_type):
+        self.id = id
+        self.ordinal = date_to_ordinal(date)
+        self.cents = to_cents(amount)
+        self.category = sys.intern(category)
+        self.account = sys.intern(account)
+        self.description = description
+        self.transaction_type = sys.intern(transaction_type)
+
+    @classmethod
+    def from_dict(cls, values):
+        """Build a transaction from a dict of field values, e.g. a csv.DictReader row."""
+        return cls(*(values[field] for field in TRANSACTION_FIELDS))
+
+    def __getitem__(self, field):
+        if field == "date":
+            return ordinal_to_date(self.ordinal)
+        if field == "amount":
+            return from_cents(self.cents)
+        if field in TRANSACTION_FIELDS:
+            return getattr(self, field)
+        raise KeyError(field)
+
+    def __setitem__(self, field, value):
+        if field == "date":
+            self.ordinal = date_to_ordinal(value)
+        elif field == "amount":
+            self.cents = to_cents(value)
+        elif field in ("category", "account", "transaction_type"):
+            setattr(self, field, sys.intern(value))
+        elif field in TRANSACTION_FIELDS:
+            setattr(self, field, value)
+        else:
+            raise KeyError(field)
+
+    def __contains__(self, field):
+        return field in TRANSACTION_FIELDS
+
+    def __iter__(self):
+        return iter(TRANSACTION_FIELDS)
+
+    def keys(self):
+        """Return the field names, so dict(transaction) works."""
+        return TRANSACTION_FIELDS
+
+    def to_dict(self):
+        """Return the transaction as a plain dict of public field values."""
+        return {
+            'id': self.id,
+            'date': ordinal_to_date(self.ordinal),
+            'amount': from_cents(self.cents),
+            'category': self.category,
+            'account': self.account,
+            'description': self.description,
+            'transaction_type': self.transaction_type
+        }
+
+    def copy(self):
+        """Return an independent copy of the transaction."""
+        copy = Transaction.__new__(Transaction)
+        for field in Transaction.__slots__:
+            setattr(copy, field, getattr(self, field))
+        return copy
@@ -1,10 +1,12 @@
-from transaction_manager import TransactionManager
-from datetime import datetime
+import instrumentation
+from backends import create_manager
+from reports import format_report
+from datetime import datetime, timedelta
 
 class TransactionCLI:
-    def __init__(self):
-        """Initialize the transaction CLI."""
-        self.transaction_manager = TransactionManager()
+    def __init__(self, backend="csv", features=()):
+        """Initialize the transaction CLI with the csv, partitioned or sqlite storage backend and optional features."""
+        self.transaction_manager = create_manager(backend=backend, features=features)
 
     def display_menu(self):
         """Display the main menu options."""
@@ -12,8 +14,9 @@ class TransactionCLI:
         print("1. Transactions")
         print("2. Categories")
         print("3. Reports")
-        print("4. Exit")
-        return input("Enter your choice (1-4): ")
+        print("4. Diagnostics")
+        print("5. Exit")
+        return input("Enter your choice (1-5): ")
     
     def display_transaction_menu(self):
         """Display the transaction menu options."""
@@ -38,11 +41,13 @@ class TransactionCLI:
     
     def display_report_menu(self):
         """Display the report menu options."""
-        print("n----- Financial Reports -----")
+        print("\n----- Financial Reports -----")
         print("1. Income vs Expenses Summary")
         print("2. Category Breakdown")
-        print("3. Back to main menu")
-        return input("Enter your choice (1-3): ")
+        print("3. Account Balances")
+        print("4. Time Series Report")
+        print("5. Back to main menu")
+        return input("Enter your choice (1-5): ")
     
     def add_transaction_menu(self):
         """Menu for adding a new transaction."""
@@ -51,7 +56,7 @@ class TransactionCLI:
         #Get transaction details from user
         date_input = input("Date (YYYY-MM-DD) [today]: ")
         if not date_input:
-            date_input = datetime.now().strftime("%Y-%m-%\d")
+            date_input = datetime.now().strftime("%Y-%m-%d")
 
 
         # Transaction tyoe
@@ -99,27 +104,52 @@ class TransactionCLI:
             print(f"Error: {message}")
     
     def view_transactions(self):
-        """View all transactions with simple filtering options."""
+        """View transactions a page at a time, sorted by date or amount, with simple filtering options."""
         print("\n----- Transaction History -----")
 
         print("Filter options (leave blank for all):")
         transaction_type = input("Type (income/expense): ")
+        sort_by = "amount" if input("Sort by (date/amount) [date]: ").strip().lower() == "amount" else "date"
+        descending = input("Order (asc/desc) [desc]: ").strip().lower() != "asc"
+        try:
+            page_size = max(1, int(input("Transactions per page [20]: ") or 20))
+        except ValueError:
+            page_size = 20
 
-        filters = {}
-        if transaction_type:
-            filters['transaction_type'] = transaction_type
+        # Only the current page is fetched; the cursors lead to its neighbours
+        after = before = None
+        page_number = 1
+        while True:
+            page = self.transaction_manager.get_transactions_page(
+                page_size, sort_by, descending, after, before, transaction_type or None
+            )
+            if not page['transactions']:
+                print("\nNo transactions found.")
+                return
 
-        transactions = self.transaction_manager.get_transactions(filters)
+            self.display_transactions(page['transactions'], f"Page {page_number}")
 
-        if not transactions:
-            print("\nNo transactions found.")
-            return
-        
-        self.display_transactions(transactions)
+            options = []
+            if page['next']:
+                options.append("n = next")
+            if page['prev']:
+                options.append("p = previous")
+            if not options:
+                return
+
+            choice = input(f"\n{', '.join(options)}, Enter to stop: ").strip().lower()
+            if choice == "n" and page['next']:
+                after, before = page['next'], None
+                page_number += 1
+            elif choice == "p" and page['prev']:
+                after, before = None, page['prev']
+                page_number -= 1
+            else:
+                return
 
-    def display_transactions(self, transactions):
+    def display_transactions(self, transactions, title=None):
         """Display a list of transactions in a formated table."""
-        print(f"\nFound {len(transactions)} transactions.")
+        print(f"\n{title or f'Found {len(transactions)} transactions.'}")
         print(f"\n{'ID':<10} {'Date':<12} {'Type':<8} {'Amount':<10} {'Category':<15} {'Account':<15} {'Description':<30}")
         print("-" * 100)
 
@@ -131,6 +161,7 @@ class TransactionCLI:
     def search_transactions_menu(self):
         """Menu for searching transactions."""
         print("\n----- Search Transactions -----")
+        print("Matches words in the description, category or account, e.g. 'category:groceries rent'.")
         keyword = input("Enter search term: ")
 
         if not keyword:
@@ -151,6 +182,7 @@ class TransactionCLI:
         transaction_id = input("Enter transaction ID to edit: ")
 
         
+        # The edit or delete loads the ledger anyway, so look the transaction up in it
         transactions = self.transaction_manager.get_transactions({"id": transaction_id})
 
         if not transactions:
@@ -207,7 +239,7 @@ class TransactionCLI:
                 self.transaction_manager.category_manager.add_category(new_value, current_type)
             else:
                 try:
-                    new_value = categories[int(category_choice) -1['name']]
+                    new_value = categories[int(category_choice) -1]['name']
                 except (ValueError, IndexError):
                     print("Invalid selection. Using 'Miscellaneaous'.")
                     new_value = "Miscellaneaous"
@@ -227,6 +259,7 @@ class TransactionCLI:
         print("\n----- Delete Transaction -----")
         transaction_id = input("Enter transaction ID to delete: ")
 
+        # The edit or delete loads the ledger anyway, so look the transaction up in it
         transactions = self.transaction_manager.get_transactions({"id": transaction_id})
 
         if not transactions:
@@ -270,12 +303,13 @@ class TransactionCLI:
         if not categories:
             print("No categories found.")
             return
-        
-        print(f"\n{'Name':<20} {'Type':<10}")
-        print("-" * 30)
+
+        counts = self.transaction_manager.get_category_counts()
+        print(f"\n{'Name':<20} {'Type':<10} {'Transactions':>12}")
+        print("-" * 44)
 
         for category in categories:
-            print(f"{category['name']:<20} {category['type']:<10}")
+            print(f"{category['name']:<20} {category['type']:<10} {counts.get(category['name'], 0):>12}")
     
     def add_category_menu(self):
         """Menu for add a new category."""
@@ -318,6 +352,7 @@ class TransactionCLI:
         
         print(f"\nEditing category: {selected_category['name']} ({selected_category['type']})")
 
+        print("Renaming it to another existing category merges the two.")
         new_name = input(f"New name [{selected_category['name']}]: ")
         if not new_name:
             new_name = selected_category['name']
@@ -334,12 +369,12 @@ class TransactionCLI:
         else:
             new_type = selected_category['type']
 
-        success, message = self.transaction_manager.category_manager.edit_category(
+        success, message = self.transaction_manager.rename_category(
             selected_category['name'], new_name, new_type
         )
 
         if success:
-            print("Category updated successfully!")
+            print(f"{message}!")
         else:
             print(f"Error: {message}")
 
@@ -350,7 +385,7 @@ class TransactionCLI:
         categories = self.transaction_manager.category_manager.get_categories()
         print("\nAvailable Categories:")
         for i, category in enumerate(categories,1):
-            print(f"{i}. {category['name'] ({category['type']})}")
+            print(f"{i}. {category['name']} ({category['type']})")
 
         if not categories:
             print("No categories found.")
@@ -365,24 +400,23 @@ class TransactionCLI:
             return
         
         print(f"\nYou are about to delete category: {selected_category['name']}")
-        print("WARNING: This will not delete transactions in this category, but they will have a category that no longer exists.")
+        print("Its transactions will be moved to another category.")
+        fallback = input("Move them to [Miscellaneous]: ") or "Miscellaneous"
         confirm = input("Are you syre? (y/n): ")
 
         if confirm.lower() != 'y':
             print("Deletion cancelled.")
             return
         
-        success, message = self.transaction_manager.category_manager.delete_category(selected_category['name'])
+        success, message = self.transaction_manager.delete_category(selected_category['name'], fallback)
 
         if success:
-            print("Category deleted successfuly!")
+            print(f"{message}!")
         else:
             print(f"Error: {message}")
 
-    def income_expense_summary(self):
-        """Display income vs expenses summary."""
-        print("\n----- Income vs Expenses Summary -----")
-        
+    def select_time_period(self):
+        """Ask for a report period and return its inclusive (start_date, end_date, period_name)."""
         print("Time period:")
         print("1. This month")
         print("2. Last month")
@@ -406,17 +440,15 @@ class TransactionCLI:
             last_month = today.month - 1 if today.month > 1 else 12
             last_month_year = today.year if today.month > 1 else today.year - 1
             start_date = datetime(last_month_year, last_month, 1).strftime("%Y-%m-%d")
-            if last_month == 12:
-                end_date = datetime(last_month_year + 1, 1, 1).strftime("%Y-%m-%d")
-            else:
-                end_date = datetime(last_month_year, last_month + 1, 1).strftime("%Y-%m-%d")
+            # Ranges are inclusive, so end on the last day of last month
+            end_date = (datetime(today.year, today.month, 1) - timedelta(days=1)).strftime("%Y-%m-%d")
             period_name = f"Last month ({datetime(last_month_year, last_month, 1).strftime('%B %Y')})"
         elif choice == "3":  # This year
             start_date = datetime(today.year, 1, 1).strftime("%Y-%m-%d")
             period_name = f"This year ({today.year})"
         elif choice == "4":  # Last year
             start_date = datetime(today.year - 1, 1, 1).strftime("%Y-%m-%d")
-            end_date = datetime(today.year, 1, 1).strftime("%Y-%m-%d")
+            end_date = datetime(today.year - 1, 12, 31).strftime("%Y-%m-%d")
             period_name = f"Last year ({today.year - 1})"
         elif choice == "6":  # Custom range
             start_date = input("Start date (YYYY-MM-DD): ")
@@ -439,6 +471,14 @@ class TransactionCLI:
                 start_date = None
                 end_date = None
         
+        return start_date, end_date, period_name
+
+    def income_expense_summary(self):
+        """Display income vs expenses summary."""
+        print("\n----- Income vs Expenses Summary -----")
+        
+        start_date, end_date, period_name = self.select_time_period()
+        
         # Get summary
         summary = self.transaction_manager.get_transaction_summary(start_date, end_date)
         
@@ -452,106 +492,63 @@ class TransactionCLI:
             savings_rate = (summary['net'] / summary['total_income']) * 100
             print(f"Savings Rate: {savings_rate:.2f}%")
 
+    def account_balances(self):
+        """Display the balance of every account as of a date."""
+        print("\n----- Account Balances -----")
+
+        as_of = input("As of date (YYYY-MM-DD) [today]: ") or datetime.now().strftime("%Y-%m-%d")
+        balances = self.transaction_manager.get_account_balances(as_of)
+
+        if not balances:
+            print("No accounts found.")
+            return
+
+        print(f"\n{'Account':<20} {'Balance':>12}")
+        print("-" * 33)
+        for account, balance in balances.items():
+            print(f"{account:<20} {f'${balance:.2f}':>12}")
+        print("-" * 33)
+        print(f"{'Total':<20} {f'${sum(balances.values()):.2f}':>12}")
+
+    def time_series_report(self):
+        """Display income and expenses per week, month or quarter."""
+        print("\n----- Time Series Report -----")
+
+        print("Group by:")
+        print("1. Week")
+        print("2. Month")
+        print("3. Quarter")
+        period = {"1": "week", "2": "month", "3": "quarter"}.get(input("Enter choice (1-3) [2]: "), "month")
+        top = input("Top expense categories per period [3]: ")
+        top = int(top) if top.isdigit() else 3
+
+        start_date, end_date, period_name = self.select_time_period()
+        report = self.transaction_manager.get_time_series_report(period, start_date, end_date, top)
+
+        if not report['buckets']:
+            print("No transactions found.")
+            return
+
+        print(f"\n----- {period.capitalize()}ly Report for {period_name} -----")
+        for line in format_report(report):
+            print(line)
+
     def category_breakdown(self):
         """Display category breakdown report."""
         print("\n----- Category Breakdown -----")
         
-        print("Time period:")
-        print("1. This month")
-        print("2. Last month")
-        print("3. This year")
-        print("4. Last year")
-        print("5. All time")
-        print("6. Custom range")
-        
-        choice = input("Enter choice (1-6): ")
-        
-        start_date = None
-        end_date = None
-        period_name = "All time"
-        
-        today = datetime.now()
-        
-        if choice == "1":  # This month
-            start_date = datetime(today.year, today.month, 1).strftime("%Y-%m-%d")
-            period_name = f"This month ({today.strftime('%B %Y')})"
-        elif choice == "2":  # Last month
-            last_month = today.month - 1 if today.month > 1 else 12
-            last_month_year = today.year if today.month > 1 else today.year - 1
-            start_date = datetime(last_month_year, last_month, 1).strftime("%Y-%m-%d")
-            if last_month == 12:
-                end_date = datetime(last_month_year + 1, 1, 1).strftime("%Y-%m-%d")
-            else:
-                end_date = datetime(last_month_year, last_month + 1, 1).strftime("%Y-%m-%d")
-            period_name = f"Last month ({datetime(last_month_year, last_month, 1).strftime('%B %Y')})"
-        elif choice == "3":  # This year
-            start_date = datetime(today.year, 1, 1).strftime("%Y-%m-%d")
-            period_name = f"This year ({today.year})"
-        elif choice == "4":  # Last year
-            start_date = datetime(today.year - 1, 1, 1).strftime("%Y-%m-%d")
-            end_date = datetime(today.year, 1, 1).strftime("%Y-%m-%d")
-            period_name = f"Last year ({today.year - 1})"
-        elif choice == "6":  # Custom range
-            start_date = input("Start date (YYYY-MM-DD): ")
-            end_date = input("End date (YYYY-MM-DD): ")
-            
-            # Validate dates
-            try:
-                if start_date:
-                    datetime.strptime(start_date, "%Y-%m-%d")
-                if end_date:
-                    datetime.strptime(end_date, "%Y-%m-%d")
-                
-                if start_date and end_date:
-                    period_name = f"From {start_date} to {end_date}"
-                elif start_date:
-                    period_name = f"From {start_date}"
-                elif end_date:
-                    period_name = f"Until {end_date}"
-            except ValueError:
-                print("Invalid date format. Using all time.")
-                start_date = None
-                end_date = None
-        
-        # Get summary
-        summary = self.transaction_manager.get_transaction_summary(start_date, end_date)
+        start_date, end_date, period_name = self.select_time_period()
         
         print(f"\n----- Category Breakdown for {period_name} -----")
         
-        # Get all transactions for the period
-        transactions = []
-        for transaction in self.transaction_manager.get_transactions():
-            transaction_date = datetime.strptime(transaction['date'], "%Y-%m-%d")
-            
-            include = True
-            if start_date:
-                start = datetime.strptime(start_date, "%Y-%m-%d")
-                if transaction_date < start:
-                    include = False
-            if end_date:
-                end = datetime.strptime(end_date, "%Y-%m-%d")
-                if transaction_date > end:
-                    include = False
-            
-            if include:
-                transactions.append(transaction)
-        
         # Group transactions by category and type
-        income_categories = {}
-        expense_categories = {}
-        
-        for transaction in transactions:
-            category = transaction['category']
-            amount = transaction['amount']
-            
-            if transaction['transaction_type'] == 'income':
-                if category not in income_categories:
-                    income_categories[category] = 0
-                income_categories[category] += amount
-            else:  # expense
-                if category not in expense_categories:
-                    expense_categories[category] = 0
-                expense_categories[category] += amount
+        breakdown = self.transaction_manager.get_category_breakdown(start_date, end_date)
+        income_categories = breakdown['income']
+        expense_categories = breakdown['expense']
+        summary = {
+            'total_income': sum(income_categories.values()),
+            'total_expenses': sum(expense_categories.values())
+        }
         
         # Display income categories
         if income_categories:
@@ -579,6 +576,32 @@ class TransactionCLI:
                 percentage = (amount / summary['total_expenses']) * 100 if summary['total_expenses'] > 0 else 0
                 print(f"{category:<20} ${amount:<11.2f} {percentage:<11.2f}%")
     
+    def diagnostics_menu(self):
+        """Display the operation statistics collected by the instrumentation."""
+        print("\n----- Diagnostics -----")
+
+        cache = self.transaction_manager.get_cache_stats()
+        print(f"Query cache: {cache['hits']} hits, {cache['misses']} misses ({cache['hit_rate']:.0%}), "
+              f"{cache['entries']}/{cache['max_entries']} entries, {cache['evictions']} evicted, "
+              f"{cache['invalidations']} invalidated")
+
+        if not instrumentation.is_enabled():
+            print("Instrumentation is off. Set JIPANGE_PROFILE to collect statistics for a whole run.")
+            if input("Start collecting statistics now? (y/n): ").lower() == 'y':
+                instrumentation.enable()
+                print("Statistics will be collected from now on.")
+            return
+
+        if not instrumentation.get_stats():
+            print("No operations recorded yet.")
+            return
+
+        print(instrumentation.format_stats())
+
+        if input("\nReset statistics? (y/n): ").lower() == 'y':
+            instrumentation.reset()
+            print("Statistics reset.")
+
     def handle_transaction_menu(self):
         """Handle the transaction submenu."""
         while True:
@@ -611,7 +634,7 @@ class TransactionCLI:
             elif choice == "2":
                 self.add_category_menu()
             elif choice == "3":
-                self.edit_category_menu()
+                self.edit_category()
             elif choice == "4":
                 self.delete_category_menu()
             elif choice == "5":
@@ -631,6 +654,10 @@ class TransactionCLI:
             elif choice == "2":
                 self.category_breakdown()
             elif choice == "3":
+                self.account_balances()
+            elif choice == "4":
+                self.time_series_report()
+            elif choice == "5":
                 return
             else:
                 print("Invalid choice. Please try again.")
@@ -643,19 +670,16 @@ class TransactionCLI:
             choice = self.display_menu()
 
             if choice == "1":
-                self.add_transaction_menu()
+                self.handle_transaction_menu()
             elif choice == "2":
-                self.view_transactions()
+                self.handle_category_menu()
             elif choice == "3":
-                self.search_transactions_menu()
+                self.handle_report_menu()
             elif choice == "4":
-                self.edit_transaction_menu()
+                self.diagnostics_menu()
+                input("\nPress Enter to continue...")
             elif choice == "5":
-                self.delete_transaction_menu()
-            elif choice == "6":
                 print("Thank you for using Transation Manager. Goodbye!")
                 break
             else:
                 print("invalid choice, Please try again.")
-
-            input("\nPress Enter to continue...")
\ No newline at end of file
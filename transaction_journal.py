@@ -0,0 +1,44 @@
+import os
+import csv
+from instrumentation import open_file
+
+JOURNAL_FIELDS = ["op", "id", "field", "value"]
+
+class TransactionJournal:
+    def __init__(self, journal_file):
+        """Initialize the journal of edits and deletes made against the transactions file."""
+        self.journal_file = journal_file
+
+    def get_signature(self):
+        """Return the (mtime, size) of the journal file, or None if it is missing."""
+        try:
+            stat = os.stat(self.journal_file)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def append(self, op, transaction_id, field="", value=""):
+        """Append a delete tombstone or a field patch to the journal."""
+        self.extend([[op, transaction_id, field, value]])
+
+    def extend(self, entries):
+        """Append several [op, id, field, value] entries with a single write."""
+        is_new = not os.path.exists(self.journal_file)
+        with open_file(self.journal_file, 'a', newline='') as file:
+            writer = csv.writer(file)
+            if is_new:
+                writer.writerow(JOURNAL_FIELDS)
+            writer.writerows(entries)
+
+    def read(self):
+        """Read all journal entries in the order they were written."""
+        if not os.path.exists(self.journal_file):
+            return []
+
+        with open_file(self.journal_file, 'r', newline='') as file:
+            return list(csv.DictReader(file))
+
+    def clear(self):
+        """Remove the journal once its entries have been folded into the transactions file."""
+        if os.path.exists(self.journal_file):
+            os.remove(self.journal_file)
@@ -1,15 +1,161 @@
 import os
 import csv
+import copy
+import math
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
+from account_manager import AccountManager
+from balance_ledger import BalanceLedger
+from category_index import CategoryIndex
 from category_manager import CategoryManager
+from file_lock import atomic_write, get_group_commit, get_lock, locked
+from offset_index import OffsetIndex
+import parallel_scan
+from query_cache import MISSING, QueryCache
+from reports import ReportBuilder, history_start
+from rollups import MonthlyRollups
+from search_index import SEARCH_FIELDS, SearchIndex
+from snapshot import Snapshot
+from sorted_index import SortedIndex, decode_cursor, encode_cursor
+from transaction import TRANSACTION_FIELDS, Transaction, date_to_ordinal, from_cents, ordinal_to_date, to_cents
+from transaction_journal import TransactionJournal
+from instrumentation import count, instrumented, open_file
+
+def normalize_date(date):
+    """Validate a YYYY-MM-DD date and return it zero-padded."""
+    return datetime.strptime(date, "%Y-%m-%d").strftime("%Y-%m-%d")
+
+def is_month_start(date):
+    """Check whether a YYYY-MM-DD date is the first day of its month."""
+    return datetime.strptime(date, "%Y-%m-%d").day == 1
+
+def is_month_end(date):
+    """Check whether a YYYY-MM-DD date is the last day of its month."""
+    return (datetime.strptime(date, "%Y-%m-%d") + timedelta(days=1)).day == 1
+
+def validate_transaction(date, amount, category, account, transaction_type):
+    """Validate the fields of a new transaction.
+
+    Returns (True, (date, amount)) with the date defaulted to today and the amount
+    rounded to whole cents as a float, or (False, error message).
+    """
+    # Validate date format, zero-padding it so dates sort correctly as strings
+    if date:
+        if not isinstance(date, str):
+            return False, "Invalid date format: expected a YYYY-MM-DD string"
+        try:
+            date = normalize_date(date)
+        except ValueError as e:
+            return False, f"Invalid date format: {e}"
+    else:
+        date = datetime.now().strftime("%Y-%m-%d")
+
+    # Validate amount
+    try:
+        amount = float(amount)
+        if not math.isfinite(amount):
+            return False, "Amount must be a valid number."
+        # Check the amount as it will be stored, so e.g. 0.001 is not kept as 0 cents
+        amount = from_cents(to_cents(amount))
+        if amount <= 0:
+            return False, "Amount must be greater than zero."
+    except (TypeError, ValueError):
+        return False, "Amount must be a valid number."
+    
+    # Validate transaction type
+    if transaction_type not in ["income", "expense"]:
+        return False, "Transaction type must be either 'income' or 'expense'."
+    
+    # Validate category and account
+    if not category or not account:
+        return False, "Category and account are empty."
+    if not isinstance(category, str) or not isinstance(account, str):
+        return False, "Category and account must be text."
+
+    return True, (date, amount)
+
+def complete_lines(file):
+    """Yield the decoded lines of a binary file, stopping before a last row that is still being appended.
+
+    Appends by other processes are not atomic for readers, so a line without a line
+    break is left out and the file is left positioned at its start.
+    """
+    for line in file:
+        if not line.endswith(b"\n"):
+            file.seek(-len(line), os.SEEK_CUR)
+            return
+        yield line.decode('utf-8')
 
 class TransactionManager:
-    def  __init__(self, data_dir="data"):
-        """Initialize the transaction manager."""
+    def  __init__(self, data_dir="data", journal=False, journal_threshold=1000, columnar=False, rollups=False,
+                  workers=1, group_commit=False, cache_size=128):
+        """Initialize the transaction manager.
+
+        With journal enabled, edits and deletes are appended to transactions.journal
+        instead of rewriting transactions.csv, and the journal is compacted back into
+        the transactions file once it holds journal_threshold entries.
+
+        With columnar enabled and NumPy installed, summaries and category breakdowns
+        are computed with vectorized reductions over a columnar copy of the ledger.
+
+        With rollups enabled, monthly totals are kept up to date on every change and
+        saved to rollups.json, so reports over whole months skip the raw rows.
+
+        With workers above 1, summaries, category breakdowns and searches over a
+        ledger that is not in memory are split into byte ranges that are parsed and
+        aggregated by that many worker processes.
+
+        Writers hold an advisory lock on the data directory, so several processes can
+        safely share it, and rewrites replace files atomically. With group_commit
+        enabled, added transactions are fsynced before the call returns, and appends
+        made concurrently by other threads of this process share one fsync; other
+        processes appending to the same file each fsync on their own.
+
+        The results of the last cache_size summaries, breakdowns, reports and pages
+        are cached until a write touches the months they cover; 0 disables the cache.
+        """
         self.data_dir = data_dir
         self.transactions_file = os.path.join(data_dir, "transactions.csv")
         self.category_manager = CategoryManager(data_dir)
+        self.account_manager = AccountManager(data_dir)
+        self.journal = TransactionJournal(os.path.join(data_dir, "transactions.journal"))
+        self.journal_enabled = journal
+        self.journal_threshold = journal_threshold
+        self._journal_entries = 0
+
+        # Resident copy of the transactions file, reloaded only when the file changes
+        self._transactions = []
+        self._transactions_by_id = {}
+        self._file_signature = None
+        # NumPy and the process pool take a noticeable time to import, so they are
+        # only imported once columnar or parallel mode is used
+        if columnar:
+            from column_store import ColumnStore
+            columnar = ColumnStore.is_available()
+        self.columnar = columnar
+        self._column_store = None
+        self._sorted_indexes = {}
+        self._category_index = None
+        self._balance_ledger = None
+        self.search_index_file = os.path.join(data_dir, "search_index.json")
+        self._search_index = None
+        # Changes of the current write, logged for the saved search index once it is written
+        self._search_changes = []
+        # Binary copy of the parsed transactions file, for a fast cold start
+        self._snapshot = Snapshot(os.path.join(data_dir, "transactions.snapshot"), self.transactions_file)
+        # Byte offsets of the rows in the transactions file, for reading one row without loading the rest
+        self._offset_index = OffsetIndex(self.transactions_file, os.path.join(data_dir, "transactions.offsets"))
+
+        # Monthly aggregates, valid while their signature matches the transactions file
+        self.rollups_enabled = rollups
+        self.rollups_file = os.path.join(data_dir, "rollups.json")
+        self._rollups = None
+        self._rollups_signature = None
+        self.workers = max(1, workers)
+        self.group_commit = group_commit
+        self._query_cache = QueryCache(cache_size)
+        self._lock = get_lock(data_dir)
+
         self.ensure_data_directory()
         self.initialize_transactions_file()
 
@@ -17,152 +163,803 @@ class TransactionManager:
         """Ensure the data directory exists."""
         os.makedirs(self.data_dir, exist_ok=True)
 
+    @locked
     def initialize_transactions_file(self):
         """Initialize the transactions file with headers if it doesn't exist"""
         if not os.path.exists(self.transactions_file):
-            with open(self.transactions_file, "w", newline="") as file:
+            with open_file(self.transactions_file, "w", newline="") as file:
                 writer = csv.writer(file)
-                writer.writerow(["id", "date", "amount", "category", "account", "description", "transaction_type"])
+                writer.writerow(TRANSACTION_FIELDS)
+
+    def _get_file_signature(self):
+        """Return the (mtime, size) of the transactions file and its journal, or None if the file is missing."""
+        try:
+            stat = os.stat(self.transactions_file)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, self.journal.get_signature())
+
+    def _read_journal(self):
+        """Return the pending journal entries to replay over the transactions file."""
+        return self.journal.read()
+
+    def _data_files(self, start_date=None, end_date=None):
+        """Return the files holding transactions within an inclusive date range, in ledger order."""
+        return [self.transactions_file] if os.path.exists(self.transactions_file) else []
+
+    def _is_loaded(self):
+        """Check whether the in-memory transactions match the file on disk."""
+        return self._file_signature is not None and self._file_signature == self._get_file_signature()
+
+    @instrumented("load_transactions")
+    def _load_transactions(self):
+        """Load transactions into memory, re-reading the file only when it has changed."""
+        if self._is_loaded():
+            return self._transactions
+
+        signature = self._get_file_signature()
+        transactions = []
+        transactions_by_id = {}
+
+        if signature is not None:
+            transactions = self._read_ledger()
+            transactions_by_id = {transaction.id: transaction for transaction in transactions}
+
+            # Replay edits and deletes that have not been compacted yet
+            journal_entries = self._read_journal()
+            for entry in journal_entries:
+                transaction = transactions_by_id.get(entry['id'])
+                if transaction is None:
+                    continue
+                if entry['op'] == "delete":
+                    del transactions_by_id[entry['id']]
+                elif entry['op'] == "edit":
+                    transaction[entry['field']] = entry['value']
+
+            if len(transactions_by_id) != len(transactions):
+                transactions = [t for t in transactions if transactions_by_id.get(t['id']) is t]
+            self._journal_entries = len(journal_entries)
+
+        self._transactions = transactions
+        self._transactions_by_id = transactions_by_id
+        self._file_signature = signature
+        self._reset_indexes()
+        return self._transactions
+
+    def _parse_rows(self, data_file, start=0):
+        """Parse the rows of a transactions file from a byte offset on a row boundary.
+
+        Returns the Transaction records and the offset where parsing stopped.
+        """
+        transactions = []
+        with open_file(data_file, 'rb') as file:
+            header = next(csv.reader([file.readline().decode('utf-8')]), None)
+            if header is None:
+                return transactions, file.tell()
+            file.seek(max(start, file.tell()))
+
+            reader = csv.DictReader(complete_lines(file), fieldnames=header)
+            for row in reader:
+                # Keep compact records with the amount in cents and the date as an ordinal
+                transactions.append(Transaction.from_dict(row))
+            end = file.tell()
+        count("rows_scanned", len(transactions))
+        return transactions, end
+
+    def _read_ledger(self):
+        """Read the transactions file, taking the rows it covers from the snapshot when it is valid.
+
+        Only rows appended after the snapshot was taken are parsed, and the snapshot
+        is rewritten once those make up a tenth of the ledger.
+        """
+        transactions, size = self._snapshot.load()
+        if transactions is None:
+            transactions, size = [], 0
+
+        parsed, end = self._parse_rows(self.transactions_file, size)
+        transactions.extend(parsed)
+        if size == 0 or len(parsed) > len(transactions) // 10:
+            self._snapshot.save(transactions, end)
+        return transactions
+
+    def _has_snapshot(self):
+        """Check whether the snapshot of the transactions file is still valid."""
+        return self._snapshot.is_valid()
+
+    def _mark_written(self, was_loaded, changed=(), previous=None):
+        """Record our own write so it does not trigger a reload.
+
+        If the store was already stale before the write, another process changed the
+        file and the store is invalidated instead. Cached query results covering the
+        months of the changed transactions (old and new versions) are invalidated;
+        previous is the file signature before the write, by default the store's.
+        The changes recorded for the search index are logged next to the saved index.
+        """
+        if previous is None:
+            previous = self._file_signature
+        signature = self._get_file_signature()
+        self._file_signature = signature if was_loaded else None
+        months = {ordinal_to_date(transaction.ordinal)[:7] for transaction in changed}
+        self._query_cache.written(months, previous, signature)
+
+        changes, self._search_changes = self._search_changes, []
+        SearchIndex.append_delta(self.search_index_file, repr(previous), repr(signature), changes)
+
+    def _cached(self, key, start_date, end_date, compute, *args):
+        """Return a copy of a query result computed from an inclusive date range, caching it."""
+        signature = self._get_file_signature()
+        if self._query_cache.signature != signature:
+            self._query_cache.clear(signature)
+
+        result = self._query_cache.get(key)
+        if result is MISSING:
+            result = compute(*args)
+            self._query_cache.put(key, start_date[:7] if start_date else None,
+                                  end_date[:7] if end_date else None, result)
+        # Hand out copies so callers cannot modify the cached result
+        return copy.deepcopy(result)
+
+    def get_cache_stats(self):
+        """Get the query cache's hit and miss counts and size."""
+        return self._query_cache.stats()
+
+    def _reset_indexes(self):
+        """Drop the derived indexes so they are rebuilt from the store on next use."""
+        self._column_store = None
+        self._sorted_indexes = {}
+        self._category_index = None
+        self._balance_ledger = None
+        self._search_index = None
+
+    def _index_added(self, transactions):
+        """Update the derived indexes for newly added transactions."""
+        if self._column_store is not None:
+            self._column_store.add(transactions)
+        for index in self._sorted_indexes.values():
+            index.add(transactions)
+        if self._category_index is not None:
+            for transaction in transactions:
+                self._category_index.add(transaction)
+        if self._balance_ledger is not None:
+            for transaction in transactions:
+                self._balance_ledger.add(transaction)
+        if self._search_index is not None:
+            for transaction in transactions:
+                self._search_index.add(transaction)
+        self._search_changes.extend(SearchIndex.change("+", transaction) for transaction in transactions)
+
+    def _index_deleted(self, transaction):
+        """Update the derived indexes for a deleted transaction."""
+        if self._column_store is not None:
+            self._column_store.remove(transaction)
+        for index in self._sorted_indexes.values():
+            index.remove(transaction)
+        if self._category_index is not None:
+            self._category_index.remove(transaction)
+        if self._balance_ledger is not None:
+            self._balance_ledger.remove(transaction)
+        if self._search_index is not None:
+            self._search_index.remove(transaction)
+        self._search_changes.append(SearchIndex.change("-", transaction))
+
+    def _index_edited(self, transaction, field, old_value):
+        """Update the derived indexes for a transaction whose field has changed."""
+        if self._column_store is not None and field != "description":
+            self._column_store.update(transaction)
+        old_transaction = transaction.copy()
+        old_transaction[field] = old_value
+        index = self._sorted_indexes.get(field)
+        if index is not None:
+            index.remove(transaction, index.key(old_transaction))
+            index.add([transaction])
+        if self._balance_ledger is not None and field in ("date", "amount", "account", "transaction_type"):
+            self._balance_ledger.remove(old_transaction)
+            self._balance_ledger.add(transaction)
+        if self._category_index is not None and field == "category":
+            self._category_index.remove(transaction, old_value)
+            self._category_index.add(transaction)
+        if field in SEARCH_FIELDS:
+            if self._search_index is not None:
+                self._search_index.remove(old_transaction)
+                self._search_index.add(transaction)
+            self._search_changes.append(SearchIndex.change("-", old_transaction))
+            self._search_changes.append(SearchIndex.change("+", transaction))
+
+    @instrumented("load_rollups")
+    def _get_rollups(self):
+        """Return the monthly rollups, loading them from disk or rebuilding them if they are stale."""
+        signature = repr(self._get_file_signature())
+        if self._rollups is not None and self._rollups_signature == signature:
+            return self._rollups
+
+        rollups, saved_signature = MonthlyRollups.load(self.rollups_file)
+        if rollups is not None and saved_signature == signature:
+            self._rollups = rollups
+            self._rollups_signature = signature
+            return rollups
+
+        self.rebuild_rollups()
+        return self._rollups
+
+    def _update_rollups(self, rollups, added=(), removed=()):
+        """Apply a change to the rollups and save them for the new state of the transactions file."""
+        if rollups is None:
+            return
+
+        for transaction in removed:
+            rollups.remove(transaction)
+        for transaction in added:
+            rollups.add(transaction)
+
+        self._rollups_signature = repr(self._get_file_signature())
+        rollups.save(self.rollups_file, self._rollups_signature)
+
+    @instrumented("rebuild_rollups")
+    def rebuild_rollups(self):
+        """Rebuild the monthly rollups from the raw transactions."""
+        try:
+            self._rollups = MonthlyRollups.from_transactions(self._load_transactions())
+            self._update_rollups(self._rollups)
+            return True, "Rollups rebuilt successfully"
+        except Exception as e:
+            self._rollups = None
+            return False, f"Error rebuilding rollups: {str(e)}"
+
+    @instrumented("append_rows")
+    def _append_rows(self, rows):
+        """Append transaction rows to the file with a single write and add them to the store.
+
+        With group commit, waiting for the fsync happens after the lock is released,
+        so other writers can append in the meantime and share the next fsync.
+        """
+        # Build the records first, so a row that cannot be parsed back is never written
+        transactions = [Transaction(*row) for row in rows]
+
+        with self._lock:
+            # Same as _is_loaded(), keeping the signature from before the write
+            previous = self._get_file_signature()
+            was_loaded = self._file_signature is not None and self._file_signature == previous
+            rollups = self._get_rollups() if self.rollups_enabled else None
+
+            data_files = self._append_to_files(rows)
+            pending = []
+            if self.group_commit:
+                for data_file in data_files:
+                    group_commit = get_group_commit(data_file)
+                    pending.append((group_commit, group_commit.written()))
+
+            if was_loaded:
+                for transaction in transactions:
+                    self._transactions.append(transaction)
+                    self._transactions_by_id[transaction['id']] = transaction
+                self._index_added(transactions)
+            else:
+                self._search_changes.extend(SearchIndex.change("+", transaction) for transaction in transactions)
+            self._mark_written(was_loaded, transactions, previous)
+            self._update_rollups(rollups, added=transactions)
+
+        for group_commit, sequence in pending:
+            group_commit.wait_durable(sequence)
+
+    def _append_to_files(self, rows):
+        """Append transaction rows to the transactions file, returning the files written."""
+        with open_file(self.transactions_file, 'a', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerows(rows)
+        return [self.transactions_file]
+
+    @instrumented("write_transactions")
+    def _write_transactions(self, transactions):
+        """Rewrite the transactions file with the given transactions.
+
+        The transactions already include any journaled changes, so the journal is
+        cleared once the file has been written.
+        """
+        with atomic_write(self.transactions_file, newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=TRANSACTION_FIELDS)
+            writer.writeheader()
+            for transaction in transactions:
+                writer.writerow(transaction.to_dict())
+
+        self._offset_index.reset()
+        self.journal.clear()
+        self._journal_entries = 0
+
+    def _rewrite_transactions(self, transactions, changed):
+        """Write back the ledger after the changed transactions were edited or deleted.
+
+        The single transactions file is rewritten whole.
+        """
+        self._write_transactions(transactions)
+
+    def _append_journal(self, op, transaction_id, field="", value=""):
+        """Append a delete or edit to the journal."""
+        self.journal.append(op, transaction_id, field, value)
+        self._journal_entries += 1
+
+    def _edit_many(self, transactions, field, new_value):
+        """Set one field of several transactions to an already validated value with a single write.
+
+        With the journal, one patch per transaction is appended; otherwise only the
+        files holding the transactions are rewritten, which for the single
+        transactions file means all of it.
+        """
+        if not transactions:
+            return
+        rollups = self._get_rollups() if self.rollups_enabled else None
+        if self.journal_enabled:
+            self.journal.extend([["edit", t.id, field, new_value] for t in transactions])
+            self._journal_entries += len(transactions)
+        else:
+            updated = {}
+            for transaction in transactions:
+                updated[transaction.id] = transaction.copy()
+                updated[transaction.id][field] = new_value
+            self._rewrite_transactions([updated.get(t.id, t) for t in self._transactions],
+                                       transactions + list(updated.values()))
+
+        previous = [transaction.copy() for transaction in transactions]
+        for transaction, old in zip(transactions, previous):
+            transaction[field] = new_value
+            self._index_edited(transaction, field, old[field])
+        self._mark_written(True, transactions + previous)
+        self._update_rollups(rollups, added=transactions, removed=previous)
+        self._maybe_compact_journal()
+
+    def _maybe_compact_journal(self):
+        """Compact the journal once it has grown past the threshold."""
+        if self.journal_enabled and self._journal_entries >= self.journal_threshold:
+            self.compact_journal()
+
+    @instrumented("compact_journal")
+    @locked
+    def compact_journal(self):
+        """Fold the journal back into the transactions file."""
+        try:
+            transactions = self._load_transactions()
+            if self._journal_entries == 0:
+                return True, "Journal is already compacted"
+            rollups = self._get_rollups() if self.rollups_enabled else None
+
+            self._write_transactions(transactions)
+            self._mark_written(True)
+            self._update_rollups(rollups)
+            return True, "Journal compacted successfully"
+        except Exception as e:
+            return False, f"Error compacting journal: {str(e)}"
     
+    @instrumented("add_transaction")
     def add_transaction(self, date, amount, category, account, description, transaction_type):
         """Add a new transaction to the system. """
         try:
-            # Validate date format
-            if date:
-                datetime.strptime(date, "%Y-%m-%d")
-            else:
-                date = datetime.now().strftime("%Y-%m-%d")
-
-            # Validate amount
-            try:
-                amount = float(amount)
-                if amount <= 0:
-                    return False, "Amount must be greater than zero."
-            except ValueError:
-                return False, "Amount must be a valid number."
-            
-            # Validate transaction type
-            if transaction_type not in ["income", "expense"]:
-                return False, "Transaction type must be either 'income' or 'expense'."
-            
-            # Validate category and account
-            if not category or not account:
-                return False, "Category and account are empty."
+            valid, result = validate_transaction(date, amount, category, account, transaction_type)
+            if not valid:
+                return False, result
+            date, amount = result
             
-            # Check if the transaction exists and matches the transaction type
-            categories = self.category_manager.get_categories(transaction_type)
-            category_exists = any(c['name'].lower() == category.lower() for c in categories)
-
-            if not category_exists:
+            # Check if the category exists
+            if self.category_manager.get_category(category) is None:
                 # Ask the category manager to add this as a new category
                 self.category_manager.add_category(category, transaction_type)
+
+            # Store the account under its registered spelling, registering new accounts
+            account = self.account_manager.normalize([account])[account]
             
             #Generate unique ID
             transaction_id = str(uuid.uuid4())
 
             # Write to file
-            with open(self.transactions_file, 'a', newline='') as file:
-                writer = csv.writer(file)
-                writer.writerow([transaction_id, date, amount, category, account, description, transaction_type])
+            self._append_rows([[transaction_id, date, amount, category, account, description, transaction_type]])
             
             return True, f"Transaction added successfully with ID: {transaction_id}"
 
         except ValueError as e:
-            return False, f"Invalid date format: {e}"
+            return False, f"Invalid value: {e}"
         except Exception as e:
             return False, f"Error adding transaction: {str(e)}"
         
+    @instrumented("add_transactions_batch")
+    def add_transactions_batch(self, records):
+        """Add many transactions with a single write.
+
+        Each record is a dict with the add_transaction arguments as keys. Returns one
+        (success, message) tuple per record; invalid records do not stop the batch.
+        """
+        records = list(records)
+        results = []
+        rows = []
+        try:
+            # Collect missing categories so they are created with a single write
+            new_names = set()
+            new_categories = []
+
+            for record in records:
+                if not isinstance(record, dict):
+                    results.append((False, "Transaction must be an object of field values"))
+                    continue
+                description = record.get('description') or ""
+                if not isinstance(description, str):
+                    results.append((False, "Description must be text."))
+                    continue
+                category = record.get('category')
+                transaction_type = record.get('transaction_type')
+                valid, result = validate_transaction(
+                    record.get('date'), record.get('amount'), category, record.get('account'), transaction_type
+                )
+                if not valid:
+                    results.append((False, result))
+                    continue
+                date, amount = result
+
+                if category.lower() not in new_names and self.category_manager.get_category(category) is None:
+                    new_names.add(category.lower())
+                    new_categories.append((category, transaction_type))
+
+                transaction_id = str(uuid.uuid4())
+                rows.append([transaction_id, date, amount, category, record['account'],
+                             description, transaction_type])
+                results.append((True, f"Transaction added successfully with ID: {transaction_id}"))
+
+            if new_categories:
+                self.category_manager.add_categories(new_categories)
+            accounts = self.account_manager.normalize({row[4] for row in rows})
+            for row in rows:
+                row[4] = accounts[row[4]]
+            if rows:
+                self._append_rows(rows)
+
+            return results
+        except Exception as e:
+            # Nothing from the batch was written, so report the pending and unchecked rows as failed
+            error = (False, f"Error adding transaction: {str(e)}")
+            return ([error if success else (success, message) for success, message in results]
+                    + [error] * (len(records) - len(results)))
+
+    @instrumented("get_transactions")
     def get_transactions(self, filters=None):
         """Get transactions with optional filtering."""
-        transactions = []
         try:
-            if not os.path.exists(self.transactions_file):
-                return []
-            
-            with open(self.transactions_file, 'r', newline='') as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    # Apply filters if provided
-                    if filters:
-                        include = True
-                        for key, value in filters.items():
-                            if key in row and str(row[key]).lower() != str(value).lower():
-                                include = False
-                                break
-                        if not include:
-                            continue
-                    
-                    #Convert amount to float for calculations
-                    row['amount'] = float(row['amount'])
-                    transactions.append(row)
+            transactions = self._load_transactions()
+
+            # An id filter is answered straight from the index
+            if filters and 'id' in filters:
+                transaction = self._transactions_by_id.get(str(filters['id']))
+                transactions = [transaction] if transaction else []
+
+            count("rows_scanned", len(transactions))
+            result = []
+            for row in transactions:
+                # Apply filters if provided
+                if filters:
+                    include = True
+                    for key, value in filters.items():
+                        if key in row and str(row[key]).lower() != str(value).lower():
+                            include = False
+                            break
+                    if not include:
+                        continue
 
-            return transactions
+                # Hand out copies so callers cannot modify the resident store
+                result.append(row.to_dict())
+
+            return result
         except Exception as e:
             print(f"Error retrieving transactions: {str(e)}")
             return []
+
+    @instrumented("get_transactions_page")
+    def get_transactions_page(self, page_size=20, sort_by="date", descending=False, after=None, before=None,
+                              transaction_type=None, category=None, account=None):
+        """Get one page of transactions sorted by date or amount.
+
+        Pass the 'next' cursor of a page as after to get the following page, or its
+        'prev' cursor as before to go back. Type, category and account match
+        case-insensitively. Returns a dict with the page's 'transactions' and its
+        'next' and 'prev' cursors, which are None at either end.
+        """
+        try:
+            filters = [(name, value.lower()) for name, value in
+                       (("transaction_type", transaction_type), ("category", category), ("account", account)) if value]
+            # Any write may shift the pages, so they are cached as covering every month
+            key = ("page", page_size, sort_by, descending, after, before, tuple(filters))
+            return self._cached(key, None, None, self._get_page, page_size, sort_by, descending, after, before, filters)
+        except Exception as e:
+            print(f"Error retrieving transactions: {str(e)}")
+            return {'transactions': [], 'next': None, 'prev': None}
+
+    def _get_page(self, page_size, sort_by, descending, after, before, filters):
+        """Compute a page of get_transactions_page, with filters as (field, lowercase value) pairs."""
+        index = self._get_sorted_index(sort_by)
+        backwards = before is not None
+        cursor = before if backwards else after
+        cursor_key = decode_cursor(sort_by, cursor) if cursor else None
+
+        include = None
+        if filters:
+            include = lambda t: all(getattr(t, name).lower() == value for name, value in filters)
+
+        page, more = index.page(page_size, cursor_key, descending, backwards, include)
+        count("rows_scanned", len(page))
+        first = encode_cursor(sort_by, index.key(page[0])) if page else None
+        last = encode_cursor(sort_by, index.key(page[-1])) if page else None
+        return {
+            'transactions': [transaction.to_dict() for transaction in page],
+            'next': last if (more and not backwards) or (backwards and page) else None,
+            'prev': first if (more and backwards) or (cursor and not backwards and page) else None
+        }
+
+    def iter_transactions(self, transaction_type=None, category=None, account=None,
+                          start_date=None, end_date=None, min_amount=None, max_amount=None):
+        """Yield transactions one at a time, in ledger order, without building a list.
+
+        Type, category and account match case-insensitively and the date bounds are
+        inclusive. If the ledger is not already in memory it is streamed from disk,
+        keeping memory use flat.
+        """
+        for transaction in self._iter_records(transaction_type, category, account,
+                                              start_date, end_date, min_amount, max_amount):
+            yield transaction.to_dict()
+
+    def _iter_records(self, transaction_type=None, category=None, account=None,
+                      start_date=None, end_date=None, min_amount=None, max_amount=None):
+        """Yield the Transaction records matching the iter_transactions filters.
+
+        When streaming, the string checks run before a row is converted to a record,
+        so most non-matching rows are skipped cheaply.
+        """
+        start_date = normalize_date(start_date) if start_date else None
+        end_date = normalize_date(end_date) if end_date else None
+        start = date_to_ordinal(start_date) if start_date else None
+        end = date_to_ordinal(end_date) if end_date else None
+        transaction_type = transaction_type.lower() if transaction_type else None
+        category = category.lower() if category else None
+        account = account.lower() if account else None
+        min_cents = to_cents(min_amount) if min_amount is not None else None
+        max_cents = to_cents(max_amount) if max_amount is not None else None
+
+        def matches(row_type, row_category, row_account):
+            if transaction_type and row_type.lower() != transaction_type:
+                return False
+            if category and row_category.lower() != category:
+                return False
+            if account and row_account.lower() != account:
+                return False
+            return True
+
+        def in_range(ordinal, cents):
+            if start is not None and ordinal < start:
+                return False
+            if end is not None and ordinal > end:
+                return False
+            if min_cents is not None and cents < min_cents:
+                return False
+            if max_cents is not None and cents > max_cents:
+                return False
+            return True
+
+        if self._is_loaded():
+            for t in self._transactions:
+                if in_range(t.ordinal, t.cents) and matches(t.transaction_type, t.category, t.account):
+                    yield t
+            count("rows_scanned", len(self._transactions))
+            return
+
+        # Index pending journal entries by id so they can be applied while streaming
+        patches = {}
+        for entry in self._read_journal():
+            patches.setdefault(entry['id'], []).append(entry)
+
+        for data_file in self._data_files(start_date, end_date):
+            with open_file(data_file, 'rb') as file:
+                reader = csv.reader(complete_lines(file))
+                header = next(reader, None)
+                if header is None:
+                    continue
+                position = {field: index for index, field in enumerate(header)}
+                id_at, date_at = position['id'], position['date']
+                type_at, category_at, account_at = position['transaction_type'], position['category'], position['account']
+
+                try:
+                    for row in reader:
+                        if patches and row[id_at] in patches:
+                            entries = patches[row[id_at]]
+                            if any(entry['op'] == "delete" for entry in entries):
+                                continue
+                            for entry in entries:
+                                row[position[entry['field']]] = entry['value']
+
+                        date = row[date_at]
+                        if (start_date and date < start_date) or (end_date and date > end_date):
+                            continue
+                        if not matches(row[type_at], row[category_at], row[account_at]):
+                            continue
+                        transaction = Transaction.from_dict(dict(zip(header, row)))
+                        if in_range(transaction.ordinal, transaction.cents):
+                            yield transaction
+                finally:
+                    count("rows_scanned", reader.line_num - 1)
+
+    @instrumented("export_transactions")
+    def export_transactions(self, export_file, **filters):
+        """Write the transactions matching the iter_transactions filters to a CSV file."""
+        try:
+            exported = 0
+            with open_file(export_file, 'w', newline='') as file:
+                writer = csv.DictWriter(file, fieldnames=TRANSACTION_FIELDS)
+                writer.writeheader()
+                for transaction in self.iter_transactions(**filters):
+                    writer.writerow(transaction)
+                    exported += 1
+
+            return True, f"Exported {exported} transactions to {export_file}"
+        except Exception as e:
+            return False, f"Error exporting transactions: {str(e)}"
+
+    @instrumented("get_transaction")
+    def get_transaction(self, transaction_id):
+        """Get a single transaction by ID, or None if it does not exist.
+
+        If the ledger is not in memory, the row is read from the memory-mapped
+        transactions file through the offset index, with pending journal entries applied.
+        """
+        try:
+            if self._is_loaded():
+                transaction = self._transactions_by_id.get(transaction_id)
+                return transaction.to_dict() if transaction else None
+            return self._read_transaction(transaction_id)
+        except Exception as e:
+            print(f"Error retrieving transaction: {str(e)}")
+            return None
+
+    def _scan_ranges(self, start_date=None, end_date=None):
+        """Return (file, start, end, header) byte ranges covering the ledger, one per parallel task.
+
+        The file is cut into equal parts and each cut is moved forward to the next
+        line break, so only a line per cut is read. The first range holds the
+        header row and the last one reads to the end of the file.
+        """
+        if not os.path.exists(self.transactions_file):
+            return []
+        size = os.path.getsize(self.transactions_file)
+        parts = self.workers * 2
+        with open_file(self.transactions_file, 'rb') as file:
+            header = next(csv.reader([file.readline().decode('utf-8')]), None)
+            starts = [0]
+            for part in range(1, parts):
+                file.seek(max(size * part // parts, starts[-1]))
+                file.readline()
+                if file.tell() >= size:
+                    break
+                if file.tell() > starts[-1]:
+                    starts.append(file.tell())
+        return [(self.transactions_file, start, end, header) for start, end in zip(starts, starts[1:] + [None])]
+
+    def _use_parallel(self):
+        """Check whether a scan should run in worker processes instead of the resident store.
+
+        With a single CPU the workers would only take turns, so the scan stays serial.
+        """
+        return self.workers > 1 and (os.cpu_count() or 1) > 1 and not self._is_loaded()
+
+    @instrumented("parallel_scan")
+    def _parallel_map(self, function, start_date=None, end_date=None, query=None):
+        """Run a parallel_scan worker function over the ledger, returning its results in ledger order."""
+        start_date = normalize_date(start_date) if start_date else None
+        end_date = normalize_date(end_date) if end_date else None
+        patches = {}
+        for entry in self._read_journal():
+            patches.setdefault(entry['id'], []).append(entry)
+
+        tasks = [(data_file, start, end, header, patches, start_date, end_date, query)
+                 for data_file, start, end, header in self._scan_ranges(start_date, end_date)]
+        if len(tasks) < 2:
+            return [function(task) for task in tasks]
+        from concurrent.futures import ProcessPoolExecutor
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                return list(executor.map(function, tasks))
+        except ValueError:
+            # A cut fell inside a description with a line break; scan each file whole instead
+            data_files = dict.fromkeys(task[0] for task in tasks)
+            return [function((data_file, 0, None, None) + tasks[0][4:]) for data_file in data_files]
+
+    def _read_transaction(self, transaction_id):
+        """Read one transaction from disk through the offset index, applying pending journal entries."""
+        transaction = self._offset_index.get(transaction_id)
+        if transaction is None:
+            return None
+        for entry in self._read_journal():
+            if entry['id'] != transaction_id:
+                continue
+            if entry['op'] == "delete":
+                return None
+            transaction[entry['field']] = entry['value']
+        return Transaction.from_dict(transaction).to_dict()
     
+    @instrumented("delete_transactions")
+    @locked
     def delete_transactions(self, transaction_id):
         """Delete a transaction by ID."""
         try:
-            transactions = self.get_transactions()
-            filtered_transactions = [t for t in transactions if t['id'] != transaction_id]
+            self._load_transactions()
+            transaction = self._transactions_by_id.get(transaction_id)
 
-            if len(filtered_transactions) == len(transactions):
+            if transaction is None:
                 return False, "Transaction not found"
             
-            # Write back all transactions except the deleted one
-            with open(self.transactions_file, 'w', newline='') as file:
-                writer = csv.DictWriter(file, fieldnames=["id", "date", "amount", "category","account", "description", "transaction_type"])
-                writer.writeheader()
-                for transaction in filtered_transactions:
-                    writer.writerow(transaction)
+            rollups = self._get_rollups() if self.rollups_enabled else None
+            filtered_transactions = [t for t in self._transactions if t is not transaction]
+            if self.journal_enabled:
+                self._append_journal("delete", transaction_id)
+            else:
+                # Write back all transactions except the deleted one
+                self._rewrite_transactions(filtered_transactions, [transaction])
+
+            self._transactions = filtered_transactions
+            del self._transactions_by_id[transaction_id]
+            self._index_deleted(transaction)
+            self._mark_written(True, [transaction])
+            self._update_rollups(rollups, removed=[transaction])
+            self._maybe_compact_journal()
             
             return True, "Transaction deleted successfully"
         except Exception as e:
             return False, f"Error deleting transaction: {str(e)}"
     
+    @instrumented("edit_transcation")
+    @locked
     def edit_transcation(self, transaction_id, field, new_value):
         """Edit a specific field of a transaction."""
         try:
-            transactions = self.get_transactions()
-            found = False
-            
-            for transaction in transactions:
-                if transaction['id'] == transaction_id:
-
-                    # Validate field
-                    if field not in transaction:
-                        return False, f"Invalid field: {field}"
-                    
-                    #Special validation for certain fields
-                    if field == "date":
-                        datetime.strptime(new_value, "%Y-%m-%d")
-                    elif field == "amount":
-                        transaction[field] = float(new_value)
-                    elif field == "transaction_type" and new_value not in ["income", "expense"]:
-                        return False, "Transaction type must be either 'income' or 'expense'"
-                    elif field == "category":
-                        # Check if the category exists and matches the transaction type
-                        categories = self.category_manager.get_categories(transaction['transaction_type'])
-                        category_exists = any(c['name'].lower() == new_value.lower() for c in categories)
-
-                        if not category_exists:
-                            # Ask the category manager to add this as a new category
-                            self.category_manager.add_category(new_value, transaction['transaction_type'])
-
-                    transaction[field] = new_value
-                    found = True
-                    break
+            self._load_transactions()
+            transaction = self._transactions_by_id.get(transaction_id)
 
-            if not found:
+            if transaction is None:
                 return False, "Transaction not found"
 
-            # Write back all the transactions with the edited one
-            with open(self.transactions_file, 'w', newline='') as file:
-                writer = csv.DictWriter(file, fieldnames=["id", "date", "amount", "category", "account", "description", "transacation_type"])
-                writer.writeheader()
-                for transaction in transactions:
-                    writer.writerow(transaction)
+            # Validate field; ids identify transactions in the indexes, journal and cursors
+            if field not in TRANSACTION_FIELDS:
+                return False, f"Invalid field: {field}"
+            if field == "id":
+                return False, "Transaction id cannot be changed"
+            
+            #Special validation for certain fields
+            if field == "date":
+                new_value = normalize_date(new_value)
+            elif field == "amount":
+                new_value = float(new_value)
+                if not math.isfinite(new_value):
+                    return False, "Amount must be a valid number"
+                new_value = from_cents(to_cents(new_value))
+            elif field == "transaction_type" and new_value not in ["income", "expense"]:
+                return False, "Transaction type must be either 'income' or 'expense'"
+            elif field == "category":
+                # Check if the category exists
+                if self.category_manager.get_category(new_value) is None:
+                    # Ask the category manager to add this as a new category
+                    self.category_manager.add_category(new_value, transaction['transaction_type'])
+            elif field == "account":
+                if not new_value:
+                    return False, "Account cannot be empty"
+                new_value = self.account_manager.normalize([new_value])[new_value]
+
+            rollups = self._get_rollups() if self.rollups_enabled else None
+            if self.journal_enabled:
+                self._append_journal("edit", transaction_id, field, new_value)
+            else:
+                updated = transaction.copy()
+                updated[field] = new_value
+
+                # Write back all the transactions with the edited one
+                self._rewrite_transactions([updated if t is transaction else t for t in self._transactions],
+                                           [transaction, updated])
+
+            previous = transaction.copy()
+            transaction[field] = new_value
+            self._index_edited(transaction, field, previous[field])
+            self._mark_written(True, [transaction, previous])
+            self._update_rollups(rollups, added=[transaction], removed=[previous])
+            self._maybe_compact_journal()
             
             return True, "Transaction updated successfully"
         except ValueError as e:
@@ -170,59 +967,348 @@ class TransactionManager:
         except Exception as e:
             return False, f"Error editing transaction: {str(e)}"
         
+    @instrumented("load_search_index")
+    def _get_search_index(self):
+        """Return the search index, loading it from disk or building it if it is stale.
+
+        Writes log their changes next to the saved index rather than rewriting it,
+        and loading applies them. The index is saved whole only when it is built or
+        once the log holds more than a tenth of the ledger's transactions.
+        """
+        transactions = self._load_transactions()
+        if self._search_index is not None:
+            return self._search_index
+
+        index, signature, applied = SearchIndex.load(self.search_index_file)
+        if index is None or signature != repr(self._file_signature):
+            index = SearchIndex.from_transactions(transactions)
+            index.save(self.search_index_file, repr(self._file_signature))
+        elif applied > max(1000, len(transactions) // 10):
+            with self._lock:
+                # Another process may have logged more changes since the ledger was read
+                if signature == repr(self._get_file_signature()):
+                    index.save(self.search_index_file, signature)
+
+        self._search_index = index
+        return index
+
+    @instrumented("search_transactions")
     def search_transactions(self, keyword):
-        result = []
-        transactions = self.get_transactions()
+        """Find transactions matching every word of the keyword, ordered by date.
 
-        keyword = str(keyword).lower()
+        Words match the start of words in the description, category or account, and
+        can be limited to one field, e.g. "category:groceries rent".
+        """
+        try:
+            if self._use_parallel():
+                result = [t for part in self._parallel_map(parallel_scan.search, query=str(keyword)) for t in part]
+                result.sort(key=lambda t: (t['date'], t['id']))
+                return result
 
-        for transaction in transactions:
-            for field, value in transaction.items():
-                if keyword in str(value).lower():
-                    result.append(transaction)
-                    break
-        
-        return result
+            ids = self._get_search_index().search(str(keyword))
+            result = [self._transactions_by_id[transaction_id].to_dict() for transaction_id in ids]
+            result.sort(key=lambda t: (t['date'], t['id']))
+            return result
+        except Exception as e:
+            print(f"Error searching transactions: {str(e)}")
+            return []
     
+    @instrumented("build_category_index")
+    def _get_category_index(self):
+        """Return the category to transactions index of the ledger, building it on first use."""
+        transactions = self._load_transactions()
+        if self._category_index is None:
+            self._category_index = CategoryIndex(transactions)
+        return self._category_index
+
+    @instrumented("get_category_counts")
+    def get_category_counts(self):
+        """Get the number of transactions per category, including categories with none."""
+        try:
+            index = self._get_category_index()
+            counts = {category['name']: index.count(category['name'])
+                      for category in self.category_manager.get_categories()}
+            # Transactions can still carry names that are not registered categories
+            known = {name.lower() for name in counts}
+            for name, transaction_count in index.counts().items():
+                if name.lower() not in known:
+                    counts[name] = transaction_count
+            return counts
+        except Exception as e:
+            print(f"Error counting transactions: {str(e)}")
+            return {}
+
+    @instrumented("rename_category")
+    @locked
+    def rename_category(self, old_name, new_name, new_type=None):
+        """Rename a category and optionally change its type, updating its transactions.
+
+        Renaming onto another existing category merges the two.
+        """
+        try:
+            category = self.category_manager.get_category(old_name)
+            if category is None:
+                return False, "Category not found"
+            if not new_name:
+                return False, "Category name cannot be empty"
+            if new_name.lower() != old_name.lower() and self.category_manager.get_category(new_name):
+                return self.merge_categories(old_name, new_name)
+
+            success, message = self.category_manager.edit_category(old_name, new_name, new_type)
+            if not success:
+                return False, message
+
+            transactions = self._get_category_index().transactions(old_name)
+            self._edit_many([t for t in transactions if t.category != new_name], "category", new_name)
+            return True, f"Category updated successfully ({len(transactions)} transactions)"
+        except Exception as e:
+            return False, f"Error editing category: {str(e)}"
+
+    @instrumented("merge_categories")
+    @locked
+    def merge_categories(self, source, target):
+        """Move the transactions of the source category into the target category and delete the source."""
+        try:
+            if source.lower() == target.lower():
+                return False, "Cannot merge a category into itself"
+            if self.category_manager.get_category(source) is None:
+                return False, "Category not found"
+            target_category = self.category_manager.get_category(target)
+            if target_category is None:
+                return False, f"Category '{target}' does not exist"
+
+            transactions = self._get_category_index().transactions(source)
+            self._edit_many(transactions, "category", target_category['name'])
+            success, message = self.category_manager.delete_category(source)
+            if not success:
+                return False, message
+            return True, f"Merged {len(transactions)} transactions into {target_category['name']}"
+        except Exception as e:
+            return False, f"Error merging categories: {str(e)}"
+
+    @instrumented("delete_category")
+    @locked
+    def delete_category(self, name, fallback="Miscellaneous"):
+        """Delete a category, moving its transactions to the fallback category.
+
+        The fallback is created with the deleted category's type if it does not exist.
+        """
+        try:
+            category = self.category_manager.get_category(name)
+            if category is None:
+                return False, "Category not found"
+            if not fallback or fallback.lower() == name.lower():
+                return False, "The fallback category must differ from the deleted one"
+            if self.category_manager.get_category(fallback) is None:
+                success, message = self.category_manager.add_category(fallback, category['type'])
+                if not success:
+                    return False, message
+
+            fallback_name = self.category_manager.get_category(fallback)['name']
+            transactions = self._get_category_index().transactions(name)
+            self._edit_many(transactions, "category", fallback_name)
+            success, message = self.category_manager.delete_category(name)
+            if not success:
+                return False, message
+            return True, f"Category deleted successfully ({len(transactions)} transactions moved to {fallback_name})"
+        except Exception as e:
+            return False, f"Error deleting category: {str(e)}"
+
+    @instrumented("build_balance_ledger")
+    def _get_balance_ledger(self):
+        """Return the running balances per account, building them on first use."""
+        transactions = self._load_transactions()
+        if self._balance_ledger is None:
+            self._balance_ledger = BalanceLedger(transactions)
+            # Register accounts of transactions added before the registry existed
+            self.account_manager.normalize(self._balance_ledger.accounts())
+        return self._balance_ledger
+
+    def get_accounts(self):
+        """Get the names of all accounts, including those only used by older transactions."""
+        try:
+            self._get_balance_ledger()
+            return [account['name'] for account in self.account_manager.get_accounts()]
+        except Exception as e:
+            print(f"Error retrieving accounts: {str(e)}")
+            return []
+
+    @instrumented("get_account_balance")
+    def get_account_balance(self, account, as_of=None):
+        """Get an account's balance (income minus expenses) at the end of a date, or overall.
+
+        Returns None if the account does not exist.
+        """
+        try:
+            ledger = self._get_balance_ledger()
+            if self.account_manager.get_account(account) is None:
+                return None
+            ordinal = date_to_ordinal(normalize_date(as_of)) if as_of else None
+            return from_cents(ledger.balance(account, ordinal))
+        except Exception as e:
+            print(f"Error retrieving balance: {str(e)}")
+            return None
+
+    @instrumented("get_account_balances")
+    def get_account_balances(self, as_of=None):
+        """Get every account's balance at the end of a date, or overall."""
+        try:
+            ledger = self._get_balance_ledger()
+            ordinal = date_to_ordinal(normalize_date(as_of)) if as_of else None
+            return {name: from_cents(ledger.balance(name, ordinal)) for name in self.get_accounts()}
+        except Exception as e:
+            print(f"Error retrieving balances: {str(e)}")
+            return {}
+
+    @instrumented("get_balance_series")
+    def get_balance_series(self, start_date=None, end_date=None, accounts=None):
+        """Get the end-of-day balance of each account for every day of an inclusive date range.
+
+        The range defaults to the current year up to today and accounts to all of them.
+        Returns {account: {date: balance}}.
+        """
+        try:
+            ledger = self._get_balance_ledger()
+            today = datetime.now().strftime("%Y-%m-%d")
+            start = date_to_ordinal(normalize_date(start_date) if start_date else today[:4] + "-01-01")
+            end = date_to_ordinal(normalize_date(end_date) if end_date else today)
+            dates = [ordinal_to_date(day) for day in range(start, end + 1)]
+
+            series = {}
+            for name in accounts or self.get_accounts():
+                series[name] = dict(zip(dates, map(from_cents, ledger.series(name, start, end))))
+            return series
+        except Exception as e:
+            print(f"Error retrieving balances: {str(e)}")
+            return {}
+
+    @instrumented("build_sorted_index")
+    def _get_sorted_index(self, sort_by):
+        """Return the index of the ledger ordered by date or amount, building it on first use."""
+        transactions = self._load_transactions()
+        if sort_by not in self._sorted_indexes:
+            self._sorted_indexes[sort_by] = SortedIndex(transactions, sort_by)
+        return self._sorted_indexes[sort_by]
+
+    def _filter_by_date(self, start_date=None, end_date=None):
+        """Return the transactions within an inclusive date range.
+
+        A ledger that is not in memory yet is streamed rather than loaded, unless
+        a valid snapshot makes loading it the faster of the two.
+        """
+        if not self._is_loaded() and not self._has_snapshot():
+            return self._iter_records(start_date=start_date, end_date=end_date)
+        if not start_date and not end_date:
+            transactions = self._load_transactions()
+        else:
+            # Bisect to the slice boundaries instead of comparing every row
+            start = date_to_ordinal(normalize_date(start_date)) if start_date else None
+            end = date_to_ordinal(normalize_date(end_date)) if end_date else None
+            transactions = self._get_sorted_index("date").range(start, end)
+
+        count("rows_scanned", len(transactions))
+        return transactions
+
+    @instrumented("build_column_store")
+    def _get_column_store(self):
+        """Return the columnar copy of the ledger, rebuilding it after changes."""
+        transactions = self._load_transactions()
+        if self._column_store is None:
+            from column_store import ColumnStore
+            self._column_store = ColumnStore(transactions)
+        return self._column_store
+
+    def _covers_whole_months(self, start_date=None, end_date=None):
+        """Check whether a date range can be answered from the monthly rollups."""
+        return (self.rollups_enabled
+                and (not start_date or is_month_start(start_date))
+                and (not end_date or is_month_end(end_date)))
+
+    def _month_range(self, start_date=None, end_date=None):
+        """Return the inclusive (start, end) year-months of a date range."""
+        return (normalize_date(start_date)[:7] if start_date else None,
+                normalize_date(end_date)[:7] if end_date else None)
+
+    @instrumented("get_transaction_summary")
     def get_transaction_summary(self, start_date=None, end_date=None):
-        """Get a summary of transactions withing a date range"""
-        transactions = self.get_transactions()
-        filtered_transactions = []
-
-        # Filter by date if provided
-        for transaction in transactions:
-            transaction_date = datetime.strptime(transaction['date'], "%Y-%m-%/d")
-
-            if start_date and end_date:
-                start = datetime.strptime(start_date, "%Y-%m-%/d")
-                end  = datetime.strptime(end_date, "%Y-%m-%/d")
-                if start <= transaction_date <= end:
-                    filtered_transactions.append(transaction)
-            elif start_date:
-                start = datetime.strptime(start_date, "%Y-%m-%/d")
-                if start <= transaction_date:
-                    filtered_transactions.append(transaction)
-            else:
-                filtered_transactions.append(transaction)
-
-        # Calculate summary statistics
-        total_income = sum(t['amount'] for t in filtered_transactions if t['transaction_type'] == 'income')
-        total_expenses = sum(t['amount'] for t in filtered_transactions if t['transaction_type'] == 'expense')
-        net = total_income - total_expenses
-
-        # Group by category
-        categories = {}
-        for transaction in filtered_transactions:
-            category = transaction['category']
-            if category not in categories:
-                categories[category] = 0
-            categories[category] += transaction['amount']
-        
+        """Get a summary of transactions within a date range"""
+        start_date = normalize_date(start_date) if start_date else None
+        end_date = normalize_date(end_date) if end_date else None
+        return self._cached(("summary", start_date, end_date), start_date, end_date,
+                            self._get_summary, start_date, end_date)
+
+    def _get_summary(self, start_date, end_date):
+        """Compute get_transaction_summary for normalized dates."""
+        if self._covers_whole_months(start_date, end_date):
+            return self._get_rollups().summary(*self._month_range(start_date, end_date))
+        if self._use_parallel():
+            parts = self._parallel_map(parallel_scan.summarize, start_date, end_date)
+            total_income, total_expenses, transaction_count, categories = parallel_scan.merge_summaries(parts)
+        elif self.columnar:
+            return self._get_column_store().summary(start_date, end_date)
+        else:
+            # Calculate summary statistics and group by category in a single pass, summing
+            # whole cents so the totals are exact
+            total_income, total_expenses, transaction_count, categories = parallel_scan.sum_summary(
+                self._filter_by_date(start_date, end_date)
+            )
+
         return {
-            'total_income': total_income,
-            'total_expenses': total_expenses,
-            'net': net,
-            'categories': categories,
-            'transaction_count': len(filtered_transactions)
+            'total_income': from_cents(total_income),
+            'total_expenses': from_cents(total_expenses),
+            'net': from_cents(total_income - total_expenses),
+            'categories': {category: from_cents(cents) for category, cents in categories.items()},
+            'transaction_count': transaction_count
         }
 
+    @instrumented("get_time_series_report")
+    def get_time_series_report(self, period="month", start_date=None, end_date=None, top=5):
+        """Get income and expenses per week, month or quarter within a date range.
+
+        Each bucket lists its top expense categories and the 3, 6 and 12-month
+        trailing monthly averages, so transactions from up to 11 months before the
+        range are read too. Everything is computed in a single pass, from the monthly
+        rollups when they cover the range.
+        """
+        start_date = normalize_date(start_date) if start_date else None
+        end_date = normalize_date(end_date) if end_date else None
+        scan_start = history_start(start_date) if start_date else None
+        return self._cached(("report", period, start_date, end_date, top), scan_start, end_date,
+                            self._get_report, period, start_date, end_date, top, scan_start)
+
+    def _get_report(self, period, start_date, end_date, top, scan_start):
+        """Compute get_time_series_report for normalized dates, reading from scan_start on."""
+        builder = ReportBuilder(period, start_date, end_date, top)
+
+        if period != "week" and self._covers_whole_months(start_date, end_date):
+            for (month, category, transaction_type), (total, count) in self._get_rollups().by_category.items():
+                if (not scan_start or month >= scan_start[:7]) and (not end_date or month <= end_date[:7]):
+                    builder.add_month(month, category, transaction_type, total, count)
+        else:
+            builder.add_transactions(self._filter_by_date(scan_start, end_date))
+        return builder.build()
+
+    @instrumented("get_category_breakdown")
+    def get_category_breakdown(self, start_date=None, end_date=None):
+        """Get income and expense totals per category within a date range."""
+        start_date = normalize_date(start_date) if start_date else None
+        end_date = normalize_date(end_date) if end_date else None
+        return self._cached(("breakdown", start_date, end_date), start_date, end_date,
+                            self._get_breakdown, start_date, end_date)
+
+    def _get_breakdown(self, start_date, end_date):
+        """Compute get_category_breakdown for normalized dates."""
+        if self._covers_whole_months(start_date, end_date):
+            return self._get_rollups().category_breakdown(*self._month_range(start_date, end_date))
+        if self._use_parallel():
+            parts = self._parallel_map(parallel_scan.break_down, start_date, end_date)
+            income_categories, expense_categories = parallel_scan.merge_breakdowns(parts)
+        elif self.columnar:
+            return self._get_column_store().category_breakdown(start_date, end_date)
+        else:
+            income_categories, expense_categories = parallel_scan.sum_breakdown(self._filter_by_date(start_date, end_date))
+
+        return {
+            'income': {category: from_cents(cents) for category, cents in income_categories.items()},
+            'expense': {category: from_cents(cents) for category, cents in expense_categories.items()}
+        }